@@ -0,0 +1,46 @@
+"""Compare bitcode with textual IR for a large module.
+
+Reports the size and the serialization time of both forms, and the time to
+read the bitcode back into a fresh context.
+
+Usage: python -m benchmarks.bench_bitcode [num_functions] [num_insts]
+"""
+import sys
+import time
+
+from llvm import bit_reader
+from llvm import bit_writer
+from llvm.core import Context
+from llvm.core import MemoryBuffer
+
+from benchmarks.workloads import create_large_module
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main(argv):
+    num_functions = int(argv[1]) if len(argv) > 1 else 100
+    num_insts = int(argv[2]) if len(argv) > 2 else 1000
+    mod = create_large_module(num_functions, num_insts)
+
+    text, text_write = timed(lambda: str(mod))
+    data, bc_write = timed(lambda: bit_writer.write_bitcode(mod))
+
+    def read():
+        with Context() as ctx:
+            bit_reader.parse_bitcode(MemoryBuffer.from_bytes(data), ctx)
+    _, bc_read = timed(read)
+
+    print('text IR  %10d bytes  write %.3fs' % (len(text.encode()),
+                                                text_write))
+    print('bitcode  %10d bytes  write %.3fs  read %.3fs' % (len(data),
+                                                            bc_write,
+                                                            bc_read))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
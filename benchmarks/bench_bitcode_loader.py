@@ -0,0 +1,51 @@
+"""Benchmark batch bitcode loading.
+
+Writes a set of bitcode files and loads them one at a time with
+MemoryBuffer.fromFile and parse_bitcode, then with BitcodeLoader in thread
+and process mode, reporting wall time and the slowest file.
+
+Usage: python -m benchmarks.bench_bitcode_loader [files] [workers]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from llvm import bit_reader
+from llvm import bit_writer
+from llvm.bitcode_loader import BitcodeLoader
+from llvm.core import Context
+from llvm.core import MemoryBuffer
+
+from benchmarks.workloads import create_large_module
+
+
+def main(argv):
+    num_files = int(argv[1]) if len(argv) > 1 else 32
+    workers = int(argv[2]) if len(argv) > 2 else (os.cpu_count() or 1)
+    tmp = tempfile.mkdtemp()
+    try:
+        mod = create_large_module(20, 1000)
+        paths = [os.path.join(tmp, 'm%d.bc' % i) for i in range(num_files)]
+        for path in paths:
+            bit_writer.write_bitcode_to_file(mod, path)
+
+        start = time.perf_counter()
+        with Context() as ctx:
+            for path in paths:
+                bit_reader.parse_bitcode(MemoryBuffer.fromFile(path), ctx)
+        print('%-10s %8.3fs' % ('serial', time.perf_counter() - start))
+
+        for label, processes in [('threads', False), ('processes', True)]:
+            start = time.perf_counter()
+            with BitcodeLoader(paths, workers, processes=processes) as loader:
+                slowest = max(r.seconds for r in loader)
+            print('%-10s %8.3fs  slowest file %.3fs' % (
+                label, time.perf_counter() - start, slowest))
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == '__main__':
+    main(sys.argv)
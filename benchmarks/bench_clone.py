@@ -0,0 +1,43 @@
+"""Benchmark ways of getting a second copy of a module.
+
+Compares rebuilding the IR from scratch, Module.clone() into the same
+context, a bitcode round trip into the same context, and Module.clone()
+into another context (which goes through bitcode).
+
+Usage: python -m benchmarks.bench_clone [num_functions] [num_insts] [copies]
+"""
+import sys
+import time
+
+from llvm import bit_reader
+from llvm import bit_writer
+from llvm.core import Context
+
+from benchmarks.workloads import create_large_module
+
+
+def main(argv):
+    num_functions = int(argv[1]) if len(argv) > 1 else 100
+    num_insts = int(argv[2]) if len(argv) > 2 else 1000
+    copies = int(argv[3]) if len(argv) > 3 else 3
+
+    with Context() as ctx, Context() as other:
+        mod = create_large_module(num_functions, num_insts, ctx)
+        cases = [
+            ('rebuild', lambda: create_large_module(num_functions,
+                                                    num_insts, ctx)),
+            ('clone', lambda: mod.clone()),
+            ('bitcode round trip', lambda: bit_reader.parse_bitcode(
+                bit_writer.write_bitcode_to_memory_buffer(mod), ctx)),
+            ('clone to context', lambda: mod.clone(other)),
+        ]
+        for label, make in cases:
+            start = time.perf_counter()
+            for _ in range(copies):
+                make().close()
+            elapsed = (time.perf_counter() - start) / copies
+            print('%-20s %8.3fs per copy' % (label, elapsed))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
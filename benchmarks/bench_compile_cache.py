@@ -0,0 +1,46 @@
+"""Benchmark the persistent compile cache.
+
+Parses and optimizes the same bitcode first with an empty cache directory
+and then, as a restarted worker would, with a new CompileCache over the
+filled one.
+
+Usage: python -m benchmarks.bench_compile_cache [num_functions] [num_insts]
+"""
+import shutil
+import sys
+import tempfile
+import time
+
+from llvm import bit_reader
+from llvm import bit_writer
+from llvm.compile_cache import CompileCache
+from llvm.core import Context
+from llvm.core import MemoryBuffer
+
+from benchmarks.workloads import create_large_module
+
+
+def main(argv):
+    num_functions = int(argv[1]) if len(argv) > 1 else 200
+    num_insts = int(argv[2]) if len(argv) > 2 else 1000
+    data = bit_writer.write_bitcode(
+        create_large_module(num_functions, num_insts))
+    print('%d bytes of bitcode, %d functions' % (len(data), num_functions))
+
+    directory = tempfile.mkdtemp()
+    try:
+        for label in ('cold', 'warm'):
+            with CompileCache(directory) as cache, Context() as ctx:
+                cache.key(b'')  # create the target machine up front
+                start = time.perf_counter()
+                bit_reader.parse_bitcode(MemoryBuffer.from_bytes(data), ctx,
+                                         cache=cache)
+                print('%-6s %8.3fs  %s, %d bytes on disk' % (
+                    label, time.perf_counter() - start, cache.stats(),
+                    cache.size()))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main(sys.argv)
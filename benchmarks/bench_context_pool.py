@@ -0,0 +1,45 @@
+"""Benchmark parallel module construction with a ContextPool.
+
+Builds the same batch of independent modules with 1, 2, 4, ... up to N
+worker threads, each thread using its own context, and reports the wall
+time and speedup over a single worker.
+
+Usage: python -m benchmarks.bench_context_pool [max_workers] [modules]
+           [num_functions] [num_insts]
+"""
+import os
+import sys
+import time
+
+from llvm.context_pool import ContextPool
+
+from benchmarks.workloads import create_large_module
+
+
+def main(argv):
+    max_workers = int(argv[1]) if len(argv) > 1 else (os.cpu_count() or 1)
+    num_modules = int(argv[2]) if len(argv) > 2 else 16
+    num_functions = int(argv[3]) if len(argv) > 3 else 20
+    num_insts = int(argv[4]) if len(argv) > 4 else 1000
+
+    def build(i, context):
+        create_large_module(num_functions, num_insts, context)
+        return i
+
+    workers = 1
+    base = None
+    while workers <= max_workers:
+        with ContextPool(max_workers=workers) as pool:
+            start = time.perf_counter()
+            pool.map(build, range(num_modules))
+            elapsed = time.perf_counter() - start
+        base = base or elapsed
+        print('%3d workers %8.3fs  speedup %.2fx' % (workers, elapsed,
+                                                     base / elapsed))
+        if workers == max_workers:
+            break
+        workers = min(workers * 2, max_workers)
+
+
+if __name__ == '__main__':
+    main(sys.argv)
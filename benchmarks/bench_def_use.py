@@ -0,0 +1,40 @@
+"""Benchmark bulk def-use export against Value.uses_iter().
+
+Counts the uses of every instruction of a module once by iterating its
+Use list through the C API, and once from a snapshot's def_use() arrays.
+
+Usage: python -m benchmarks.bench_def_use [num_functions] [num_insts]
+"""
+import sys
+import time
+
+from llvm.snapshot import snapshot
+
+from benchmarks.workloads import create_large_module
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    print('%-18s %8.3fs' % (label, time.perf_counter() - start))
+    return result
+
+
+def main(argv):
+    num_functions = int(argv[1]) if len(argv) > 1 else 200
+    num_insts = int(argv[2]) if len(argv) > 2 else 500
+    mod = create_large_module(num_functions, num_insts)
+    print('%d functions x %d instructions' % (num_functions, num_insts))
+
+    a = timed('uses_iter', lambda: [
+        sum(1 for _ in inst.uses_iter())
+        for f in mod for bb in f for inst in bb])
+    snap = timed('snapshot', lambda: snapshot(mod))
+    offsets, users = timed('def_use', snap.def_use)
+    b = [offsets[v + 1] - offsets[v] for v in snap.inst_values]
+    timed('use_def', snap.use_def)
+    assert a == b
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,37 @@
+"""Benchmark structural fingerprinting.
+
+Compares hashing the printed IR of a module with a full fingerprint and
+with an incremental one after a single function has been invalidated.
+
+Usage: python -m benchmarks.bench_fingerprint [num_functions] [num_insts]
+"""
+import hashlib
+import sys
+import time
+
+from llvm.fingerprint import Fingerprinter
+
+from benchmarks.workloads import create_large_module
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    fn()
+    print('%-12s %8.3fs' % (label, time.perf_counter() - start))
+
+
+def main(argv):
+    num_functions = int(argv[1]) if len(argv) > 1 else 200
+    num_insts = int(argv[2]) if len(argv) > 2 else 500
+    mod = create_large_module(num_functions, num_insts)
+    print('%d functions x %d instructions' % (num_functions, num_insts))
+
+    timed('print+sha', lambda: hashlib.sha256(str(mod).encode()).hexdigest())
+    fp = Fingerprinter()
+    timed('full', lambda: fp.module(mod))
+    fp.invalidate(mod.get_function('f0'))
+    timed('incremental', lambda: fp.module(mod))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
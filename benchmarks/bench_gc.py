@@ -0,0 +1,47 @@
+"""Measure garbage collector pauses and wall-clock time of module walks.
+
+Runs the shared full-module walk several times with gc callbacks recording
+the duration of every collection, and reports the total, maximum and
+count of pauses together with the walk time.
+
+Usage: python -m benchmarks.bench_gc [num_functions] [num_insts] [repeat]
+"""
+import gc
+import sys
+import time
+
+from benchmarks.workloads import create_large_module
+from benchmarks.workloads import walk_module
+
+_pauses = []
+_started = [0.0]
+
+
+def _callback(phase, info):
+    if phase == 'start':
+        _started[0] = time.perf_counter()
+    else:
+        _pauses.append(time.perf_counter() - _started[0])
+
+
+def main(argv):
+    num_functions = int(argv[1]) if len(argv) > 1 else 200
+    num_insts = int(argv[2]) if len(argv) > 2 else 1000
+    repeat = int(argv[3]) if len(argv) > 3 else 5
+    mod = create_large_module(num_functions, num_insts)
+
+    gc.collect()
+    gc.callbacks.append(_callback)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        walk_module(mod)
+    elapsed = time.perf_counter() - start
+    gc.callbacks.remove(_callback)
+
+    print('walk %.3fs; %d collections, total pause %.1f ms, max %.2f ms' % (
+        elapsed, len(_pauses), sum(_pauses) * 1000.0,
+        max(_pauses or [0]) * 1000.0))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,39 @@
+"""Measure the cost of importing the bindings in a fresh interpreter.
+
+Compares importing llvm.bit_reader alone, a plain import of llvm.core, which
+no longer initializes passes and targets, and an import of llvm.core
+followed by an explicit initialize_llvm().
+
+Usage: python -m benchmarks.bench_import [repeat]
+"""
+import subprocess
+import sys
+import time
+
+SNIPPETS = [
+    ('bit_reader', 'import llvm.bit_reader'),
+    ('import', 'import llvm.core'),
+    ('import+init', 'import llvm.core; llvm.core.initialize_llvm()'),
+]
+
+
+def time_snippet(code, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.check_call([sys.executable, '-c', code])
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def main(argv):
+    repeat = int(argv[1]) if len(argv) > 1 else 20
+    baseline = time_snippet('pass', repeat)
+    for label, code in SNIPPETS:
+        elapsed = time_snippet(code, repeat) - baseline
+        print('%-12s %.1f ms' % (label, elapsed * 1000.0))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,44 @@
+"""Benchmark full-module walks with and without wrapper interning.
+
+Usage: python -m benchmarks.bench_interning [num_functions] [num_insts]
+"""
+import sys
+import time
+import tracemalloc
+
+from llvm import common
+
+from benchmarks.workloads import create_large_module
+from benchmarks.workloads import walk_module
+
+
+def measure(mod):
+    start = time.perf_counter()
+    count = walk_module(mod)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    walk_module(mod)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, elapsed, peak
+
+
+def main(argv):
+    num_functions = int(argv[1]) if len(argv) > 1 else 200
+    num_insts = int(argv[2]) if len(argv) > 2 else 1000
+    mod = create_large_module(num_functions, num_insts)
+
+    for label, enabled in [('plain', False), ('interned', True)]:
+        if enabled:
+            common.enable_interning()
+        else:
+            common.disable_interning()
+        count, elapsed, peak = measure(mod)
+        print('%-9s %d instructions: %.3fs, peak %.1f KiB'
+              % (label, count, elapsed, peak / 1024.0))
+    common.disable_interning()
+
+
+if __name__ == '__main__':
+    main(sys.argv)
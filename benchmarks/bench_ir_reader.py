@@ -0,0 +1,54 @@
+"""Compare in-process IR parsing with shelling out to llvm-as.
+
+Prints a large module as text, then loads it with ir_reader.parse_ir_string
+and, when llvm-as is on PATH, with llvm-as followed by parse_bitcode.
+
+Usage: python -m benchmarks.bench_ir_reader [num_functions] [num_insts]
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from llvm import bit_reader
+from llvm import ir_reader
+from llvm.core import Context
+from llvm.core import MemoryBuffer
+
+from benchmarks.workloads import create_large_module
+
+
+def main(argv):
+    num_functions = int(argv[1]) if len(argv) > 1 else 100
+    num_insts = int(argv[2]) if len(argv) > 2 else 1000
+    text = str(create_large_module(num_functions, num_insts))
+
+    with Context() as ctx:
+        start = time.perf_counter()
+        ir_reader.parse_ir_string(text, ctx)
+        print('%-22s %8.3fs' % ('parse_ir_string', time.perf_counter() - start))
+
+    llvm_as = shutil.which('llvm-as')
+    if llvm_as is None:
+        print('llvm-as not found; skipping the subprocess path')
+        return
+    tmp = tempfile.mkdtemp()
+    try:
+        ll = os.path.join(tmp, 'm.ll')
+        bc = os.path.join(tmp, 'm.bc')
+        with open(ll, 'w') as f:
+            f.write(text)
+        with Context() as ctx:
+            start = time.perf_counter()
+            subprocess.check_call([llvm_as, ll, '-o', bc])
+            bit_reader.parse_bitcode(MemoryBuffer.fromFile(bc), ctx)
+            print('%-22s %8.3fs' % ('llvm-as + parse_bitcode',
+                                    time.perf_counter() - start))
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == '__main__':
+    main(sys.argv)
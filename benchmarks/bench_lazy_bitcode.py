@@ -0,0 +1,54 @@
+"""Benchmark time to first function for lazy bitcode loading.
+
+Writes a large module as bitcode, then compares reading it eagerly with
+parse_bitcode() against reading the skeleton with get_bitcode_module() and
+materializing a single function, and against materializing everything.
+
+Usage: python -m benchmarks.bench_lazy_bitcode [num_functions] [num_insts]
+"""
+import sys
+import time
+
+from llvm import bit_reader
+from llvm import bit_writer
+from llvm.core import Context
+from llvm.core import MemoryBuffer
+
+from benchmarks.workloads import create_large_module
+
+
+def main(argv):
+    num_functions = int(argv[1]) if len(argv) > 1 else 500
+    num_insts = int(argv[2]) if len(argv) > 2 else 1000
+    data = bit_writer.write_bitcode(
+        create_large_module(num_functions, num_insts))
+    name = 'f%d' % (num_functions // 2)
+    print('%d bytes of bitcode, %d functions' % (len(data), num_functions))
+
+    def eager(ctx):
+        mod = bit_reader.parse_bitcode(MemoryBuffer.from_bytes(data), ctx)
+        return mod.get_function(name).first
+
+    def lazy_one(ctx):
+        mod = bit_reader.get_bitcode_module(MemoryBuffer.from_bytes(data),
+                                            ctx)
+        return bit_reader.materialize(mod, name).first
+
+    def lazy_all(ctx):
+        mod = bit_reader.get_bitcode_module(MemoryBuffer.from_bytes(data),
+                                            ctx)
+        bit_reader.materialize_all(mod)
+        return mod.get_function(name).first
+
+    for label, fn in [('eager parse', eager),
+                      ('lazy, one function', lazy_one),
+                      ('lazy, all functions', lazy_all)]:
+        with Context() as ctx:
+            start = time.perf_counter()
+            fn(ctx)
+            elapsed = time.perf_counter() - start
+        print('%-20s %8.2f ms' % (label, elapsed * 1e3))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,52 @@
+"""Benchmark linking many modules into one.
+
+Compares linking every module into the first one in turn with link_all()'s
+balanced tree.
+
+Usage: python -m benchmarks.bench_link [modules] [functions_per_module]
+"""
+import sys
+import time
+
+from llvm.core import Context
+from llvm.core import Module
+from llvm.core import Type
+from llvm.core import Value
+from llvm.instruction_builder import Builder
+from llvm.linker import link_all
+
+
+def create_modules(count, num_functions, context):
+    ty = Type.int32(context)
+    ft = Type.function(ty, [], False)
+    mods = []
+    with Builder.create(context) as bldr:
+        for i in range(count):
+            mod = Module.CreateWithName('m%d' % i, context)
+            for j in range(num_functions):
+                f = mod.add_function('f_%d_%d' % (i, j), ft)
+                bldr.position_at_end(f.append_basic_block('entry', context))
+                bldr.ret(Value.const_int(ty, j, True))
+            mods.append(mod)
+    return mods
+
+
+def main(argv):
+    count = int(argv[1]) if len(argv) > 1 else 256
+    num_functions = int(argv[2]) if len(argv) > 2 else 50
+
+    with Context() as ctx:
+        mods = create_modules(count, num_functions, ctx)
+        start = time.perf_counter()
+        for mod in mods[1:]:
+            mods[0].link_in(mod)
+        print('%-12s %8.3fs' % ('sequential', time.perf_counter() - start))
+
+    with Context() as ctx:
+        result = link_all(create_modules(count, num_functions, ctx))
+        print('%-12s %8.3fs  %d links, %d conflicts' % (
+            'link_all', result.seconds, result.links, len(result.conflicts)))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
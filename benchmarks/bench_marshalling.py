@@ -0,0 +1,57 @@
+"""Benchmark argument marshalling for calls and GEPs.
+
+Compares util.to_c_array() with the pooled util.acquire_array() for several
+argument counts, then times Builder.call and Builder.gep emission, which now
+use the pooled arrays.
+
+Usage: python -m benchmarks.bench_marshalling [iterations]
+"""
+import sys
+import time
+
+from llvm import util
+from llvm.core import Module
+from llvm.core import Type
+from llvm.core import Value
+from llvm.instruction_builder import Builder
+
+
+def per_call(fn, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def pooled(vals):
+    count, arr = util.acquire_array(vals)
+    util.release_array(arr)
+
+
+def main(argv):
+    iterations = int(argv[1]) if len(argv) > 1 else 100000
+    mod = Module.CreateWithName('bench')
+    ty = Type.int32(mod.context)
+
+    for n in [1, 4, 16, 64]:
+        vals = [Value.const_int(ty, i, True) for i in range(n)]
+        print('%3d args: to_c_array %.3f us, acquire_array %.3f us' % (
+            n, per_call(lambda: util.to_c_array(vals), iterations),
+            per_call(lambda: pooled(vals), iterations)))
+
+    params = [ty] * 4
+    callee = mod.add_function('callee', Type.function(ty, params, False))
+    f = mod.add_function('f', Type.function(ty, params, False))
+    bldr = Builder.create(mod.context)
+    bldr.position_at_end(f.append_basic_block('entry'))
+    args = [f.get_param(i) for i in range(4)]
+    arr = bldr.alloca(Type.array(ty, 16), 'arr')
+    zero = Value.const_int(ty, 0, True)
+    indices = [zero, args[0]]
+    print('Builder.call %.3f us, Builder.gep %.3f us' % (
+        per_call(lambda: bldr.call(callee, args, 'c'), iterations // 10),
+        per_call(lambda: bldr.gep(arr, indices, 'p'), iterations // 10)))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,63 @@
+"""Benchmark classifying every instruction of a large module.
+
+Compares fetching OpCode objects and testing them against OpCode members
+one by one with the raw opcode_value path and the precomputed category
+flags.
+
+Usage: python -m benchmarks.bench_opcodes [num_functions] [num_insts]
+"""
+import sys
+import time
+
+from llvm.core import OpCode
+
+from benchmarks.workloads import create_large_module
+
+
+def classify_objects(insts):
+    counts = [0, 0, 0]
+    terminators = [OpCode.Ret, OpCode.Br, OpCode.Switch, OpCode.IndirectBr,
+                   OpCode.Invoke, OpCode.Unreachable, OpCode.Resume]
+    binary_ops = [OpCode.Add, OpCode.Sub, OpCode.Mul, OpCode.And,
+                  OpCode.Or, OpCode.Xor]
+    for inst in insts:
+        op = inst.opcode
+        if op in terminators:
+            counts[0] += 1
+        elif op in binary_ops:
+            counts[1] += 1
+        else:
+            counts[2] += 1
+    return counts
+
+
+def classify_flags(insts):
+    counts = [0, 0, 0]
+    flags = OpCode.category_flags()
+    for inst in insts:
+        f = flags[inst.opcode_value]
+        if f & OpCode.TERMINATOR:
+            counts[0] += 1
+        elif f & OpCode.BINARY_OP:
+            counts[1] += 1
+        else:
+            counts[2] += 1
+    return counts
+
+
+def main(argv):
+    num_functions = int(argv[1]) if len(argv) > 1 else 100
+    num_insts = int(argv[2]) if len(argv) > 2 else 1000
+    mod = create_large_module(num_functions, num_insts)
+    insts = [inst for f in mod for bb in f for inst in bb]
+
+    for label, fn in [('OpCode objects', classify_objects),
+                      ('raw + flags', classify_flags)]:
+        start = time.perf_counter()
+        counts = fn(insts)
+        elapsed = time.perf_counter() - start
+        print('%-16s %8.3fs  %s' % (label, elapsed, counts))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
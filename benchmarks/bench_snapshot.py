@@ -0,0 +1,41 @@
+"""Benchmark columnar snapshots against wrapper traversal.
+
+Times walk_module() over the wrappers, taking a snapshot, and an opcode
+histogram computed from the wrappers and from the snapshot.
+
+Usage: python -m benchmarks.bench_snapshot [num_functions] [num_insts]
+"""
+import sys
+import time
+
+from collections import Counter
+
+from llvm.snapshot import snapshot
+
+from benchmarks.workloads import create_large_module
+from benchmarks.workloads import walk_module
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    print('%-18s %8.3fs' % (label, time.perf_counter() - start))
+    return result
+
+
+def main(argv):
+    num_functions = int(argv[1]) if len(argv) > 1 else 200
+    num_insts = int(argv[2]) if len(argv) > 2 else 500
+    mod = create_large_module(num_functions, num_insts)
+    print('%d functions x %d instructions' % (num_functions, num_insts))
+
+    timed('walk_module', lambda: walk_module(mod))
+    snap = timed('snapshot', lambda: snapshot(mod))
+    a = timed('histogram/wrappers', lambda: Counter(
+        inst.opcode_value for f in mod for bb in f for inst in bb))
+    b = timed('histogram/snapshot', lambda: Counter(snap.opcodes))
+    assert a == b
+
+
+if __name__ == '__main__':
+    main(sys.argv)
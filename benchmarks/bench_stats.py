@@ -0,0 +1,51 @@
+"""Benchmark module statistics over a directory of bitcode files.
+
+Writes num_files modules as .bc files to a temporary directory and times
+directory_stats() with one worker process and with one per CPU, and
+module_stats() against a snapshot of the same module.
+
+Usage: python -m benchmarks.bench_stats [num_files] [num_functions]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from llvm import bit_writer
+from llvm.core import Context
+from llvm.snapshot import snapshot
+from llvm.stats import directory_stats
+from llvm.stats import module_stats
+
+from benchmarks.workloads import create_large_module
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    fn()
+    print('%-20s %8.3fs' % (label, time.perf_counter() - start))
+
+
+def main(argv):
+    num_files = int(argv[1]) if len(argv) > 1 else 16
+    num_functions = int(argv[2]) if len(argv) > 2 else 50
+    directory = tempfile.mkdtemp()
+    try:
+        with Context() as ctx:
+            mod = create_large_module(num_functions, 500, ctx)
+            for i in range(num_files):
+                bit_writer.write_bitcode_to_file(
+                    mod, os.path.join(directory, 'm%d.bc' % i))
+            timed('module_stats', lambda: module_stats(mod))
+            timed('snapshot', lambda: snapshot(mod))
+
+        for jobs in (1, os.cpu_count()):
+            timed('directory, %d job%s' % (jobs, '' if jobs == 1 else 's'),
+                  lambda: list(directory_stats(directory, jobs)))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,46 @@
+"""Report the memory held by each kind of non-owning wrapper.
+
+Usage: python -m benchmarks.bench_wrapper_memory [count]
+"""
+import sys
+import tracemalloc
+
+from llvm.core import BasicBlock
+from llvm.core import Function
+from llvm.core import Instruction
+from llvm.core import Type
+from llvm.core import Use
+from llvm.core import Value
+
+from tests.testing import create_timestwo_module
+
+
+def bytes_per_wrapper(cls, ptr, count):
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    wrappers = [cls(ptr) for _ in range(count)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del wrappers
+    return (after - before) / float(count)
+
+
+def main(argv):
+    count = int(argv[1]) if len(argv) > 1 else 100000
+    mod, f = create_timestwo_module()
+    inst = f.first.first
+    samples = [
+        (Value, f.get_param(0)),
+        (Instruction, inst),
+        (Use, inst.operand_uses[0]),
+        (Function, f),
+        (BasicBlock, f.first),
+        (Type, f.type),
+    ]
+    for cls, obj in samples:
+        print('%-12s %6.1f bytes' % (cls.__name__, bytes_per_wrapper(
+            cls, obj._as_parameter_, count)))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,54 @@
+"""Report which LLVM C API calls dominate a workload.
+
+Builds and walks the shared large module with C API profiling enabled and
+prints the most expensive symbols. Optionally writes the JSON report and a
+pstats profile.
+
+Usage: python -m benchmarks.profile_capi [top] [json_path] [prof_path]
+"""
+import pstats
+import sys
+import time
+
+from llvm.common import get_library
+
+from benchmarks.workloads import create_large_module
+from benchmarks.workloads import walk_module
+
+
+def workload():
+    mod = create_large_module(50, 500)
+    walk_module(mod)
+
+
+def main(argv):
+    top = int(argv[1]) if len(argv) > 1 else 15
+    lib = get_library()
+
+    start = time.perf_counter()
+    workload()
+    plain = time.perf_counter() - start
+
+    profiler = lib.enable_profiling()
+    start = time.perf_counter()
+    workload()
+    profiled = time.perf_counter() - start
+    lib.disable_profiling()
+
+    print('workload %.3fs plain, %.3fs profiled' % (plain, profiled))
+    records = sorted(profiler.to_dict().items(),
+                     key=lambda item: item[1]['total'], reverse=True)
+    print('%-32s %10s %10s %10s' % ('symbol', 'calls', 'total ms', 'max us'))
+    for name, record in records[:top]:
+        print('%-32s %10d %10.2f %10.2f' % (name, record['calls'],
+                                            record['total'] * 1e3,
+                                            record['max'] * 1e6))
+    if len(argv) > 2:
+        profiler.dump_json(argv[2])
+    if len(argv) > 3:
+        profiler.dump_stats(argv[3])
+        pstats.Stats(argv[3]).sort_stats('tottime').print_callers(5)
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,66 @@
+"""Soak test for context rotation.
+
+Builds many small modules, each with fresh uniqued constants and a named
+struct type, as a compile service would. With 'single' every module is
+created in one context that is never disposed; with 'rotate' a
+ContextRecycler retires the context every N modules. Resident set size is
+sampled along the way and should stay bounded when rotating.
+
+Usage: python -m benchmarks.soak_context_rotation [single|rotate] [modules]
+           [modules_per_context]
+"""
+import sys
+import time
+
+from llvm.context_pool import ContextRecycler
+from llvm.context_pool import RotationPolicy
+from llvm.core import Context
+from llvm.core import Module
+from llvm.core import Type
+from llvm.core import Value
+from llvm.instruction_builder import Builder
+
+from benchmarks.stress_lifetime import rss_kib
+
+
+def populate(mod, context, i):
+    ty = Type.int64(context)
+    Type.create_named_structure(context, 'S%d' % i)
+    f = mod.add_function('f', Type.function(ty, [ty], False))
+    with Builder.create(context) as bldr:
+        bldr.position_at_end(f.append_basic_block('entry', context))
+        x = f.get_param(0)
+        for j in range(50):
+            x = bldr.add(x, Value.const_int(ty, i * 50 + j, True), 'x')
+        bldr.ret(x)
+
+
+def main(argv):
+    mode = argv[1] if len(argv) > 1 else 'rotate'
+    count = int(argv[2]) if len(argv) > 2 else 50000
+    per_context = int(argv[3]) if len(argv) > 3 else 1000
+    step = max(1, count // 10)
+
+    if mode == 'single':
+        context = Context()
+        recycler = None
+    else:
+        recycler = ContextRecycler(RotationPolicy(max_modules=per_context))
+
+    start = time.perf_counter()
+    for i in range(count):
+        if recycler is None:
+            mod = Module.CreateWithName('m%d' % i, context)
+            populate(mod, context, i)
+            mod.close()
+        else:
+            mod = recycler.create_module('m%d' % i)
+            populate(mod, mod.context, i)
+            recycler.release(mod)
+        if i % step == 0 or i == count - 1:
+            print('%s module %7d  rss %8d KiB  %.1fs' % (
+                mode, i, rss_kib(), time.perf_counter() - start))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
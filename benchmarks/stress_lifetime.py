@@ -0,0 +1,52 @@
+"""Stress explicit disposal over many create/close cycles.
+
+Each cycle creates a Context, a Module with one function, a Builder and a
+MemoryBuffer, then releases them with close() through context managers.
+Resident set size is sampled along the way and should stay flat.
+
+Usage: python -m benchmarks.stress_lifetime [cycles]
+"""
+import os
+import sys
+import time
+
+from llvm.core import Context
+from llvm.core import MemoryBuffer
+from llvm.core import Module
+from llvm.core import Type
+from llvm.core import Value
+from llvm.instruction_builder import Builder
+
+
+def rss_kib():
+    with open('/proc/self/statm') as f:
+        pages = int(f.read().split()[1])
+    return pages * os.sysconf('SC_PAGE_SIZE') // 1024
+
+
+def cycle(i):
+    with Context() as ctx:
+        mod = Module.CreateWithName('m%d' % i, ctx)
+        ty = Type.int32(ctx)
+        f = mod.add_function('f', Type.function(ty, [ty], False))
+        with Builder.create(ctx) as bldr:
+            bldr.position_at_end(f.append_basic_block('entry', ctx))
+            bldr.ret(bldr.add(f.get_param(0), Value.const_int(ty, 1, True),
+                              'r'))
+        with MemoryBuffer.from_string('x' * 4096):
+            pass
+
+
+def main(argv):
+    cycles = int(argv[1]) if len(argv) > 1 else 100000
+    step = max(1, cycles // 10)
+    start = time.perf_counter()
+    for i in range(cycles):
+        cycle(i)
+        if i % step == 0 or i == cycles - 1:
+            print('cycle %7d  rss %8d KiB  %.1fs' % (
+                i, rss_kib(), time.perf_counter() - start))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
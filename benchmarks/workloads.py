@@ -0,0 +1,51 @@
+"""Synthetic IR workloads shared by the benchmarks."""
+from llvm.core import Module
+from llvm.core import Type
+from llvm.core import Value
+
+from llvm.instruction_builder import Builder
+
+
+def create_large_module(num_functions=100, num_instructions=1000,
+                        context=None):
+    """Create a module of straight-line integer arithmetic.
+
+    Each function takes two i32 parameters and chains num_instructions
+    add/mul/sub instructions over them before returning the last result.
+    """
+    mod = Module.CreateWithName('bench', context)
+    ctx = mod.context
+    ty = Type.int32(context=ctx)
+    ft = Type.function(ty, [ty, ty], False)
+    bldr = Builder.create(ctx)
+    one = Value.const_int(ty, 1, True)
+    ops = [bldr.add, bldr.mul, bldr.sub]
+    for i in range(num_functions):
+        f = mod.add_function('f%d' % i, ft)
+        bb = f.append_basic_block('entry', ctx)
+        bldr.position_at_end(bb)
+        x = f.get_param(0)
+        y = f.get_param(1)
+        for j in range(num_instructions):
+            x, y = ops[j % 3](x, y, 't%d' % j), x
+        bldr.ret(bldr.add(x, one, 'r'))
+    return mod
+
+
+def walk_module(mod):
+    """Visit every function, block, instruction, operand and type.
+
+    Instructions and their types are kept for the duration of the walk, as
+    an analysis building per-instruction tables would, so operands that refer
+    to earlier instructions can resolve to live wrappers.
+    """
+    insts = []
+    types = []
+    for f in mod:
+        for bb in f:
+            for inst in bb:
+                for op in inst.operands:
+                    op.type
+                insts.append(inst)
+                types.append(inst.type)
+    return len(insts)
@@ -0,0 +1,46 @@
+"""Python bindings for the LLVM C API.
+
+Submodules are imported on first attribute access, so `import llvm` and
+`import llvm.bit_reader` only load the modules they actually use.
+"""
+import importlib
+
+_submodules = [
+    'basic_block',
+    'bit_reader',
+    'bit_writer',
+    'bitcode_loader',
+    'common',
+    'compile_cache',
+    'context',
+    'context_pool',
+    'core',
+    'disassembler',
+    'enumerations',
+    'execution',
+    'fingerprint',
+    'function',
+    'global_variables',
+    'instruction_builder',
+    'ir_reader',
+    'linker',
+    'memory_buffer',
+    'module',
+    'object',
+    'pass_manager',
+    'profiler',
+    'snapshot',
+    'stats',
+    'target',
+    'type',
+    'util',
+    'value',
+]
+
+def __getattr__(name):
+    if name in _submodules:
+        return importlib.import_module('.' + name, __name__)
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+def __dir__():
+    return sorted(list(globals()) + _submodules)
@@ -4,6 +4,7 @@ from .common import get_library
 
 from .value import Value
 from .function import Function
+from . import util
 
 from ctypes import POINTER
 from ctypes import byref
@@ -22,31 +23,33 @@ lib = get_library()
 
 
 class BasicBlock(LLVMObject):
+    __slots__ = ()
+
     def __init__(self, value):
         LLVMObject.__init__(self, value)
 
     @property
     def next(self):
         b = lib.LLVMGetNextBasicBlock(self)
-        return b and BasicBlock(b)
+        return b and BasicBlock.from_ptr(b)
 
     @property
     def prev(self):
         b = lib.LLVMGetPreviousBasicBlock(self)
-        return b and BasicBlock(b)
+        return b and BasicBlock.from_ptr(b)
 
     @property
     def first(self):
         i = lib.LLVMGetFirstInstruction(self)
-        return i and Instruction(i)
+        return i and Instruction.from_ptr(i)
 
     @property
     def last(self):
         i = lib.LLVMGetLastInstruction(self)
-        return i and Instruction(i)
+        return i and Instruction.from_ptr(i)
 
     def __as_value(self):
-        return Value(lib.LLVMBasicBlockAsValue(self))
+        return Value.from_ptr(lib.LLVMBasicBlockAsValue(self))
 
     @property
     def name(self):
@@ -87,6 +90,7 @@ class BasicBlock(LLVMObject):
         return BasicBlock.__inst_iterator(self, reverse=True)
 
 class Instruction(Value):
+    __slots__ = ()
 
     def __init__(self, value):
         Value.__init__(self, value)
@@ -94,12 +98,12 @@ class Instruction(Value):
     @property
     def next(self):
         i = lib.LLVMGetNextInstruction(self)
-        return i and Instruction(i)
+        return i and Instruction.from_ptr(i)
 
     @property
     def prev(self):
         i = lib.LLVMGetPreviousInstruction(self)
-        return i and Instruction(i)
+        return i and Instruction.from_ptr(i)
 
     @property
     def opcode(self):
@@ -107,29 +111,40 @@ class Instruction(Value):
         
         return OpCode.from_value(lib.LLVMGetInstructionOpcode(self))
 
+    @property
+    def opcode_value(self):
+        """The raw opcode number, without building an OpCode object.
+
+        Compare it against OpCode.X.value or look it up in the OpCode
+        category sets and flags."""
+        return lib.LLVMGetInstructionOpcode(self)
+
 class PhiNode(Value):
+    __slots__ = ()
+
     def __init__(self, ptr):
         Value.__init__(self, ptr)
 
     def add_incoming(self, vals, blocks):
-        count = len(vals)
-        val_array = (c_object_p * count)()
-        block_array = (c_object_p * count)()
-        for i in range(count):
-            val_array[i] = vals[i].from_param()
-            block_array[i] = blocks[i].from_param()
-        lib.LLVMAddIncoming(self, val_array, block_array, count)
+        count, val_array = util.acquire_array(vals)
+        _, block_array = util.acquire_array(blocks)
+        try:
+            lib.LLVMAddIncoming(self, val_array, block_array, count)
+        finally:
+            util.release_array(val_array)
+            util.release_array(block_array)
 
     def count_incoming(self):
         return lib.LLVMCountIncoming(self)
 
     def incoming_values(self):
         n = self.count_incoming()
-        return [Value(lib.LLVMGetIncomingValue(self, i)) for i in range(n)]
+        return [Value.from_ptr(lib.LLVMGetIncomingValue(self, i))
+                for i in range(n)]
 
     def incoming_blocks(self):
         n = self.count_incoming()
-        return [BasicBlock(lib.LLVMGetIncomingBlock(self, i))
+        return [BasicBlock.from_ptr(lib.LLVMGetIncomingBlock(self, i))
                 for i in range(n)]
 
 def register_library(library):
@@ -177,4 +192,4 @@ def register_library(library):
     library.LLVMGetPreviousBasicBlock.restype = c_object_p
 
 
-register_library(lib)
+register_library(lib.prototypes)
@@ -2,11 +2,10 @@ from .common import LLVMObject
 from .common import c_object_p
 from .common import get_library
 
-from . import enumerations
-
-from .core import MemoryBuffer
-from .core import Module
-from .core import Context
+from .memory_buffer import MemoryBuffer
+from .module import Module
+from .context import Context
+from . import util
 
 from ctypes import POINTER
 from ctypes import byref
@@ -14,42 +13,105 @@ from ctypes import c_char_p
 from ctypes import cast
 
 
-__all__ = ['parse_bitcode']
+__all__ = ['parse_bitcode', 'get_bitcode_module', 'materialize',
+           'materialize_all']
 lib = get_library()
 
 
-def parse_bitcode(mem_buffer, context=None):
-    """Input is .core.MemoryBuffer"""
+def parse_bitcode(mem_buffer, context=None, cache=None):
+    """Input is .core.MemoryBuffer
+
+    If a .compile_cache.CompileCache is given, the module is returned
+    optimized through it.
+    """
+    if cache is not None:
+        return cache.load_bitcode(mem_buffer, context)
+
+    if context is None:
+        context = Context.GetGlobalContext()
+    m = _parse_bitcode(mem_buffer, context)
+    context.take_ownership(m)
+    return m
+
+def _parse_bitcode(mem_buffer, context):
+    """Parse mem_buffer into a module of context that owns itself."""
     module = c_object_p()
-    out = c_char_p(None)
+    out = util.c_message_p(None)
+    result = lib.LLVMParseBitcodeInContext(context,
+                                           mem_buffer,
+                                           byref(module),
+                                           byref(out))
+    if result:
+        raise RuntimeError('LLVM Error: %s' % util.take_message(out))
+
+    m = Module(module, context=context)
+    m.take_ownership(mem_buffer)
+    return m
+
+def get_bitcode_module(mem_buffer, context=None):
+    """Read a module from .core.MemoryBuffer lazily.
+
+    Only the module skeleton is read: globals, function names and types are
+    available at once, while function bodies stay in the buffer until they
+    are materialized with materialize() or materialize_all(). The module
+    takes over mem_buffer, which is freed together with it.
+    """
+    module = c_object_p()
+    out = util.c_message_p(None)
     if context is None:
-        result = lib.LLVMParseBitcode(mem_buffer, byref(module), byref(out))
-    else:
-        result = lib.LLVMParseBitcodeInContext(context,
+        context = Context.GetGlobalContext()
+    result = lib.LLVMGetBitcodeModuleInContext(context,
                                                mem_buffer,
                                                byref(module),
                                                byref(out))
     if result:
-        raise RuntimeError('LLVM Error: %s' % out.value)
+        raise RuntimeError('LLVM Error: %s' % util.take_message(out))
 
-    if context is None:
-        context = Context.GetGlobalContext()
     m = Module(module, context=context)
     context.take_ownership(m)
-    m.take_ownership(mem_buffer)
+    m.take_ownership(mem_buffer, native=True)
     return m
 
+def materialize(module, function):
+    """Read the body of a function from a lazily loaded module.
+
+    function is a .core.Function of module or its name. Does nothing if the
+    body has already been read. Returns the function.
+    """
+    from .pass_manager import FunctionPassManager
+
+    if isinstance(function, str):
+        function = module.get_function(function)
+    if not function.is_materialized:
+        with FunctionPassManager.for_module(module) as fpm:
+            fpm.run(function)
+    return function
+
+def materialize_all(module):
+    """Read the bodies of every function of a lazily loaded module."""
+    from .pass_manager import FunctionPassManager
+    with FunctionPassManager.for_module(module) as fpm:
+        for function in module:
+            if not function.is_materialized:
+                fpm.run(function)
+
 def register_library(library):
     library.LLVMParseBitcode.argtypes = [MemoryBuffer,
                                          POINTER(c_object_p),
-                                         POINTER(c_char_p)]
+                                         POINTER(util.c_message_p)]
     library.LLVMParseBitcode.restype = bool
 
     library.LLVMParseBitcodeInContext.argtypes = [Context,
                                                   MemoryBuffer,
                                                   POINTER(c_object_p),
-                                                  POINTER(c_char_p)]
+                                                  POINTER(util.c_message_p)]
     library.LLVMParseBitcodeInContext.restype = bool
 
+    library.LLVMGetBitcodeModuleInContext.argtypes = [Context,
+                                                      MemoryBuffer,
+                                                      POINTER(c_object_p),
+                                                      POINTER(util.c_message_p)]
+    library.LLVMGetBitcodeModuleInContext.restype = bool
+
     
-register_library(lib)
+register_library(lib.prototypes)
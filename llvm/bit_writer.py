@@ -0,0 +1,54 @@
+from .common import c_object_p
+from .common import get_library
+
+from .memory_buffer import MemoryBuffer
+from .module import Module
+
+from ctypes import c_char_p
+from ctypes import c_int
+
+
+__all__ = [
+    'write_bitcode_to_file',
+    'write_bitcode_to_fd',
+    'write_bitcode_to_memory_buffer',
+    'write_bitcode',
+]
+lib = get_library()
+
+
+def write_bitcode_to_file(module, path):
+    """Write module as bitcode to the file at path."""
+    if lib.LLVMWriteBitcodeToFile(module, path.encode()):
+        raise RuntimeError('LLVM Error: could not write bitcode to %s' % path)
+
+def write_bitcode_to_fd(module, fd, should_close=False, unbuffered=False):
+    """Write module as bitcode to an open file descriptor.
+
+    The descriptor is closed afterwards if should_close is true.
+    """
+    if lib.LLVMWriteBitcodeToFD(module, fd, should_close, unbuffered):
+        raise RuntimeError('LLVM Error: could not write bitcode to fd %d'
+                           % fd)
+
+def write_bitcode_to_memory_buffer(module):
+    """Return a new .core.MemoryBuffer holding module as bitcode."""
+    return MemoryBuffer(lib.LLVMWriteBitcodeToMemoryBuffer(module))
+
+def write_bitcode(module):
+    """Return module as bitcode bytes."""
+    with write_bitcode_to_memory_buffer(module) as mem:
+        return mem.to_bytes()
+
+def register_library(library):
+    library.LLVMWriteBitcodeToFile.argtypes = [Module, c_char_p]
+    library.LLVMWriteBitcodeToFile.restype = c_int
+
+    library.LLVMWriteBitcodeToFD.argtypes = [Module, c_int, c_int, c_int]
+    library.LLVMWriteBitcodeToFD.restype = c_int
+
+    library.LLVMWriteBitcodeToMemoryBuffer.argtypes = [Module]
+    library.LLVMWriteBitcodeToMemoryBuffer.restype = c_object_p
+
+
+register_library(lib.prototypes)
@@ -0,0 +1,194 @@
+#===- bitcode_loader.py - Python LLVM Bindings ---------------*- python -*--===#
+#
+#                     The LLVM Compiler Infrastructure
+#
+# This file is distributed under the University of Illinois Open Source
+# License. See LICENSE.TXT for details.
+#
+#===------------------------------------------------------------------------===#
+
+"""Load many bitcode files in parallel.
+
+A BitcodeLoader parses a list of files on a pool of workers and yields a
+LoadResult for each file as soon as it is done:
+
+    with BitcodeLoader(paths, max_workers=8) as loader:
+        for result in loader:
+            if result.error is None:
+                process(result.module)
+
+By default the workers are the threads of a ContextPool. Every file is
+parsed into a fresh Context that is handed to the caller with the module
+in the LoadResult, so a worker never touches a context again once its
+module has been yielded. A module stays valid until its result or the
+loader is closed.
+
+With processes=True the files are parsed in worker processes instead and
+each result carries the module as bitcode bytes, for the caller to read
+back with bit_reader or to hand on elsewhere. lazy=True, which leaves
+function bodies unread, is only supported with threads: a process would
+have to read every body anyway to write the module back out.
+
+cancel() stops the loader: files not yet started are skipped and iteration
+ends.
+"""
+
+import threading
+import time
+
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import wait
+
+from . import bit_reader
+from .context import Context
+from .context_pool import ContextPool
+from .memory_buffer import MemoryBuffer
+
+__all__ = ['BitcodeLoader', 'LoadResult']
+
+class LoadResult(object):
+    """The outcome of loading one file.
+
+    path is the file, seconds the time spent on it by the worker and error
+    the exception raised, if any. In thread mode module is the parsed
+    Module and context the Context it was parsed into, which belongs to
+    this result alone; close() disposes both. In process mode bitcode holds
+    the module's bytes.
+    """
+    __slots__ = ('path', 'module', 'context', 'bitcode', 'error', 'seconds')
+
+    def __init__(self, path, module=None, context=None, bitcode=None,
+                 error=None, seconds=0.0):
+        self.path = path
+        self.module = module
+        self.context = context
+        self.bitcode = bitcode
+        self.error = error
+        self.seconds = seconds
+
+    def close(self):
+        """Dispose the context of a thread mode result and its module."""
+        if self.context is not None:
+            self.context.close()
+
+    def __repr__(self):
+        return '<LoadResult %s %.3fs%s>' % (
+            self.path, self.seconds,
+            '' if self.error is None else ' error=%r' % self.error)
+
+def _load(path, context, lazy):
+    mem = MemoryBuffer.fromFile(path)
+    if lazy:
+        return bit_reader.get_bitcode_module(mem, context)
+    return bit_reader.parse_bitcode(mem, context)
+
+def _load_in_process(path):
+    """Process pool entry point: parse path and return it as bitcode."""
+    from .bit_writer import write_bitcode
+
+    start = time.perf_counter()
+    try:
+        with Context() as context:
+            data = write_bitcode(_load(path, context, False))
+    except Exception as e:
+        return LoadResult(path, error=e,
+                          seconds=time.perf_counter() - start)
+    return LoadResult(path, bitcode=data,
+                      seconds=time.perf_counter() - start)
+
+class BitcodeLoader(object):
+    """Parses bitcode files in parallel and streams the results.
+
+    Results are yielded in completion order. With lazy=True modules are
+    read with bit_reader.get_bitcode_module() and their function bodies
+    are left unread; it raises ValueError together with processes=True.
+
+    In thread mode the files are parsed on the workers of pool, a
+    ContextPool, or of a pool of max_workers threads owned by the loader if
+    none is given.
+    """
+    def __init__(self, paths, max_workers=None, processes=False, lazy=False,
+                 pool=None):
+        if processes and lazy:
+            raise ValueError('lazy loading is not supported with processes')
+        self.paths = list(paths)
+        self.max_workers = max_workers
+        self.processes = processes
+        self.lazy = lazy
+        self._executor = None
+        self._pool = pool
+        self._owns_pool = pool is None
+        self._lock = threading.Lock()
+        self._results = []
+        self._futures = None
+        self._cancelled = False
+
+    def _start(self):
+        if self.processes:
+            self._executor = ProcessPoolExecutor(self.max_workers)
+            self._futures = set(self._executor.submit(_load_in_process, path)
+                                for path in self.paths)
+        else:
+            if self._pool is None:
+                self._pool = ContextPool(self.max_workers)
+            self._futures = set(self._pool.submit(self._load_in_thread, path)
+                                for path in self.paths)
+
+    def _load_in_thread(self, path):
+        start = time.perf_counter()
+        context = Context()
+        try:
+            module = _load(path, context, self.lazy)
+        except Exception as e:
+            context.close()
+            return LoadResult(path, error=e,
+                              seconds=time.perf_counter() - start)
+        result = LoadResult(path, module=module, context=context,
+                            seconds=time.perf_counter() - start)
+        with self._lock:
+            self._results.append(result)
+        return result
+
+    def __iter__(self):
+        if self._futures is None:
+            self._start()
+        pending = self._futures
+        while pending and not self._cancelled:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if self._cancelled:
+                    break
+                if not future.cancelled():
+                    yield future.result()
+
+    def cancel(self):
+        """Skip the files that have not been started and stop iterating."""
+        self._cancelled = True
+        for future in self._futures or ():
+            future.cancel()
+
+    def close(self):
+        """Stop the workers and close every thread mode result.
+
+        Modules yielded in thread mode are invalid afterwards.
+        """
+        self.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._futures:
+            wait(self._futures)
+        if self._pool is not None and self._owns_pool:
+            self._pool.close()
+            self._pool = None
+        with self._lock:
+            results, self._results = self._results, []
+        for result in results:
+            result.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -14,6 +14,7 @@ from ctypes import addressof
 
 import ctypes.util
 import platform
+import weakref
 
 # LLVM_VERSION: sync with PACKAGE_VERSION in autoconf/configure.ac and CMakeLists.txt
 #               but leave out the 'svn' suffix.
@@ -22,6 +23,8 @@ LLVM_VERSION = '3.6.2'
 __all__ = [
     'c_object_p',
     'get_library',
+    'enable_interning',
+    'disable_interning',
 ]
 
 class Opaque(Structure):
@@ -30,23 +33,125 @@ class Opaque(Structure):
     
 c_object_p = POINTER(Opaque)
 
+# Wrapper interning. When enabled, LLVMObject.from_ptr() hands back the live
+# wrapper already associated with a native address instead of building a new
+# one. Entries are weak references so the table never keeps a wrapper
+# alive; a plain dict of KeyedRef is used rather than WeakValueDictionary
+# because lookups sit on the traversal fast path.
+_interning = False
+_intern_table = {}
+
+def _intern_remove(ref):
+    if _intern_table.get(ref.key) is ref:
+        del _intern_table[ref.key]
+
+def enable_interning():
+    """Reuse wrappers for the same native pointer during traversals."""
+    global _interning
+    _interning = True
+
+def disable_interning():
+    """Stop reusing wrappers and drop the intern table."""
+    global _interning
+    _interning = False
+    _intern_table.clear()
+
+def forget_interned(obj):
+    """Remove a wrapper from the intern table.
+
+    Called when the native object behind obj is deleted so that a later
+    allocation at the same address does not resolve to the stale wrapper.
+    """
+    if obj._as_parameter_:
+        _intern_table.pop(obj._address(), None)
+
+class _Disposal(object):
+    """Native state of a wrapper that owns LLVM memory.
+
+    Instances are what the finalizer registry holds on to: they carry the
+    pointer, the disposer and the list of owned objects but never the
+    wrapper itself, so registering one does not keep the wrapper alive.
+    Calling the instance closes the owned objects, most recent first, and
+    then disposes the pointer; later calls do nothing. Disposers are
+    invoked with the instance, which converts like a wrapper through
+    _as_parameter_. owner is a weak reference to the wrapper that took
+    ownership of this one, if any.
+    """
+    __slots__ = ('_as_parameter_', 'disposer', 'owned', 'owner')
+
+    def __init__(self, ptr, disposer):
+        self._as_parameter_ = ptr
+        self.disposer = disposer
+        self.owner = None
+        self.owned = []
+
+    def __call__(self):
+        owned = self.owned
+        if owned:
+            self.owned = []
+            for obj in reversed(owned):
+                obj.close()
+
+        disposer = self.disposer
+        if disposer:
+            self.disposer = None
+            disposer(self)
+            # Values owned by the disposed object may be freed with it and
+            # their addresses reused, so interned wrappers can't be trusted.
+            if _intern_table:
+                _intern_table.clear()
+
 class LLVMObject(object):
     """Base class for objects that are backed by an LLVM data structure.
 
     This class should never be instantiated outside of this package.
+
+    Wrappers use __slots__ so that the many short-lived non-owning handles
+    (values, uses, types) carry no instance dictionary. Subclasses declare
+    their own (usually empty) __slots__ to keep it that way.
+
+    There is no __del__: only wrappers constructed with a disposer are
+    registered with weakref.finalize, which disposes them when they are
+    collected without having been closed. Non-owning wrappers cost the
+    garbage collector nothing beyond their memory. The list of owned
+    objects is created eagerly for owning wrappers, and only on first use
+    of take_ownership() otherwise.
     """
+    __slots__ = ('_as_parameter_', '_disposal', '_finalizer',
+                 '_owned_objects', '__weakref__')
+
     def __init__(self, ptr, ownable=True, disposer=None):
         assert isinstance(ptr, c_object_p)
 
         self._as_parameter_ = ptr
+        if disposer is not None:
+            disposal = self._disposal = _Disposal(ptr, disposer)
+            self._owned_objects = disposal.owned
+            self._finalizer = weakref.finalize(self, disposal)
 
-        self._self_owned = True
-        self._ownable = ownable
-        self._disposer = disposer
+    @classmethod
+    def from_ptr(cls, ptr):
+        """Obtain a wrapper of this class for a native pointer.
+
+        This is equivalent to cls(ptr), except that when interning is enabled
+        (see enable_interning()) the same wrapper is returned for the same
+        pointer for as long as it is alive. A live wrapper of a subclass
+        satisfies a request for its base, so operands resolve to the
+        Instruction or Function objects already handed out. Null pointers are
+        never interned.
+        """
+        if not _interning or not ptr:
+            return cls(ptr)
 
-        self._owned_objects = []
+        key = addressof(ptr.contents)
+        ref = _intern_table.get(key)
+        obj = ref and ref()
+        if not isinstance(obj, cls):
+            obj = cls(ptr)
+            _intern_table[key] = weakref.KeyedRef(obj, _intern_remove, key)
+        return obj
 
-    def take_ownership(self, obj):
+    def take_ownership(self, obj, native=False):
         """Take ownership of another object.
 
         When you take ownership of another object, you are responsible for
@@ -54,13 +159,55 @@ class LLVMObject(object):
         placed inside this object so the Python garbage collector will not
         collect the object while it is still alive in libLLVM.
 
+        Owned objects are closed, most recent first, before this object is
+        disposed, and are no longer disposed on their own when collected.
+        Pass native=True when the C API has already transferred ownership,
+        so that this object's own disposer frees obj; obj is then only
+        invalidated when this object is closed.
+
         This method should likely only be called from within modules inside
         this package.
         """
         assert isinstance(obj, LLVMObject)
 
-        self._owned_objects.append(obj)
-        obj._self_owned = False
+        try:
+            owned = self._owned_objects
+        except AttributeError:
+            owned = self._owned_objects = []
+        owned.append(obj)
+
+        finalizer = getattr(obj, '_finalizer', None)
+        if finalizer is not None:
+            finalizer.detach()
+            obj._disposal.owner = weakref.ref(self)
+            if native:
+                obj._disposal.disposer = None
+
+    def get_owner(self):
+        """Return the live wrapper that took ownership of this object.
+
+        Returns None if this object is not owned, its owner has been
+        collected, or it does not own native memory itself.
+        """
+        disposal = getattr(self, '_disposal', None)
+        if disposal is None or disposal.owner is None:
+            return None
+        return disposal.owner()
+
+    def detach(self):
+        """Give up the native object without disposing of it.
+
+        For C API calls that consume an object passed to them, such as a
+        memory buffer handed to a parser. The wrapper is left holding a null
+        pointer, like a closed one.
+        """
+        if not self._as_parameter_:
+            return
+        if getattr(self, '_disposal', None) is not None:
+            self._finalizer.detach()
+            self._disposal.disposer = None
+        forget_interned(self)
+        self._as_parameter_ = c_object_p()
 
     def from_param(self):
         """ctypes function that converts this object to a function parameter."""
@@ -69,24 +216,52 @@ class LLVMObject(object):
     def is_null(self):
         return not self._as_parameter_
 
-    def __del__(self):
-        if not hasattr(self, '_self_owned') or not hasattr(self, '_disposer'):
+    def close(self):
+        """Release the native object and everything it owns now.
+
+        Owned objects are closed first, then this object's disposer is
+        called. The wrapper is left holding a null pointer, so closing it
+        again is a no-op. Wrappers that do not own native memory only drop
+        their references.
+        """
+        if not self._as_parameter_:
             return
 
-        if self._self_owned and self._disposer:
-            self._disposer(self)
+        disposal = getattr(self, '_disposal', None)
+        if disposal is not None:
+            self._finalizer.detach()
+            disposal()
+        else:
+            owned = getattr(self, '_owned_objects', None)
+            if owned:
+                self._owned_objects = []
+                for obj in reversed(owned):
+                    obj.close()
+        forget_interned(self)
+        self._as_parameter_ = c_object_p()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _address(self):
+        """The native address this object wraps, or 0 for a null pointer."""
+        ptr = self._as_parameter_
+        return addressof(ptr.contents) if ptr else 0
 
     def __eq__(self, other):
         """Object identity"""
-        if self.is_null():
-            return other.is_null()
-        elif other.is_null():
-            return False
-        elif isinstance(other, LLVMObject):
-            return (addressof(self._as_parameter_.contents) ==
-                    addressof(other._as_parameter_.contents))
-        else:
+        if not isinstance(other, LLVMObject):
             return False
+        return self._address() == other._address()
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self._address())
 
 class CachedProperty(object):
     """Decorator that caches the result of a property lookup.
@@ -111,8 +286,106 @@ class CachedProperty(object):
 
         return value
 
+class Prototype(object):
+    """Recorded ctypes attributes (argtypes, restype, ...) for one symbol."""
+    pass
+
+class PrototypeTable(object):
+    """Declaration view of a Library.
+
+    Modules describe the C functions they use by assigning ctypes attributes
+    through this view, e.g. table.LLVMTypeOf.restype = c_object_p. Nothing is
+    looked up in the shared library at that point; the recorded attributes
+    are applied when the symbol is first accessed on the Library. If the
+    symbol has already been bound, it is unbound so that the next access
+    picks up the amended prototype.
+    """
+    def __init__(self, library):
+        self._library = library
+        self._prototypes = {}
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        self._library.__dict__.pop(name, None)
+        proto = self._prototypes.get(name)
+        if proto is None:
+            proto = self._prototypes[name] = Prototype()
+        return proto
+
+    def __contains__(self, name):
+        return name in self._prototypes
+
+class Library(object):
+    """The LLVM shared library with lazily bound function prototypes.
+
+    Attribute access resolves the symbol in the underlying CDLL, applies the
+    prototype declared for it in the prototypes table (if any) and caches the
+    result on the instance, so every later access is a plain attribute
+    lookup.
+    """
+    def __init__(self, cdll):
+        self._cdll = cdll
+        self._profiler = None
+        self.prototypes = PrototypeTable(self)
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        fn = self._bind(name, self.prototypes._prototypes.get(name))
+        if self._profiler is not None:
+            fn = self._profiler.wrap(name, fn)
+        setattr(self, name, fn)
+        return fn
+
+    def enable_profiling(self, profiler=None):
+        """Record call counts and latencies of every bound function.
+
+        Functions are rebound through the profiler (a new
+        profiler.CallProfiler unless one is given), which is returned.
+        """
+        if profiler is None:
+            from .profiler import CallProfiler
+            profiler = CallProfiler()
+        self._profiler = profiler
+        self._unbind_all()
+        return profiler
+
+    def disable_profiling(self):
+        """Go back to plain bound functions and return the profiler."""
+        profiler = self._profiler
+        self._profiler = None
+        self._unbind_all()
+        return profiler
+
+    def _unbind_all(self):
+        for name in [name for name in self.__dict__
+                     if not name.startswith('_') and name != 'prototypes']:
+            del self.__dict__[name]
+
+    def _bind(self, name, proto):
+        """Return the callable for a symbol with its prototype applied."""
+        fn = getattr(self._cdll, name)
+        if proto is not None:
+            for attr, value in proto.__dict__.items():
+                setattr(fn, attr, value)
+        return fn
+
+_library = None
+
 def get_library():
-    """Obtain a reference to the llvm library."""
+    """Obtain a reference to the llvm library.
+
+    The shared library is located and loaded once; later calls return the
+    same Library instance.
+    """
+    global _library
+    if _library is None:
+        _library = Library(load_library())
+    return _library
+
+def load_library():
+    """Locate and load the llvm shared library."""
 
     # On Linux, ctypes.cdll.LoadLibrary() respects LD_LIBRARY_PATH
     # while ctypes.util.find_library() doesn't.
@@ -0,0 +1,372 @@
+#===- compile_cache.py - Python LLVM Bindings ----------------*- python -*--===#
+#
+#                     The LLVM Compiler Infrastructure
+#
+# This file is distributed under the University of Illinois Open Source
+# License. See LICENSE.TXT for details.
+#
+#===------------------------------------------------------------------------===#
+
+"""Persistent, content-addressed cache of optimized modules.
+
+A CompileCache keeps the result of optimizing a module, as bitcode, and of
+compiling it, as object code, in a directory on disk. Entries are keyed by
+a SHA-256 hash of the unoptimized bitcode (which carries the module's own
+triple and data layout), the target triple, CPU, features and data layout
+of the cache's target machine, and the optimization pipeline, so a worker
+that is restarted picks up where it left off:
+
+    cache = CompileCache('/var/cache/llvmpy', max_bytes=1 << 30)
+    optimized = cache.optimize(module)  # an optimized copy, loaded from
+                                        # the cache if a previous run made it
+    engine = ExecutionEngine.create_jit(optimized)
+    obj = cache.object_code(module)     # bytes of the object file
+
+bit_reader.parse_bitcode(mem_buffer, context, cache=cache) returns the
+parsed module optimized through the cache. The cache is only used where it
+is passed explicitly: optimizing changes the IR, e.g. into intrinsics the
+interpreter cannot run, so callers decide which modules go through it.
+
+The directory can be shared by several processes. Readers hold a shared
+and writers an exclusive lock on a lock file in it (POSIX only; elsewhere
+only the atomic rename of new entries protects readers). Writers keep the
+total size of the entries in an index file next to it, so a store costs
+the same however many entries there are. Once the total exceeds max_bytes
+the directory is scanned and the least recently used entries are removed
+until three quarters of max_bytes are left. A damaged bitcode entry, e.g.
+one truncated by a crash, is removed when read and treated as a miss.
+"""
+
+import contextlib
+import hashlib
+import os
+import tempfile
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from . import bit_reader
+from .bit_writer import write_bitcode
+from .context import Context
+from .memory_buffer import MemoryBuffer
+from .pass_manager import run_passes
+from .target import TargetMachine
+
+__all__ = ['CompileCache']
+
+DEFAULT_MAX_BYTES = 512 << 20
+
+# Part of every key; bump it when the layout of entries changes.
+_KEY_VERSION = b'llvmpy-compile-cache-1'
+
+_TEMP_PREFIX = '.tmp-'
+
+# Eviction frees space down to this fraction of max_bytes, so that a full
+# cache is not scanned again on the very next store.
+_LOW_WATER = 0.75
+
+
+class CompileCache(object):
+    """An on-disk cache of optimized bitcode and object code.
+
+    opt_level selects the 'default<On>' pipeline unless passes gives
+    another one; both are part of the key. triple, cpu and features
+    describe the target machine used to emit object code, for the host by
+    default. With emit_object=False only optimized bitcode is stored.
+
+    hits and misses count lookups by this instance, stores the entries it
+    wrote and evictions the entries it removed.
+    """
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES, opt_level=2,
+                 passes=None, triple=None, cpu='', features='',
+                 emit_object=True):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.opt_level = opt_level
+        self.passes = passes or 'default<O%d>' % opt_level
+        self.cpu = cpu
+        self.features = features
+        self.emit_object = emit_object
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._triple = triple
+        self._target_machine = None
+        self._settings = None
+        os.makedirs(directory, exist_ok=True)
+        self._lock_path = os.path.join(directory, 'lock')
+        self._index_path = os.path.join(directory, 'size')
+
+    @property
+    def target_machine(self):
+        if self._target_machine is None:
+            self._target_machine = TargetMachine.create(
+                self._triple, self.cpu, self.features, self.opt_level)
+        return self._target_machine
+
+    def key(self, bitcode):
+        """Return the hex digest identifying the entry for bitcode."""
+        if self._settings is None:
+            tm = self.target_machine
+            self._settings = [_KEY_VERSION, tm.triple.encode(),
+                              tm.data_layout.encode(), self.cpu.encode(),
+                              self.features.encode(), self.passes.encode(),
+                              str(self.opt_level).encode()]
+        digest = hashlib.sha256()
+        for part in self._settings + [bitcode]:
+            digest.update(b'%d:' % len(part))
+            digest.update(part)
+        return digest.hexdigest()
+
+    def _path(self, key, kind):
+        return os.path.join(self.directory, key[:2], '%s.%s' % (key, kind))
+
+    @contextlib.contextmanager
+    def _locked(self, exclusive):
+        if fcntl is None:
+            yield
+            return
+        fd = os.open(self._lock_path, os.O_RDWR | os.O_CREAT, 0o666)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            yield
+        finally:
+            os.close(fd)
+
+    def lookup(self, key, kind='bc'):
+        """Return the bytes stored for key, or None.
+
+        kind is 'bc' for optimized bitcode or 'o' for object code. A hit
+        marks the entry as recently used.
+        """
+        path = self._path(key, kind)
+        with self._locked(False):
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+                os.utime(path)
+            except OSError:
+                data = None
+        if data is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return data
+
+    def store(self, key, kind, data):
+        """Store data for key and evict old entries if over max_bytes."""
+        path = self._path(key, kind)
+        subdir = os.path.dirname(path)
+        os.makedirs(subdir, exist_ok=True)
+        fd, temp = tempfile.mkstemp(prefix=_TEMP_PREFIX, dir=subdir)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            with self._locked(True):
+                replaced = _file_size(path)
+                os.replace(temp, path)
+                self.stores += 1
+                total = self._read_total()
+                if total is not None:
+                    total += len(data) - replaced
+                if total is None or total > self.max_bytes:
+                    total = self._evict()
+                self._write_total(total)
+        except BaseException:
+            if os.path.exists(temp):
+                os.remove(temp)
+            raise
+
+    def discard(self, key):
+        """Remove the entry for key, bitcode and object code."""
+        with self._locked(True):
+            total = self._read_total()
+            for kind in ('bc', 'o'):
+                path = self._path(key, kind)
+                size = _file_size(path)
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                if total is not None:
+                    total -= size
+            if total is not None:
+                self._write_total(max(total, 0))
+
+    def _read_total(self):
+        """The total size from the index, or None if it is missing."""
+        try:
+            with open(self._index_path) as f:
+                return int(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def _write_total(self, total):
+        with open(self._index_path, 'w') as f:
+            f.write('%d' % total)
+
+    def _entries(self):
+        """Map each key to [size, last use, paths] for the files on disk."""
+        entries = {}
+        for subdir in os.listdir(self.directory):
+            subpath = os.path.join(self.directory, subdir)
+            if len(subdir) != 2 or not os.path.isdir(subpath):
+                continue
+            for name in os.listdir(subpath):
+                if name.startswith(_TEMP_PREFIX):
+                    continue
+                path = os.path.join(subpath, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entry = entries.get(name.split('.')[0])
+                if entry is None:
+                    entry = entries[name.split('.')[0]] = [0, 0, []]
+                entry[0] += st.st_size
+                entry[1] = max(entry[1], st.st_mtime_ns)
+                entry[2].append(path)
+        return entries
+
+    def _evict(self):
+        """Scan the entries, evict down to the low-water mark if over
+        max_bytes, and return the total size left."""
+        entries = self._entries()
+        total = sum(entry[0] for entry in entries.values())
+        if total <= self.max_bytes:
+            return total
+        target = int(self.max_bytes * _LOW_WATER)
+        for size, _, paths in sorted(entries.values(),
+                                     key=lambda entry: entry[1]):
+            for path in paths:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self.evictions += 1
+            total -= size
+            if total <= target:
+                break
+        return total
+
+    def size(self):
+        """Return the total size of the entries in bytes."""
+        with self._locked(False):
+            return sum(entry[0] for entry in self._entries().values())
+
+    def clear(self):
+        """Remove every entry."""
+        with self._locked(True):
+            for _, _, paths in self._entries().values():
+                for path in paths:
+                    os.remove(path)
+            self._write_total(0)
+
+    def stats(self):
+        """Return the counters as a dict."""
+        return {'hits': self.hits, 'misses': self.misses,
+                'stores': self.stores, 'evictions': self.evictions}
+
+    def _compile(self, module, key):
+        """Optimize module in place and store the results under key."""
+        run_passes(module, self.passes, self.target_machine)
+        self.store(key, 'bc', write_bitcode(module))
+        if self.emit_object:
+            # Emitting sets the data layout, so work on a copy.
+            with module.clone() as copy:
+                obj = self.target_machine.emit_object(copy)
+            self.store(key, 'o', obj)
+            return obj
+        return None
+
+    def optimize(self, module):
+        """Return an optimized copy of module, from the cache if possible.
+
+        module itself is left unchanged, so wrappers of its functions and
+        values stay valid. The copy is in the same context and owned like
+        module.clone(). Whether it came from the cache shows in hits.
+        """
+        key = self.key(write_bitcode(module))
+        data = self.lookup(key, 'bc')
+        # Bitcode does not record the module identifier; the parser takes
+        # it from the buffer name.
+        copy = data and self._parse_entry(key, data, module.context,
+                                          module.identifier)
+        if copy is None:
+            copy = module.clone()
+            self._compile(copy, key)
+            return copy
+        owner = module.get_owner()
+        if isinstance(owner, Context):
+            owner.take_ownership(copy)
+        return copy
+
+    def load_bitcode(self, mem_buffer, context=None):
+        """Parse the bitcode in mem_buffer into an optimized module.
+
+        Like bit_reader.parse_bitcode(), the module takes over mem_buffer.
+        """
+        if context is None:
+            context = Context.GetGlobalContext()
+        key = self.key(mem_buffer.memoryview())
+        data = self.lookup(key, 'bc')
+        module = data and self._parse_entry(key, data, context)
+        if module is None:
+            module = bit_reader.parse_bitcode(mem_buffer, context)
+            self._compile(module, key)
+            return module
+        context.take_ownership(module)
+        module.take_ownership(mem_buffer)
+        return module
+
+    def _parse_entry(self, key, data, context, name='inputBuffer'):
+        """Parse cached bitcode into a module of context that owns itself.
+
+        An entry that does not parse is discarded and the lookup counted
+        as a miss; None is returned.
+        """
+        mem = MemoryBuffer.from_bytes(data, name)
+        try:
+            return bit_reader._parse_bitcode(mem, context)
+        except RuntimeError:
+            mem.close()
+            self.discard(key)
+            self.hits -= 1
+            self.misses += 1
+            return None
+
+    def object_code(self, module):
+        """Return the object code of module optimized, as bytes.
+
+        module itself is left unchanged.
+        """
+        key = self.key(write_bitcode(module))
+        data = self.lookup(key, 'o')
+        if data is None:
+            with module.clone() as copy:
+                if self.emit_object:
+                    data = self._compile(copy, key)
+                else:
+                    run_passes(copy, self.passes, self.target_machine)
+                    data = self.target_machine.emit_object(copy)
+        return data
+
+    def close(self):
+        if self._target_machine is not None:
+            self._target_machine.close()
+            self._target_machine = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def _file_size(path):
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return 0
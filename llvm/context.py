@@ -1,6 +1,12 @@
 from .common import LLVMObject
 from .common import c_object_p
 from .common import get_library
+from . import util
+
+from ctypes import CFUNCTYPE
+from ctypes import c_int
+from ctypes import c_void_p
+from ctypes import cast
 
 
 lib = get_library()
@@ -19,6 +25,52 @@ class Context(LLVMObject):
     def GetGlobalContext(cls):
         return Context(lib.LLVMGetGlobalContext())
 
+    def capture_diagnostics(self):
+        """Return a DiagnosticCollector for this context."""
+        return DiagnosticCollector(self)
+
+
+_DiagnosticHandler = CFUNCTYPE(None, c_void_p, c_void_p)
+
+_severities = {0: 'error', 1: 'warning', 2: 'remark', 3: 'note'}
+
+class DiagnosticCollector(object):
+    """Records the diagnostics a context reports while it is active.
+
+    Used as a context manager, it installs itself as the diagnostic handler
+    of the context and restores the previous handler on exit. Without a
+    handler LLVM prints errors and exits the process, so any call that may
+    report an error through the context (e.g. linking) must run inside one.
+    diagnostics is a list of (severity, message) pairs, with severity one
+    of 'error', 'warning', 'remark' and 'note'.
+    """
+    def __init__(self, context):
+        self.context = context
+        self.diagnostics = []
+        self._callback = _DiagnosticHandler(self._handle)
+        self._saved = None
+
+    def _handle(self, info, _):
+        severity = _severities.get(lib.LLVMGetDiagInfoSeverity(info),
+                                   'error')
+        message = util.take_message(lib.LLVMGetDiagInfoDescription(info))
+        self.diagnostics.append((severity, message))
+
+    @property
+    def errors(self):
+        return [m for severity, m in self.diagnostics if severity == 'error']
+
+    def __enter__(self):
+        self._saved = (lib.LLVMContextGetDiagnosticHandler(self.context),
+                       lib.LLVMContextGetDiagnosticContext(self.context))
+        lib.LLVMContextSetDiagnosticHandler(
+            self.context, cast(self._callback, c_void_p), None)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        handler, context = self._saved
+        lib.LLVMContextSetDiagnosticHandler(self.context, handler, context)
+
 
 def register_library(library):
     # Context declarations.
@@ -31,4 +83,20 @@ def register_library(library):
     library.LLVMGetGlobalContext.argtypes = []
     library.LLVMGetGlobalContext.restype = c_object_p
 
-register_library(lib)
+    library.LLVMContextGetDiagnosticHandler.argtypes = [Context]
+    library.LLVMContextGetDiagnosticHandler.restype = c_void_p
+
+    library.LLVMContextGetDiagnosticContext.argtypes = [Context]
+    library.LLVMContextGetDiagnosticContext.restype = c_void_p
+
+    library.LLVMContextSetDiagnosticHandler.argtypes = [Context, c_void_p,
+                                                        c_void_p]
+    library.LLVMContextSetDiagnosticHandler.restype = None
+
+    library.LLVMGetDiagInfoDescription.argtypes = [c_void_p]
+    library.LLVMGetDiagInfoDescription.restype = util.c_message_p
+
+    library.LLVMGetDiagInfoSeverity.argtypes = [c_void_p]
+    library.LLVMGetDiagInfoSeverity.restype = c_int
+
+register_library(lib.prototypes)
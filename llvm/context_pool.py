@@ -0,0 +1,286 @@
+#===- context_pool.py - Python LLVM Bindings -----------------*- python -*--===#
+#
+#                     The LLVM Compiler Infrastructure
+#
+# This file is distributed under the University of Illinois Open Source
+# License. See LICENSE.TXT for details.
+#
+#===------------------------------------------------------------------------===#
+
+"""Thread-affine and recycled LLVM contexts.
+
+An LLVMContext must not be used from two threads at once, and everything
+that defaults to the global context (Module.CreateWithName, Type.int32(),
+Builder.create(), ...) shares a single one. A ContextPool gives every
+thread its own Context instead, and ContextPool.map() builds independent
+modules on a thread pool, one context per worker:
+
+    with ContextPool(max_workers=4) as pool:
+        modules = pool.map(build, sources)
+
+where build(source, context) creates its module, types and builder in
+context. ctypes releases the GIL for the duration of each LLVM call, so the
+native part of the work runs concurrently.
+
+A context also never frees the types and constants uniqued in it, so a
+long-running service that keeps creating modules in one context grows
+without bound. A ContextRecycler creates modules in a current context and
+retires that context according to a RotationPolicy; a retired context is
+disposed once every module created in it has been released:
+
+    recycler = ContextRecycler(RotationPolicy(max_modules=100))
+    mod = recycler.create_module('job')
+    ...
+    recycler.release(mod)
+"""
+
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+from .context import Context
+from .module import Module
+from .type import Type
+
+__all__ = ['ContextPool', 'TypeCache', 'RotationPolicy', 'ContextRecycler']
+
+class TypeCache(object):
+    """Lazily created common types of one context.
+
+    Attribute access calls the Type factory of the same name with the
+    context and keeps the result, e.g. cache.int32 or cache.void.
+    """
+    def __init__(self, context):
+        self._context = context
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        ty = getattr(Type, name)(self._context)
+        setattr(self, name, ty)
+        return ty
+
+class ContextPool(object):
+    """Hands out one Context per thread.
+
+    The context of a thread, and its TypeCache, is created on the first call
+    to get() or types() from that thread and reused afterwards. All
+    contexts belong to the pool and are disposed, together with the modules
+    they own, by close().
+
+    map() and submit() run on a thread pool of max_workers threads that is
+    created on first use and kept until close(), so repeated calls reuse
+    the same workers and their contexts.
+    """
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._contexts = []
+        self._executor = None
+
+    def get(self):
+        """Return the calling thread's context."""
+        try:
+            return self._local.context
+        except AttributeError:
+            pass
+        context = Context()
+        with self._lock:
+            if self._contexts is None:
+                context.close()
+                raise ValueError('ContextPool is closed')
+            self._contexts.append(context)
+        self._local.context = context
+        self._local.types = TypeCache(context)
+        return context
+
+    def types(self):
+        """Return the TypeCache of the calling thread's context."""
+        try:
+            return self._local.types
+        except AttributeError:
+            self.get()
+            return self._local.types
+
+    def __len__(self):
+        return len(self._contexts or ())
+
+    def map(self, build, items):
+        """Call build(item, context) for every item on the thread pool.
+
+        Each worker thread uses its own context from this pool. The results
+        are returned in the order of items; the first exception raised by
+        build is re-raised here.
+        """
+        def run(item):
+            return build(item, self.get())
+
+        return list(self._get_executor().map(run, items))
+
+    def submit(self, fn, *args):
+        """Schedule fn(*args) on the thread pool and return its Future.
+
+        fn may call get() for the context of the worker it runs on.
+        """
+        return self._get_executor().submit(fn, *args)
+
+    def _get_executor(self):
+        with self._lock:
+            if self._contexts is None:
+                raise ValueError('ContextPool is closed')
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers)
+            return self._executor
+
+    def close(self):
+        """Stop the worker threads and dispose every context of this pool."""
+        with self._lock:
+            contexts, self._contexts = self._contexts, None
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+        for context in reversed(contexts or ()):
+            context.close()
+        self._local = threading.local()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def estimate_module_bytes(module, bytes_per_instruction=64):
+    """A rough estimate of the context memory a module added.
+
+    Counts the instructions in module and charges bytes_per_instruction for
+    each, on the basis that the constants and types an instruction uses are
+    what stays behind in the context.
+    """
+    count = 0
+    for function in module:
+        for block in function:
+            for _ in block:
+                count += 1
+    return count * bytes_per_instruction
+
+class RotationPolicy(object):
+    """When to retire a context.
+
+    A context is retired once max_modules modules have been created in it,
+    or once the estimated growth of the modules released from it reaches
+    max_bytes. Either limit may be None. estimate(module) gives the growth
+    of one module and defaults to estimate_module_bytes().
+    """
+    def __init__(self, max_modules=None, max_bytes=None, estimate=None):
+        self.max_modules = max_modules
+        self.max_bytes = max_bytes
+        self.estimate = estimate or estimate_module_bytes
+
+    def should_retire(self, modules, nbytes):
+        if self.max_modules is not None and modules >= self.max_modules:
+            return True
+        return self.max_bytes is not None and nbytes >= self.max_bytes
+
+class _Account(object):
+    """Usage of one context managed by a ContextRecycler."""
+    __slots__ = ('context', 'modules', 'nbytes')
+
+    def __init__(self, context):
+        self.context = context
+        self.modules = 0
+        self.nbytes = 0
+
+    def released(self):
+        """Whether every object the context owns has been closed."""
+        owned = getattr(self.context, '_owned_objects', None)
+        return not owned or not any(obj._as_parameter_ for obj in owned)
+
+class ContextRecycler(object):
+    """Creates modules in a context that is replaced according to a policy.
+
+    Modules are created with create_module() and handed back with
+    release(), which closes them. Other objects the context owns through
+    take_ownership() count as well: a retired context is disposed only
+    after all of them have been closed. retired is the number of contexts
+    retired so far and disposed the number already disposed.
+    """
+    def __init__(self, policy=None):
+        self.policy = policy or RotationPolicy()
+        self._current = None
+        self._retired = []
+        self._accounts = {}
+        self.retired = 0
+        self.disposed = 0
+
+    @property
+    def context(self):
+        """The context new modules are created in."""
+        if self._current is None:
+            account = self._current = _Account(Context())
+            self._accounts[account.context] = account
+        return self._current.context
+
+    def create_module(self, name):
+        """Create a module in the current context."""
+        context = self.context
+        account = self._current
+        module = Module.CreateWithName(name, context)
+        account.modules += 1
+        self._check(account)
+        return module
+
+    def release(self, module):
+        """Charge the module's estimated growth to its context and close it.
+
+        Retired contexts that no longer own live objects are disposed.
+        """
+        if module.is_null():
+            self.collect()
+            return
+        account = self._accounts.get(module.context)
+        if account is not None:
+            account.nbytes += self.policy.estimate(module)
+        module.close()
+        if account is not None:
+            self._check(account)
+        self.collect()
+
+    def collect(self):
+        """Dispose retired contexts whose objects have all been closed."""
+        keep = []
+        for account in self._retired:
+            if account.released():
+                self._dispose(account)
+            else:
+                keep.append(account)
+        self._retired = keep
+
+    def close(self):
+        """Dispose every context, including objects still alive in them."""
+        accounts = self._retired
+        if self._current is not None:
+            accounts.append(self._current)
+        self._current = None
+        self._retired = []
+        for account in accounts:
+            self._dispose(account)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _check(self, account):
+        if account is self._current and self.policy.should_retire(
+                account.modules, account.nbytes):
+            self._current = None
+            self._retired.append(account)
+            self.retired += 1
+
+    def _dispose(self, account):
+        del self._accounts[account.context]
+        account.context.close()
+        self.disposed += 1
@@ -26,6 +26,9 @@ from ctypes import c_double
 from ctypes import cast
 from ctypes import pointer
 
+import threading
+import warnings
+
 from . import util  # Only import modules
 from .memory_buffer import MemoryBuffer
 from .context import Context
@@ -56,12 +59,31 @@ __all__ = [
     "VerifierFailureActionTy",
     "IntPredicate",
     "Use",
+    "initialize_llvm",
     "shutdown_llvm",
 ]
 
 lib = get_library()
 Enums = []
 
+# Enumerations keep a list indexed by value next to the value map, so that
+# from_value() is a list index for the small, dense values most enumerations
+# use. Values from _DENSE_LIMIT up (e.g. the Attribute bit flags) only go in
+# the map.
+_DENSE_LIMIT = 256
+
+class _DeprecatedAlias(object):
+    """Old name of an enumeration; warns and returns the renamed one."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        warnings.warn('%s is deprecated, use %s.%s' % (
+            owner.__name__, owner.__name__, self.name),
+                      DeprecationWarning, stacklevel=2)
+        return getattr(owner, self.name)
+
 class LLVMEnumeration(object):
     """Represents an individual LLVM enumeration."""
 
@@ -76,7 +98,11 @@ class LLVMEnumeration(object):
     @classmethod
     def from_value(cls, value):
         """Obtain an enumeration instance from a numeric value."""
-        result = cls._value_map.get(value, None)
+        values = cls._values
+        if 0 <= value < len(values):
+            result = values[value]
+        else:
+            result = cls._value_map.get(value, None)
 
         if result is None:
             raise ValueError('Unknown %s: %d' % (cls.__name__,
@@ -96,28 +122,93 @@ class LLVMEnumeration(object):
                                                                   value))
         enum = cls(name, value)
         cls._value_map[value] = enum
+        if 0 <= value < _DENSE_LIMIT:
+            values = cls._values
+            if value >= len(values):
+                values.extend([None] * (value + 1 - len(values)))
+            values[value] = enum
         setattr(cls, name, enum)
 
 class Attribute(LLVMEnumeration):
     """Represents an individual Attribute enumeration."""
 
     _value_map = {}
+    _values = []
 
     def __init__(self, name, value):
         super(Attribute, self).__init__(name, value)
 
 class OpCode(LLVMEnumeration):
-    """Represents an individual OpCode enumeration."""
+    """Represents an individual OpCode enumeration.
+
+    Instructions can be classified from raw opcode values without creating
+    OpCode objects. Each category in enumerations.OpCodeCategories is
+    available as a frozenset of values (OpCode.terminators, binary_ops,
+    memory_ops, casts, calls, compares) and as a bit flag (OpCode.TERMINATOR,
+    BINARY_OP, MEMORY, CAST, CALL, COMPARE) in the table returned by
+    category_flags(), which is indexed by value:
+
+        flags = OpCode.category_flags()
+        if flags[inst.opcode_value] & OpCode.TERMINATOR:
+            ...
+    """
 
     _value_map = {}
+    _values = []
+    _flags = bytearray()
+
+    TERMINATOR = 1 << 0
+    BINARY_OP = 1 << 1
+    MEMORY = 1 << 2
+    CAST = 1 << 3
+    CALL = 1 << 4
+    COMPARE = 1 << 5
+
+    terminators = frozenset()
+    binary_ops = frozenset()
+    memory_ops = frozenset()
+    casts = frozenset()
+    calls = frozenset()
+    compares = frozenset()
+
+    # Misspelling of FCmp in earlier releases.
+    FCmpl = _DeprecatedAlias('FCmp')
 
     def __init__(self, name, value):
         super(OpCode, self).__init__(name, value)
 
+    @classmethod
+    def category_flags(cls):
+        """The category flags of every opcode, as a bytearray indexed by
+        value. Unknown opcodes have no flags set."""
+        return cls._flags
+
+    @classmethod
+    def register_categories(cls, categories):
+        """Build the category sets and flags from (category, names) pairs."""
+        attrs = {
+            'Terminator': ('terminators', cls.TERMINATOR),
+            'BinaryOp': ('binary_ops', cls.BINARY_OP),
+            'Memory': ('memory_ops', cls.MEMORY),
+            'Cast': ('casts', cls.CAST),
+            'Call': ('calls', cls.CALL),
+            'Compare': ('compares', cls.COMPARE),
+        }
+        # Leave room for opcodes newer than the table knows about.
+        flags = bytearray(_DENSE_LIMIT)
+        for category, names in categories:
+            attr, flag = attrs[category]
+            values = frozenset(getattr(cls, name).value for name in names)
+            for value in values:
+                flags[value] |= flag
+            setattr(cls, attr, values)
+        cls._flags = flags
+
 class TypeKind(LLVMEnumeration):
     """Represents an individual TypeKind enumeration."""
 
     _value_map = {}
+    _values = []
 
     def __init__(self, name, value):
         super(TypeKind, self).__init__(name, value)
@@ -126,6 +217,7 @@ class Linkage(LLVMEnumeration):
     """Represents an individual Linkage enumeration."""
 
     _value_map = {}
+    _values = []
 
     def __init__(self, name, value):
         super(Linkage, self).__init__(name, value)
@@ -134,6 +226,7 @@ class Visibility(LLVMEnumeration):
     """Represents an individual visibility enumeration."""
 
     _value_map = {}
+    _values = []
 
     def __init__(self, name, value):
         super(Visibility, self).__init__(name, value)
@@ -142,6 +235,7 @@ class CallConv(LLVMEnumeration):
     """Represents an individual calling convention enumeration."""
 
     _value_map = {}
+    _values = []
 
     def __init__(self, name, value):
         super(CallConv, self).__init__(name, value)
@@ -150,6 +244,7 @@ class IntPredicate(LLVMEnumeration):
     """Represents an individual IntPredicate enumeration."""
 
     _value_map = {}
+    _values = []
 
     def __init__(self, name, value):
         super(IntPredicate, self).__init__(name, value)
@@ -158,6 +253,7 @@ class RealPredicate(LLVMEnumeration):
     """Represents an individual RealPredicate enumeration."""
 
     _value_map = {}
+    _values = []
 
     def __init__(self, name, value):
         super(RealPredicate, self).__init__(name, value)
@@ -166,12 +262,14 @@ class LandingPadClauseTy(LLVMEnumeration):
     """Represents an individual LandingPadClauseTy enumeration."""
 
     _value_map = {}
+    _values = []
 
     def __init__(self, name, value):
         super(LandingPadClauseTy, self).__init__(name, value)
 
 class VerifierFailureActionTy(LLVMEnumeration):
     _value_map = {}
+    _values = []
 
     def __init__(self, name, value):
         super(VerifierFailureActionTy, self).__init__(name, value)
@@ -251,35 +349,74 @@ def register_enumerations():
     for enum_class, enum_spec in enums:
         for name, value in enum_spec:
             enum_class.register(name, value)
+    OpCode.register_categories(enumerations.OpCodeCategories)
     return enums
 
+# Guards the flags below; pass managers and engines may be requested from
+# several threads at once (see context_pool and bitcode_loader).
+_initialize_lock = threading.Lock()
+_passes_initialized = False
+_native_target_initialized = False
+
+def initialize_passes():
+    """Register the LLVM passes with the global pass registry.
+
+    This is idempotent and only needs to happen before passes are used, so it
+    is deferred until a pass manager or execution engine is requested.
+    """
+    global _passes_initialized
+    if _passes_initialized:
+        return
+    with _initialize_lock:
+        if _passes_initialized:
+            return
+        p = PassRegistry()
+        lib.LLVMInitializeCore(p)
+        lib.LLVMInitializeTransformUtils(p)
+        lib.LLVMInitializeScalarOpts(p)
+        lib.LLVMInitializeObjCARCOpts(p)
+        lib.LLVMInitializeVectorization(p)
+        lib.LLVMInitializeInstCombine(p)
+        lib.LLVMInitializeIPO(p)
+        lib.LLVMInitializeInstrumentation(p)
+        lib.LLVMInitializeAnalysis(p)
+        lib.LLVMInitializeIPA(p)
+        lib.LLVMInitializeCodeGen(p)
+        lib.LLVMInitializeTarget(p)
+        _passes_initialized = True
+
+def initialize_native_target():
+    """Initialize native code generation and link in MCJIT.
+
+    This is idempotent and is called the first time a JIT or target machine
+    is requested.
+    """
+    global _native_target_initialized
+    if _native_target_initialized:
+        return
+    with _initialize_lock:
+        if _native_target_initialized:
+            return
+        # Initialize native code generation for Intel Mac target.
+        lib.LLVMInitializeX86TargetInfo()
+        lib.LLVMInitializeX86Target()
+        lib.LLVMInitializeX86TargetMC()
+        lib.LLVMLinkInMCJIT()
+        lib.LLVMInitializeX86AsmPrinter()
+        _native_target_initialized = True
+
 def initialize_llvm():
-    Context.GetGlobalContext()
-    p = PassRegistry()
-    lib.LLVMInitializeCore(p)
-    lib.LLVMInitializeTransformUtils(p)
-    lib.LLVMInitializeScalarOpts(p)
-    lib.LLVMInitializeObjCARCOpts(p)
-    lib.LLVMInitializeVectorization(p)
-    lib.LLVMInitializeInstCombine(p)
-    lib.LLVMInitializeIPO(p)
-    lib.LLVMInitializeInstrumentation(p)
-    lib.LLVMInitializeAnalysis(p)
-    lib.LLVMInitializeIPA(p)
-    lib.LLVMInitializeCodeGen(p)
-    lib.LLVMInitializeTarget(p)
-
-    # Initialize native code generation for Intel Mac target.
-    lib.LLVMInitializeX86TargetInfo()
-    lib.LLVMInitializeX86Target()
-    lib.LLVMInitializeX86TargetMC()
-    lib.LLVMLinkInMCJIT()
-    lib.LLVMInitializeX86AsmPrinter()
-    
+    """Perform all one-time LLVM initialization.
+
+    Importing this module no longer does this eagerly; callers that only
+    build or parse IR never need it.
+    """
+    initialize_passes()
+    initialize_native_target()
+
 def shutdown_llvm():
     lib.LLVMShutdown()
 
-register_library(lib)
+register_library(lib.prototypes)
 Enums = register_enumerations()
-initialize_llvm()
 # print "Local package llvm is used!"
@@ -167,4 +167,4 @@ callbacks['symbol_lookup'] = CFUNCTYPE(c_char_p, c_void_p, c_uint64,
                                        POINTER(c_uint64), c_uint64,
                                        POINTER(c_char_p))
 
-register_library(lib)
+register_library(lib.prototypes)
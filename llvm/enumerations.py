@@ -21,6 +21,7 @@ defined in this file so they are easier to locate and maintain.
 __all__ = [
     'Attributes',
     'OpCodes',
+    'OpCodeCategories',
     'TypeKinds',
     'Linkages',
     'Visibility',
@@ -102,7 +103,7 @@ OpCodes = [
     ('IntToPtr', 40),
     ('BitCast', 41),
     ('ICmp', 42),
-    ('FCmpl', 43),
+    ('FCmp', 43),
     ('PHI', 44),
     ('Call', 45),
     ('Select', 46),
@@ -121,6 +122,23 @@ OpCodes = [
     ('LandingPad', 59),
 ]
 
+# Instruction classes, as (category, opcode names). An opcode may belong to
+# more than one category; Invoke is both a terminator and a call.
+OpCodeCategories = [
+    ('Terminator', ['Ret', 'Br', 'Switch', 'IndirectBr', 'Invoke',
+                    'Unreachable', 'Resume']),
+    ('BinaryOp', ['Add', 'FAdd', 'Sub', 'FSub', 'Mul', 'FMul', 'UDiv',
+                  'SDiv', 'FDiv', 'URem', 'SRem', 'FRem', 'Shl', 'LShr',
+                  'AShr', 'And', 'Or', 'Xor']),
+    ('Memory', ['Alloca', 'Load', 'Store', 'GetElementPtr', 'Fence',
+                'AtomicCmpXchg', 'AtomicRMW']),
+    ('Cast', ['Trunc', 'ZExt', 'SExt', 'FPToUI', 'FPToSI', 'UIToFP',
+              'SIToFP', 'FPTrunc', 'FPExt', 'PtrToInt', 'IntToPtr',
+              'BitCast']),
+    ('Call', ['Call', 'Invoke']),
+    ('Compare', ['ICmp', 'FCmp']),
+]
+
 TypeKinds = [
     ('Void', 0),
     ('Half', 1),
@@ -13,6 +13,8 @@ from .common import get_library
 from .core import Type
 from .core import Module
 from .core import Value
+from .core import initialize_llvm
+from . import util
 
 lib = get_library()
 
@@ -43,38 +45,60 @@ class ExecutionEngine(LLVMObject):
         LLVMObject.__init__(self, ptr, ownable=True,
                             disposer=lib.LLVMDisposeExecutionEngine)
     @staticmethod
+    def _for_module(ptr, module):
+        # The engine owns the module from now on and disposes it with itself,
+        # so the module must not be disposed separately. Disposing a context
+        # frees its modules too, so the engine takes the module's place among
+        # the objects of the owning Context, which closes the engine first.
+        ee = ExecutionEngine(ptr)
+        owner = module.get_owner()
+        if owner is not None:
+            owned = owner._owned_objects
+            owned[:] = [obj for obj in owned if obj is not module]
+            owner.take_ownership(ee)
+        ee.take_ownership(module, native=True)
+        return ee
+
+    @staticmethod
     def create_interpreter(module):
+        initialize_llvm()
         ee = c_object_p()
-        out = c_char_p(None)
+        out = util.c_message_p(None)
         result = lib.LLVMCreateInterpreterForModule(byref(ee), module, byref(out))
         if result:
-            raise Exception('Error in creating interpreter: %s' % out.value)
-        return ExecutionEngine(ee)
+            raise Exception('Error in creating interpreter: %s'
+                            % util.take_message(out))
+        return ExecutionEngine._for_module(ee, module)
 
     @staticmethod
     def create_execution_engine(module):
+        initialize_llvm()
         ee = c_object_p()
-        out = c_char_p()
+        out = util.c_message_p()
         result = lib.LLVMCreateExecutionEngineForModule(byref(ee), module, byref(out))
         if result:
-            raise Exception('Error in creating exeuction engine: %s' % out.value)
-        return ExecutionEngine(ee)
+            raise Exception('Error in creating exeuction engine: %s'
+                            % util.take_message(out))
+        return ExecutionEngine._for_module(ee, module)
 
     @staticmethod
     def create_jit(module):
+        initialize_llvm()
         ee = c_object_p()
-        out = c_char_p()
+        out = util.c_message_p()
         result = lib.LLVMCreateJITCompilerForModule(byref(ee), module, 0, byref(out))
         if result:
-            raise Exception('Error in creating exeuction engine: %s' % out.value)
-        return ExecutionEngine(ee)
+            raise Exception('Error in creating exeuction engine: %s'
+                            % util.take_message(out))
+        return ExecutionEngine._for_module(ee, module)
 
     def run_function(self, fn, args):
-        count = len(args)
-        arg_array = (c_object_p * count)()
-        for i in range(count):
-            arg_array[i] = args[i].from_param()
-        return GenericValue(lib.LLVMRunFunction(self, fn, count, arg_array))
+        count, arg_array = util.acquire_array(args)
+        try:
+            return GenericValue(
+                lib.LLVMRunFunction(self, fn, count, arg_array))
+        finally:
+            util.release_array(arg_array)
 
 def register_library(library):
     library.LLVMDisposeGenericValue.argtypes = [GenericValue]
@@ -94,15 +118,15 @@ def register_library(library):
 
     library.LLVMCreateExecutionEngineForModule.argtypes = [POINTER(c_object_p),
                                                            Module,
-                                                           POINTER(c_char_p)]
+                                                           POINTER(util.c_message_p)]
     library.LLVMCreateExecutionEngineForModule.restype = c_object_p
                                                            
     library.LLVMCreateInterpreterForModule.argtypes = [POINTER(c_object_p),
                                                        Module,
-                                                       POINTER(c_char_p)]
+                                                       POINTER(util.c_message_p)]
     library.LLVMCreateInterpreterForModule.restype = c_object_p
  
     library.LLVMRunFunction.argtypes = [ExecutionEngine, Value, c_uint, POINTER(c_object_p)]
     library.LLVMRunFunction.restype = c_object_p
         
-register_library(lib)
+register_library(lib.prototypes)
@@ -0,0 +1,302 @@
+#===- fingerprint.py - Python LLVM Bindings ------------------*- python -*--===#
+#
+#                     The LLVM Compiler Infrastructure
+#
+# This file is distributed under the University of Illinois Open Source
+# License. See LICENSE.TXT for details.
+#
+#===------------------------------------------------------------------------===#
+
+"""Structural fingerprints of functions and modules.
+
+A fingerprint is a hash of the IR that does not depend on the names of
+local values. It is computed in one pass over the instruction stream of a
+function, feeding for every instruction its opcode, result type, compare
+predicate and operand shape: arguments by position, instructions and
+blocks by the order in which they first appear, constants by their
+printed form and global values by their symbol name. Two functions that
+differ only in the names of their arguments, blocks and instructions, or
+in their own name, get the same fingerprint:
+
+    fp = Fingerprinter()
+    fp.function(f)              # hex digest of one function
+    fp.module(module)           # of the whole module
+    fp.invalidate(f)            # after editing f; the next module()
+                                # only rehashes f
+
+Instruction flags, alignments, attributes and metadata (including debug
+info) are not part of the fingerprint, so equal fingerprints mean the
+functions have the same shape, not that they are interchangeable.
+
+A Fingerprinter memoizes the digests of types and constants by native
+address, of global names by their text and of functions by native address,
+which makes repeated and bulk use cheap. Nothing else invalidates the
+memos: call invalidate(f) after changing f, or renaming a global it uses,
+and invalidate() after deleting functions or disposing modules, whose
+addresses may be reused. module() memoizes only function digests; the
+triple, data layout and global variables are read again on every call.
+
+Function.fingerprint(), Module.fingerprint() and the functions below use a
+new Fingerprinter for each call, so they always reflect the current IR.
+"""
+
+import hashlib
+
+from array import array
+from ctypes import addressof
+from ctypes import c_int
+
+from .common import get_library
+from .core import OpCode
+from .type import Type
+from .value import Value
+
+__all__ = [
+    'Fingerprinter',
+    'duplicate_functions',
+    'function_fingerprint',
+    'module_fingerprint',
+]
+
+lib = get_library()
+
+# LLVMValueKind
+_ARGUMENT = 0
+_BASIC_BLOCK = 1
+_GLOBALS = frozenset([5, 6, 7, 8])   # function, alias, ifunc, variable
+_METADATA = 22
+_INSTRUCTION = 24
+
+# Operand tags. Local operands are one token, (id << 3) | tag; the others
+# are the tag followed by a 64-bit hash.
+_TAG_ARGUMENT = 1
+_TAG_BLOCK = 2
+_TAG_INSTRUCTION = 3
+_TAG_SELF = 4
+_TAG_GLOBAL = 5
+_TAG_CONSTANT = 6
+_TAG_METADATA = 7
+
+_BLOCK_MARK = 0xb10c
+_DECLARATION_MARK = 0xdec1
+_MASK = (1 << 64) - 1
+
+def _hash64(data):
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(),
+                          'little')
+
+def _digest(tokens):
+    return hashlib.blake2b(array('Q', tokens).tobytes(),
+                           digest_size=16).hexdigest()
+
+
+class Fingerprinter(object):
+    """Computes fingerprints and memoizes them per native object."""
+    def __init__(self):
+        self._types = {}
+        self._constants = {}
+        self._names = {}
+        self._functions = {}
+
+    def _type(self, ptr):
+        key = addressof(ptr.contents)
+        token = self._types.get(key)
+        if token is None:
+            token = self._types[key] = _hash64(Type(ptr).name.encode())
+        return token
+
+    def _name(self, value):
+        name = lib.LLVMGetValueName(value)
+        token = self._names.get(name)
+        if token is None:
+            token = self._names[name] = _hash64(name)
+        return token
+
+    def _constant(self, value):
+        key = value._address()
+        token = self._constants.get(key)
+        if token is None:
+            token = self._constants[key] = _hash64(str(value).encode())
+        return token
+
+    def function(self, function):
+        """Return the fingerprint of function as a hex string."""
+        key = function._address()
+        digest = self._functions.get(key)
+        if digest is None:
+            digest = self._functions[key] = self._hash_function(function)
+        return digest
+
+    def _hash_function(self, function):
+        tokens = [self._type(lib.LLVMTypeOf(function))]
+        block = lib.LLVMGetFirstBasicBlock(function)
+        if not block:
+            tokens.append(_DECLARATION_MARK)
+            return _digest(tokens)
+
+        append = tokens.append
+        self_address = function._address()
+        params = {}
+        for i in range(lib.LLVMCountParams(function)):
+            params[addressof(lib.LLVMGetParam(function, i).contents)] = i
+        # Blocks and instructions are numbered in order of first
+        # appearance, as an operand or in the stream.
+        local = {}
+        icmp = OpCode.ICmp.value
+        fcmp = OpCode.FCmp.value
+        phi = OpCode.PHI.value
+        get_opcode = lib.LLVMGetInstructionOpcode
+        get_num_operands = lib.LLVMGetNumOperands
+        get_operand = lib.LLVMGetOperand
+        get_kind = lib.LLVMGetValueKind
+        type_of = lib.LLVMTypeOf
+        type_token = self._type
+
+        while block:
+            address = addressof(block.contents)
+            ident = local.get(address)
+            if ident is None:
+                ident = local[address] = len(local)
+            append(_BLOCK_MARK)
+            append(ident)
+
+            inst = lib.LLVMGetFirstInstruction(Value(block))
+            while inst:
+                address = addressof(inst.contents)
+                ident = local.get(address)
+                if ident is None:
+                    ident = local[address] = len(local)
+                inst = Value(inst)
+                opcode = get_opcode(inst)
+                count = get_num_operands(inst)
+                append(opcode)
+                append(ident)
+                append(type_token(type_of(inst)))
+                append(count)
+                if opcode == icmp:
+                    append(lib.LLVMGetICmpPredicate(inst))
+                elif opcode == fcmp:
+                    append(lib.LLVMGetFCmpPredicate(inst))
+                elif opcode == phi:
+                    # Incoming blocks are not operands in the C API.
+                    for i in range(lib.LLVMCountIncoming(inst)):
+                        address = addressof(
+                            lib.LLVMGetIncomingBlock(inst, i).contents)
+                        ident = local.get(address)
+                        if ident is None:
+                            ident = local[address] = len(local)
+                        append(ident << 3 | _TAG_BLOCK)
+
+                for i in range(count):
+                    op = get_operand(inst, i)
+                    if not op:
+                        append(0)
+                        continue
+                    address = addressof(op.contents)
+                    op = Value(op)
+                    kind = get_kind(op)
+                    if kind == _INSTRUCTION or kind == _BASIC_BLOCK:
+                        ident = local.get(address)
+                        if ident is None:
+                            ident = local[address] = len(local)
+                        append(ident << 3 | (_TAG_INSTRUCTION
+                                             if kind == _INSTRUCTION
+                                             else _TAG_BLOCK))
+                    elif kind == _ARGUMENT:
+                        append(params[address] << 3 | _TAG_ARGUMENT)
+                    elif kind in _GLOBALS:
+                        if address == self_address:
+                            append(_TAG_SELF)
+                        else:
+                            append(_TAG_GLOBAL)
+                            append(self._name(op))
+                    elif kind == _METADATA:
+                        append(_TAG_METADATA)
+                    else:
+                        append(_TAG_CONSTANT)
+                        append(self._constant(op))
+
+                inst = lib.LLVMGetNextInstruction(inst)
+            block = lib.LLVMGetNextBasicBlock(Value(block))
+        return _digest(tokens)
+
+    def invalidate(self, function=None):
+        """Forget the fingerprint of function, or of every function.
+
+        Without function the memoized constants are dropped as well, since
+        they may have been freed with the IR that used them.
+        """
+        if function is None:
+            self._functions.clear()
+            self._constants.clear()
+        else:
+            self._functions.pop(function._address(), None)
+
+    def functions(self, module):
+        """Return a dict mapping function names to fingerprints."""
+        return dict((f.name, self.function(f)) for f in module)
+
+    def module(self, module):
+        """Return the fingerprint of module as a hex string.
+
+        Covers the target triple and data layout, and the name, linkage,
+        type and initializer of every global variable and the name,
+        linkage and fingerprint of every function, in module order.
+        """
+        from .global_variables import GlobalIterator
+
+        tokens = [_hash64(module.target.encode()),
+                  _hash64(module.datalayout.encode())]
+        append = tokens.append
+        for g in GlobalIterator(module):
+            append(_TAG_GLOBAL)
+            append(self._name(g))
+            append(lib.LLVMGetLinkage(g))
+            append(self._type(lib.LLVMTypeOf(g)))
+            append(int(g.is_const()))
+            init = lib.LLVMGetInitializer(g)
+            append(_hash64(str(Value(init)).encode()) if init else 0)
+        for f in module:
+            append(_TAG_SELF)
+            append(self._name(f))
+            append(lib.LLVMGetLinkage(f))
+            digest = int(self.function(f), 16)
+            append(digest >> 64)
+            append(digest & _MASK)
+        return _digest(tokens)
+
+
+def function_fingerprint(function):
+    """Return the structural fingerprint of function as a hex string."""
+    return Fingerprinter().function(function)
+
+def module_fingerprint(module):
+    """Return the structural fingerprint of module as a hex string."""
+    return Fingerprinter().module(module)
+
+def duplicate_functions(module):
+    """Group the defined functions of module that have the same shape.
+
+    Returns a list of lists of function names, one for each fingerprint
+    shared by more than one function, in module order.
+    """
+    fp = Fingerprinter()
+    groups = {}
+    for f in module:
+        if not f.is_declaration:
+            groups.setdefault(fp.function(f), []).append(f.name)
+    return [names for names in groups.values() if len(names) > 1]
+
+
+def register_library(library):
+    library.LLVMGetICmpPredicate.argtypes = [Value]
+    library.LLVMGetICmpPredicate.restype = c_int
+
+    library.LLVMGetFCmpPredicate.argtypes = [Value]
+    library.LLVMGetFCmpPredicate.restype = c_int
+
+    library.LLVMGetLinkage.argtypes = [Value]
+    library.LLVMGetLinkage.restype = c_int
+
+
+register_library(lib.prototypes)
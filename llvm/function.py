@@ -5,6 +5,7 @@ from .common import get_library
 from .value import Value
 from .context import Context
 
+from ctypes import c_bool
 from ctypes import c_char_p
 from ctypes import c_uint
 
@@ -13,33 +14,34 @@ lib = get_library()
 
 class Function(Value):
     """LLVM Function"""
-    
+    __slots__ = ()
+
     def __init__(self, value):
         Value.__init__(self, value)
 
     @property
     def next(self):
         f = lib.LLVMGetNextFunction(self)
-        return f and Function(f)
+        return f and Function.from_ptr(f)
 
     @property
     def prev(self):
         f = lib.LLVMGetPreviousFunction(self)
-        return f and Function(f)
+        return f and Function.from_ptr(f)
 
     @property
     def first(self):
         from .basic_block import BasicBlock
         
         b = lib.LLVMGetFirstBasicBlock(self)
-        return b and BasicBlock(b)
+        return b and BasicBlock.from_ptr(b)
 
     @property
     def last(self):
         from .basic_block import BasicBlock
         
         b = lib.LLVMGetLastBasicBlock(self)
-        return b and BasicBlock(b)
+        return b and BasicBlock.from_ptr(b)
 
     class __bb_iterator(object):
         def __init__(self, function, reverse=False):
@@ -81,13 +83,46 @@ class Function(Value):
         from .basic_block import BasicBlock
         
         if context is None:
-            return BasicBlock(lib.LLVMAppendBasicBlock(self, name.encode()))
+            return BasicBlock.from_ptr(
+                lib.LLVMAppendBasicBlock(self, name.encode()))
         else:
-            return BasicBlock(
+            return BasicBlock.from_ptr(
                 lib.LLVMAppendBasicBlockInContext(context, self, name.encode()))
 
     def get_param(self, idx):
-        return Value(lib.LLVMGetParam(self, idx))
+        return Value.from_ptr(lib.LLVMGetParam(self, idx))
+
+    @property
+    def is_declaration(self):
+        """True if the function has no body, either here or still to be
+        read from a lazily loaded module."""
+        return lib.LLVMIsDeclaration(self)
+
+    @property
+    def is_materialized(self):
+        """False while the body of a lazily loaded function is unread."""
+        return self.is_declaration or lib.LLVMCountBasicBlocks(self) > 0
+
+    def snapshot(self):
+        """Return a .snapshot.ModuleSnapshot of this function alone."""
+        from .snapshot import snapshot
+        return snapshot(self)
+
+    def stats(self):
+        """Return size statistics of this function as a dict.
+
+        See .stats.function_stats.
+        """
+        from .stats import function_stats
+        return function_stats(self)
+
+    def fingerprint(self):
+        """Return a hash of this function's IR that ignores value names.
+
+        See .fingerprint.Fingerprinter for what it covers.
+        """
+        from .fingerprint import function_fingerprint
+        return function_fingerprint(self)
 
     def verify(self, action=None):
         return lib.LLVMVerifyFunction(self, action)
@@ -113,6 +148,12 @@ def register_library(library):
     library.LLVMCountBasicBlocks.argtypes = [Function]
     library.LLVMCountBasicBlocks.restype = c_uint
 
+    library.LLVMIsDeclaration.argtypes = [Value]
+    library.LLVMIsDeclaration.restype = c_bool
+
+    library.LLVMCountParams.argtypes = [Function]
+    library.LLVMCountParams.restype = c_uint
+
     library.LLVMGetParam.argtypes = [Function, c_uint]
     library.LLVMGetParam.restype = c_object_p
     
@@ -123,4 +164,4 @@ def register_library(library):
     library.LLVMGetLastBasicBlock.restype = c_object_p
 
       
-register_library(lib)
+register_library(lib.prototypes)
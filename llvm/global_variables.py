@@ -1,6 +1,7 @@
 """Python bindings for GlobalVariables."""
 from .common import LLVMObject
 from .common import c_object_p
+from .common import forget_interned
 """GlobalVariable bindings for LLVM."""
 from .common import get_library
 
@@ -17,18 +18,20 @@ lib = get_library()
 
 class Global(Value):
     """Wrapper of LLVM Global values"""
+    __slots__ = ()
+
     def __init__(self, obj):
         LLVMObject.__init__(self, obj)
 
     @staticmethod
     def add(module, ty, name):
         """Add a named global to the module"""
-        return Global(lib.LLVMAddGlobal(module, ty, name.encode()))
+        return Global.from_ptr(lib.LLVMAddGlobal(module, ty, name.encode()))
 
     @staticmethod
     def get(module, name):
         """Get the named global of the module"""
-        return Global(lib.LLVMGetNamedGlobal(module, name.encode()))
+        return Global.from_ptr(lib.LLVMGetNamedGlobal(module, name.encode()))
 
     @property
     def initializer(self):
@@ -53,16 +56,17 @@ class Global(Value):
     def prev(self):
         """Get previous global"""
         p = lib.LLVMGetPreviousGlobal(self)
-        return p and Global(p)
+        return p and Global.from_ptr(p)
 
     @property
     def next(self):
         """Get next global"""
         n = lib.LLVMGetNextGlobal(self)
-        return n and Global(n)
+        return n and Global.from_ptr(n)
 
     def delete(self):
         """Delete the global from the module"""
+        forget_interned(self)
         lib.LLVMDeleteGlobal(self)
 
     @staticmethod 
@@ -78,9 +82,10 @@ class GlobalIterator(object):
             raise ValueError("A Module object is required")
         self.reverse = reverse
         if not reverse:
-            self.current = Global(lib.LLVMGetFirstGlobal(module))
+            g = lib.LLVMGetFirstGlobal(module)
         else:
-            self.current = Global(lib.LLVMGetLastGlobal(module))
+            g = lib.LLVMGetLastGlobal(module)
+        self.current = g and Global.from_ptr(g)
 
     def __iter__(self):
         return self
@@ -139,4 +144,4 @@ def register_library(library):
                                      c_char_p]
     library.LLVMAddAlias.restype = c_object_p
         
-register_library(lib)
+register_library(lib.prototypes)
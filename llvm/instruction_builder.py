@@ -107,10 +107,13 @@ class Builder(LLVMObject):
         return PhiNode(lib.LLVMBuildPhi(self, ty, name.encode()))
 
     def call(self, fn, args, name):
-        count, args_array = util.to_c_array(args)
-        return Value(
-            lib.LLVMBuildCall(
-                self, fn, args_array, count, name.encode()))
+        count, args_array = util.acquire_array(args)
+        try:
+            return Value(
+                lib.LLVMBuildCall(
+                    self, fn, args_array, count, name.encode()))
+        finally:
+            util.release_array(args_array)
     
     def insert_value(self, arr, val, idx, name):
         return Value(lib.LLVMBuildInsertValue(
@@ -122,10 +125,12 @@ class Builder(LLVMObject):
 
     def gep(self, ptr, indices, name):
         """getelementptr instruction"""
-        count, idx_array = util.to_c_array(indices)
-        r = Value(lib.LLVMBuildGEP(
-            self, ptr, idx_array, count, name.encode())) 
-        return r
+        count, idx_array = util.acquire_array(indices)
+        try:
+            return Value(lib.LLVMBuildGEP(
+                self, ptr, idx_array, count, name.encode()))
+        finally:
+            util.release_array(idx_array)
     
     def position_at_end(self, bb):
         lib.LLVMPositionBuilderAtEnd(self, bb)
@@ -213,4 +218,4 @@ def register_library(library):
                                               c_char_p]
     library.LLVMBuildExtractValue.restype = c_object_p
     
-register_library(lib)
+register_library(lib.prototypes)
@@ -0,0 +1,54 @@
+from .common import c_object_p
+from .common import get_library
+
+from .memory_buffer import MemoryBuffer
+from .module import Module
+from .context import Context
+from . import util
+
+from ctypes import POINTER
+from ctypes import byref
+
+
+__all__ = ['parse_ir', 'parse_ir_string', 'parse_ir_file']
+lib = get_library()
+
+
+def parse_ir(mem_buffer, context=None):
+    """Parse textual IR (or bitcode) from a .core.MemoryBuffer.
+
+    The parser consumes mem_buffer, which is left null afterwards. Syntax
+    errors raise RuntimeError with LLVM's diagnostic, which gives the buffer
+    name, line and column.
+    """
+    module = c_object_p()
+    out = util.c_message_p(None)
+    if context is None:
+        context = Context.GetGlobalContext()
+    result = lib.LLVMParseIRInContext(context, mem_buffer, byref(module),
+                                      byref(out))
+    mem_buffer.detach()
+    if result:
+        raise RuntimeError('LLVM Error: %s' % util.take_message(out))
+
+    m = Module(module, context=context)
+    context.take_ownership(m)
+    return m
+
+def parse_ir_string(text, context=None, name='<string>'):
+    """Parse a module from IR text."""
+    return parse_ir(MemoryBuffer.from_bytes(text.encode(), name), context)
+
+def parse_ir_file(path, context=None):
+    """Parse a module from a .ll (or .bc) file."""
+    return parse_ir(MemoryBuffer.fromFile(path), context)
+
+def register_library(library):
+    library.LLVMParseIRInContext.argtypes = [Context,
+                                             MemoryBuffer,
+                                             POINTER(c_object_p),
+                                             POINTER(util.c_message_p)]
+    library.LLVMParseIRInContext.restype = bool
+
+
+register_library(lib.prototypes)
@@ -0,0 +1,72 @@
+#===- linker.py - Python LLVM Bindings -----------------------*- python -*--===#
+#
+#                     The LLVM Compiler Infrastructure
+#
+# This file is distributed under the University of Illinois Open Source
+# License. See LICENSE.TXT for details.
+#
+#===------------------------------------------------------------------------===#
+
+"""Link many modules into one.
+
+Linking modules one after another into a single destination makes every
+step walk the ever-growing symbol table of the destination, which is
+quadratic in the number of modules. link_all() links neighbours pairwise
+instead, level by level, so each module is linked O(log n) times.
+"""
+
+import time
+
+__all__ = ['link_all', 'LinkResult']
+
+class LinkResult(object):
+    """What link_all() did.
+
+    module is the linked module. conflicts lists (destination, source,
+    message) for every link that failed, by module identifier; the linker
+    has consumed the source of a failed link and the destination keeps
+    whatever it had linked so far. diagnostics are the non-fatal
+    (severity, message) pairs reported by successful links. links is the
+    number of links performed and seconds their total wall time.
+    """
+    def __init__(self, module):
+        self.module = module
+        self.conflicts = []
+        self.diagnostics = []
+        self.links = 0
+        self.seconds = 0.0
+
+    def __repr__(self):
+        return '<LinkResult %d links %.3fs %d conflicts>' % (
+            self.links, self.seconds, len(self.conflicts))
+
+def link_all(modules, preserve_sources=False):
+    """Link modules into one in a balanced tree.
+
+    The first module ends up holding the result. All other modules are
+    consumed unless preserve_sources is true, in which case clones of them
+    are linked and the first module is the only one modified.
+    """
+    level = list(modules)
+    if not level:
+        raise ValueError('No modules to link')
+    result = LinkResult(level[0])
+    start = time.perf_counter()
+    if preserve_sources:
+        level[1:] = [m.clone() for m in level[1:]]
+    while len(level) > 1:
+        merged = []
+        for i in range(0, len(level) - 1, 2):
+            dest, source = level[i], level[i + 1]
+            names = (dest.identifier, source.identifier)
+            try:
+                result.diagnostics.extend(dest.link_in(source))
+            except RuntimeError as e:
+                result.conflicts.append(names + (str(e),))
+            result.links += 1
+            merged.append(dest)
+        if len(level) % 2:
+            merged.append(level[-1])
+        level = merged
+    result.seconds = time.perf_counter() - start
+    return result
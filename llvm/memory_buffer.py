@@ -1,11 +1,15 @@
 from .common import LLVMObject
 from .common import c_object_p
 from .common import get_library
+from . import util
 
 from ctypes import POINTER
 from ctypes import byref
+from ctypes import c_char
 from ctypes import c_char_p
 from ctypes import c_size_t
+from ctypes import c_void_p
+from ctypes import string_at
 
 
 lib = get_library()
@@ -27,24 +31,49 @@ class MemoryBuffer(LLVMObject):
             raise Exception("filename argument must be defined")
 
         memory = c_object_p()
-        out = c_char_p(None)
+        out = util.c_message_p(None)
 
         result = lib.LLVMCreateMemoryBufferWithContentsOfFile(
             filename.encode(), byref(memory), byref(out))
 
         if result:
-            raise Exception("Could not create memory buffer: %s" % out.value)
+            raise Exception("Could not create memory buffer: %s"
+                            % util.take_message(out))
         return MemoryBuffer(memory)
 
     @classmethod
     def from_string(cls, s):
+        return cls.from_bytes(s.encode())
+
+    @classmethod
+    def from_bytes(cls, data, name='inputBuffer'):
+        """Create a new memory buffer holding a copy of data."""
+        data = bytes(data)
         memory = lib.LLVMCreateMemoryBufferWithMemoryRangeCopy(
-            s.encode(), len(s), b'inputBuffer')
+            data, len(data), name.encode())
         return MemoryBuffer(memory)
 
+    def to_bytes(self):
+        """Return a copy of the buffer contents."""
+        return string_at(lib.LLVMGetBufferStart(self), len(self))
+
+    __bytes__ = to_bytes
+
+    def memoryview(self):
+        """Return a read-only memoryview of the buffer contents.
+
+        No copy is made. The view keeps this wrapper alive, but it must not
+        be used once the buffer has been closed.
+        """
+        size = len(self)
+        if not size:
+            return memoryview(b'')
+        array = (c_char * size).from_address(lib.LLVMGetBufferStart(self))
+        array._owner = self
+        return memoryview(array).cast('B').toreadonly()
 
     def __str__(self):
-        return lib.LLVMGetBufferStart(self).decode()
+        return self.to_bytes().decode()
 
     def __len__(self):
         return lib.LLVMGetBufferSize(self)
@@ -52,13 +81,14 @@ class MemoryBuffer(LLVMObject):
 def register_library(library):
     # Memory buffer declarations
     library.LLVMCreateMemoryBufferWithContentsOfFile.argtypes = [c_char_p,
-            POINTER(c_object_p), POINTER(c_char_p)]
+            POINTER(c_object_p), POINTER(util.c_message_p)]
     library.LLVMCreateMemoryBufferWithContentsOfFile.restype = bool
 
     library.LLVMGetBufferSize.argtypes = [MemoryBuffer]
+    library.LLVMGetBufferSize.restype = c_size_t
 
     library.LLVMGetBufferStart.argtypes = [MemoryBuffer]
-    library.LLVMGetBufferStart.restype = c_char_p
+    library.LLVMGetBufferStart.restype = c_void_p
 
     library.LLVMCreateMemoryBufferWithMemoryRangeCopy.argtypes = [c_char_p,
                                                                   c_size_t,
@@ -67,4 +97,4 @@ def register_library(library):
 
     library.LLVMDisposeMemoryBuffer.argtypes = [MemoryBuffer]
 
-register_library(lib)
+register_library(lib.prototypes)
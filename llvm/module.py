@@ -4,9 +4,12 @@ from .common import get_library
 
 from .context import Context
 from .type import Type
+from . import util
     
 from ctypes import c_char_p
 from ctypes import POINTER
+from ctypes import byref
+from ctypes import c_size_t
 
 
 lib = get_library()
@@ -35,6 +38,16 @@ class Module(LLVMObject):
     def context(self):
         return Context(lib.LLVMGetModuleContext(self))
 
+    @property
+    def identifier(self):
+        size = c_size_t()
+        return lib.LLVMGetModuleIdentifier(self, byref(size)).decode()
+
+    @property
+    def source_filename(self):
+        size = c_size_t()
+        return lib.LLVMGetSourceFileName(self, byref(size)).decode()
+
     @property
     def datalayout(self):
         return lib.LLVMGetDataLayout(self).decode()
@@ -57,7 +70,7 @@ class Module(LLVMObject):
         lib.LLVMDumpModule(self)
 
     def __str__(self):
-        return lib.LLVMPrintModuleToString(self).decode()
+        return util.take_message(lib.LLVMPrintModuleToString(self))
 
     class __function_iterator(object):
         def __init__(self, module, reverse=False):
@@ -95,37 +108,145 @@ class Module(LLVMObject):
     @property
     def first(self):
         from .function import Function
-        return Function(lib.LLVMGetFirstFunction(self))
+        f = lib.LLVMGetFirstFunction(self)
+        return f and Function.from_ptr(f)
 
     @property
     def last(self):
         from .function import Function
-        return Function(lib.LLVMGetLastFunction(self))
+        f = lib.LLVMGetLastFunction(self)
+        return f and Function.from_ptr(f)
 
     def print_module_to_file(self, filename):
-        out = c_char_p(None)
+        out = util.c_message_p(None)
         # Result is inverted so 0 means everything was ok.
         result = lib.LLVMPrintModuleToFile(
             self, filename.encode(), byref(out))
         if result:
-            raise RuntimeError("LLVM Error: %s" % out.value)
+            raise RuntimeError("LLVM Error: %s" % util.take_message(out))
+
+    def clone(self, context=None):
+        """Return a copy of this module.
+
+        Without context, or with this module's own context, the module is
+        copied natively with LLVMCloneModule and the copy is owned like the
+        original, by the Context that owns this module, if any. For another
+        context the module is copied through an in-memory bitcode round
+        trip, and the copy is owned by that context if the wrapper given
+        owns it natively. A copy without an owner is disposed when it is
+        collected.
+        """
+        if context is not None and context != self.context:
+            from .bit_reader import _parse_bitcode
+            from .bit_writer import write_bitcode_to_memory_buffer
+
+            m = _parse_bitcode(write_bitcode_to_memory_buffer(self), context)
+            # Wrappers of the global context, or from Module.context, do not
+            # own the native context and may be collected at any time.
+            if getattr(context, '_disposal', None) is not None:
+                context.take_ownership(m)
+            return m
+
+        m = Module(lib.LLVMCloneModule(self))
+        owner = self.get_owner()
+        if isinstance(owner, Context):
+            owner.take_ownership(m)
+        return m
+
+    def link_in(self, other, preserve_source=False):
+        """Link the module other into this one with LLVM's linker.
+
+        The linker consumes the module it links in, so other is left null
+        afterwards, unless preserve_source is true, in which case a clone
+        of it is linked instead. A module from another context is always
+        cloned into this module's context first.
+
+        Raises RuntimeError with the linker's messages if the link fails,
+        e.g. because both modules define the same symbol. Returns the list
+        of (severity, message) diagnostics reported otherwise.
+        """
+        context = self.context
+        source = other
+        if preserve_source or other.context != context:
+            source = other.clone(context)
+            if not preserve_source:
+                other.close()
+
+        with context.capture_diagnostics() as collector:
+            failed = lib.LLVMLinkModules2(self, source)
+        source.detach()
+        if failed:
+            raise RuntimeError('LLVM Error: %s' % '; '.join(
+                collector.errors or ['could not link module']))
+        return collector.diagnostics
+
+    def fingerprint(self):
+        """Return a hash of this module's IR that ignores local names.
+
+        See .fingerprint.Fingerprinter for what it covers.
+        """
+        from .fingerprint import module_fingerprint
+        return module_fingerprint(self)
+
+    def stats(self):
+        """Return size statistics of this module as a dict.
+
+        See .stats.module_stats.
+        """
+        from .stats import module_stats
+        return module_stats(self)
+
+    def snapshot(self):
+        """Return a .snapshot.ModuleSnapshot of this module's IR."""
+        from .snapshot import snapshot
+        return snapshot(self)
+
+    def write_text(self, f):
+        """Write the module as textual IR to the text file object f.
+
+        Global variables and functions are printed one at a time and each
+        string is freed before the next, so the text of the whole module is
+        never held in memory. The C API has no printer for named struct
+        type definitions, attribute groups or metadata on their own, so
+        those are not written; use print_module_to_file() or str() when the
+        module has any.
+        """
+        from .global_variables import GlobalIterator
+
+        f.write("; ModuleID = '%s'\n" % self.identifier)
+        f.write('source_filename = "%s"\n' % self.source_filename)
+        if self.datalayout:
+            f.write('target datalayout = "%s"\n' % self.datalayout)
+        if self.target:
+            f.write('target triple = "%s"\n' % self.target)
+
+        first = True
+        for g in GlobalIterator(self):
+            if first:
+                f.write('\n')
+                first = False
+            f.write(str(g))
+            f.write('\n')
+        for function in self:
+            f.write('\n')
+            f.write(str(function))
 
     def add_function(self, name, fn_ty):
         from .function import Function
 
-        return Function(lib.LLVMAddFunction(
+        return Function.from_ptr(lib.LLVMAddFunction(
             self, name.encode(), fn_ty))
 
     def get_function(self, name):
         from .function import Function
 
-        return Function(lib.LLVMGetNamedFunction(
+        return Function.from_ptr(lib.LLVMGetNamedFunction(
             self, name.encode()))
 
     def get_type(self, name):
         from .type import Type
         
-        return Type(lib.LLVMGetTypeByName(
+        return Type.from_ptr(lib.LLVMGetTypeByName(
             self, name.encode()))
 
     
@@ -160,11 +281,23 @@ def register_library(library):
     library.LLVMDumpModule.argtypes = [Module]
     library.LLVMDumpModule.restype = None
 
+    library.LLVMGetModuleIdentifier.argtypes = [Module, POINTER(c_size_t)]
+    library.LLVMGetModuleIdentifier.restype = c_char_p
+
+    library.LLVMGetSourceFileName.argtypes = [Module, POINTER(c_size_t)]
+    library.LLVMGetSourceFileName.restype = c_char_p
+
+    library.LLVMLinkModules2.argtypes = [Module, Module]
+    library.LLVMLinkModules2.restype = bool
+
+    library.LLVMCloneModule.argtypes = [Module]
+    library.LLVMCloneModule.restype = c_object_p
+
     library.LLVMPrintModuleToString.argtypes = [Module]
-    library.LLVMPrintModuleToString.restype = c_char_p
+    library.LLVMPrintModuleToString.restype = util.c_message_p
     
     library.LLVMPrintModuleToFile.argtypes = [Module, c_char_p,
-                                              POINTER(c_char_p)]
+                                              POINTER(util.c_message_p)]
     library.LLVMPrintModuleToFile.restype = bool
 
     library.LLVMGetTypeByName.argtypes = [Module, c_char_p]
@@ -183,4 +316,4 @@ def register_library(library):
     library.LLVMGetLastFunction.restype = c_object_p
 
 
-register_library(lib)
+register_library(lib.prototypes)
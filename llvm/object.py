@@ -118,7 +118,8 @@ class ObjectFile(LLVMObject):
 
         ptr = lib.LLVMCreateObjectFile(contents)
         LLVMObject.__init__(self, ptr, disposer=lib.LLVMDisposeObjectFile)
-        self.take_ownership(contents)
+        # LLVMCreateObjectFile takes ownership of the buffer.
+        self.take_ownership(contents, native=True)
 
     def get_sections(self, cache=False):
         """Obtain the sections in this object file.
@@ -517,4 +518,4 @@ def register_library(library):
     library.LLVMGetRelocationValueString.restype = c_char_p
 
 lib = get_library()
-register_library(lib)
+register_library(lib.prototypes)
@@ -0,0 +1,106 @@
+from .common import LLVMObject
+from .common import c_object_p
+from .common import get_library
+
+from .core import initialize_passes
+from .function import Function
+from .module import Module
+
+from ctypes import c_bool
+from ctypes import c_char_p
+from ctypes import c_void_p
+from ctypes import string_at
+
+
+__all__ = ['FunctionPassManager', 'run_passes']
+lib = get_library()
+
+
+class FunctionPassManager(LLVMObject):
+    """A legacy function pass manager for the functions of one module.
+
+    Running it also materializes the function first when it comes from a
+    lazily loaded module.
+    """
+    def __init__(self, ptr):
+        LLVMObject.__init__(self, ptr, disposer=lib.LLVMDisposePassManager)
+
+    @classmethod
+    def for_module(cls, module):
+        initialize_passes()
+        return FunctionPassManager(
+            lib.LLVMCreateFunctionPassManagerForModule(module))
+
+    def initialize(self):
+        return lib.LLVMInitializeFunctionPassManager(self)
+
+    def run(self, function):
+        """Run the passes on function. Returns True if it was modified."""
+        return lib.LLVMRunFunctionPassManager(self, function)
+
+    def finalize(self):
+        return lib.LLVMFinalizeFunctionPassManager(self)
+
+
+def run_passes(module, passes, target_machine=None):
+    """Run a new pass manager pipeline over module.
+
+    passes is a pipeline description as accepted by opt -passes, e.g.
+    'default<O2>' or 'instcombine,simplifycfg'. A .target.TargetMachine
+    lets target specific analyses take part.
+    """
+    initialize_passes()
+    if target_machine is not None:
+        target_machine = target_machine._as_parameter_
+    options = lib.LLVMCreatePassBuilderOptions()
+    try:
+        error = lib.LLVMRunPasses(module, passes.encode(), target_machine,
+                                  options)
+    finally:
+        lib.LLVMDisposePassBuilderOptions(options)
+    if error:
+        # Error messages are freed with their own disposer, not
+        # LLVMDisposeMessage.
+        message = lib.LLVMGetErrorMessage(error)
+        try:
+            text = string_at(message).decode()
+        finally:
+            lib.LLVMDisposeErrorMessage(message)
+        raise RuntimeError('LLVM Error: %s' % text)
+
+
+def register_library(library):
+    library.LLVMCreateFunctionPassManagerForModule.argtypes = [Module]
+    library.LLVMCreateFunctionPassManagerForModule.restype = c_object_p
+
+    library.LLVMInitializeFunctionPassManager.argtypes = [FunctionPassManager]
+    library.LLVMInitializeFunctionPassManager.restype = c_bool
+
+    library.LLVMRunFunctionPassManager.argtypes = [FunctionPassManager,
+                                                   Function]
+    library.LLVMRunFunctionPassManager.restype = c_bool
+
+    library.LLVMFinalizeFunctionPassManager.argtypes = [FunctionPassManager]
+    library.LLVMFinalizeFunctionPassManager.restype = c_bool
+
+    library.LLVMDisposePassManager.argtypes = [LLVMObject]
+    library.LLVMDisposePassManager.restype = None
+
+    library.LLVMCreatePassBuilderOptions.argtypes = []
+    library.LLVMCreatePassBuilderOptions.restype = c_object_p
+
+    library.LLVMDisposePassBuilderOptions.argtypes = [c_object_p]
+    library.LLVMDisposePassBuilderOptions.restype = None
+
+    library.LLVMRunPasses.argtypes = [Module, c_char_p, c_object_p,
+                                      c_object_p]
+    library.LLVMRunPasses.restype = c_object_p
+
+    library.LLVMGetErrorMessage.argtypes = [c_object_p]
+    library.LLVMGetErrorMessage.restype = c_void_p
+
+    library.LLVMDisposeErrorMessage.argtypes = [c_void_p]
+    library.LLVMDisposeErrorMessage.restype = None
+
+
+register_library(lib.prototypes)
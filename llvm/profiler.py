@@ -0,0 +1,133 @@
+#===- profiler.py - Python LLVM Bindings ---------------------*- python -*--===#
+#
+#                     The LLVM Compiler Infrastructure
+#
+# This file is distributed under the University of Illinois Open Source
+# License. See LICENSE.TXT for details.
+#
+#===------------------------------------------------------------------------===#
+
+"""Per-symbol call counts and latencies for the LLVM C API.
+
+A CallProfiler is attached to the library handle with
+get_library().enable_profiling(). From then on every lib.LLVM* function is
+bound through a timing wrapper that records, per symbol, the number of
+calls, the cumulative and maximum latency, and which Python function made
+the call:
+
+    lib = get_library()
+    profiler = lib.enable_profiling()
+    ...
+    lib.disable_profiling()
+    profiler.dump_json('calls.json')
+    profiler.dump_stats('calls.prof')   # pstats.Stats('calls.prof')
+
+When profiling is disabled the library hands out the plain bound functions
+again, so there is no cost at all.
+"""
+
+import json
+import marshal
+import sys
+import time
+
+__all__ = ['CallProfiler']
+
+class CallProfiler(object):
+    """Collects call statistics for wrapped library functions.
+
+    Records are kept per symbol as [calls, total, max, callers], where
+    callers maps the calling code location, a (filename, lineno, name)
+    tuple as used by pstats, to [calls, total]. Times are in seconds.
+    """
+    def __init__(self):
+        self._records = {}
+
+    def wrap(self, name, fn):
+        """Return a callable that times and counts calls to fn."""
+        record = self._records.get(name)
+        if record is None:
+            record = self._records[name] = [0, 0.0, 0.0, {}]
+        callers = record[3]
+        clock = time.perf_counter
+        getframe = sys._getframe
+
+        def call(*args):
+            start = clock()
+            try:
+                return fn(*args)
+            finally:
+                elapsed = clock() - start
+                record[0] += 1
+                record[1] += elapsed
+                if elapsed > record[2]:
+                    record[2] = elapsed
+                code = getframe(1).f_code
+                key = (code.co_filename, code.co_firstlineno,
+                       getattr(code, 'co_qualname', code.co_name))
+                caller = callers.get(key)
+                if caller is None:
+                    callers[key] = [1, elapsed]
+                else:
+                    caller[0] += 1
+                    caller[1] += elapsed
+
+        call.__name__ = name
+        call.__wrapped__ = fn
+        return call
+
+    def reset(self):
+        """Zero all counters, keeping wrappers that are already bound."""
+        for record in self._records.values():
+            record[0] = 0
+            record[1] = record[2] = 0.0
+            record[3].clear()
+
+    def to_dict(self):
+        """Return the statistics of symbols that were called, by name.
+
+        Each entry has 'calls', 'total' and 'max' (seconds) and 'callers',
+        which maps 'filename:lineno(function)' to 'calls' and 'total'.
+        """
+        result = {}
+        for name, (calls, total, peak, callers) in self._records.items():
+            if not calls:
+                continue
+            result[name] = {
+                'calls': calls,
+                'total': total,
+                'max': peak,
+                'callers': dict(('%s:%d(%s)' % key,
+                                 {'calls': n, 'total': t})
+                                for key, (n, t) in callers.items()),
+            }
+        return result
+
+    def dump_json(self, path):
+        """Write to_dict() as JSON to a path or a writable text file."""
+        if hasattr(path, 'write'):
+            json.dump(self.to_dict(), path, indent=1, sort_keys=True)
+        else:
+            with open(path, 'w') as f:
+                json.dump(self.to_dict(), f, indent=1, sort_keys=True)
+
+    def stats(self):
+        """Return the statistics in the format pstats.Stats loads.
+
+        Each C symbol is reported as a built-in function ('~', 0, name) whose
+        callers are the Python functions that invoked it. As C calls have no
+        children, the inline and cumulative times are the same.
+        """
+        stats = {}
+        for name, (calls, total, peak, callers) in self._records.items():
+            if not calls:
+                continue
+            stats[('~', 0, name)] = (
+                calls, calls, total, total,
+                dict((key, (n, n, t, t)) for key, (n, t) in callers.items()))
+        return stats
+
+    def dump_stats(self, path):
+        """Write a profile file that can be read with pstats.Stats(path)."""
+        with open(path, 'wb') as f:
+            marshal.dump(self.stats(), f)
@@ -0,0 +1,315 @@
+#===- snapshot.py - Python LLVM Bindings ---------------------*- python -*--===#
+#
+#                     The LLVM Compiler Infrastructure
+#
+# This file is distributed under the University of Illinois Open Source
+# License. See LICENSE.TXT for details.
+#
+#===------------------------------------------------------------------------===#
+
+"""Columnar snapshots of the IR of a module.
+
+Walking a module through Module, Function, BasicBlock and Value wrappers
+costs several C API calls and wrapper allocations per instruction every
+time an analysis looks at it. snapshot() walks the module once and copies
+its structure into flat arrays, which later passes can scan without
+touching LLVM at all:
+
+    snap = module.snapshot()
+    calls = sum(1 for op in snap.opcodes if op == OpCode.Call.value)
+
+Every value the walk meets (functions, arguments, blocks, instructions,
+constants, global variables, ...) gets a value id, in order of first
+appearance. Per value there is its LLVMValueKind, type id and name id.
+Functions and blocks are ranges, in CSR form: the blocks of function f are
+block_offsets[f]:block_offsets[f + 1], and the instructions of block b are
+inst_offsets[b]:inst_offsets[b + 1]. Per instruction there is its opcode,
+type id and value id, and its operands, as value ids, are
+operands[operand_offsets[i]:operand_offsets[i + 1]]. Types are interned as
+their printed form in types, names in names; name id 0 is the empty name.
+
+The arrays are array.array objects, so they expose the buffer protocol;
+to_numpy() wraps them as NumPy arrays without copying, if NumPy is
+installed. use_def() and def_use() derive the operand and user relations
+of every value id from them, again as CSR arrays. A snapshot does not refer
+back to the module and stays valid after it is changed or disposed.
+"""
+
+from array import array
+from ctypes import addressof
+from itertools import accumulate
+
+from .common import get_library
+from .function import Function
+from .type import Type
+from .value import Value
+
+__all__ = ['ModuleSnapshot', 'snapshot']
+
+lib = get_library()
+
+# LLVMValueKind values used while walking.
+_ARGUMENT = 0
+_BASIC_BLOCK = 1
+_FUNCTION = 5
+_INSTRUCTION = 24
+
+# value_kinds entry of the id shared by null operands.
+NULL_KIND = 255
+
+# Kinds whose values can have a name worth reading.
+_NAMED_KINDS = frozenset([0, 1, 5, 6, 7, 8, 24])
+
+
+class ModuleSnapshot(object):
+    """The arrays produced by snapshot(); see the module documentation."""
+
+    # Per function.
+    function_values = None      # array('I'), value id of the function
+    block_offsets = None        # array('I'), num_functions + 1 entries
+
+    # Per block.
+    block_values = None         # array('I')
+    inst_offsets = None         # array('I'), num_blocks + 1 entries
+
+    # Per instruction.
+    opcodes = None              # array('H')
+    inst_types = None           # array('I')
+    inst_values = None          # array('I')
+    operand_offsets = None      # array('I'), num_instructions + 1 entries
+    operands = None             # array('I'), value ids
+
+    # Per value.
+    value_kinds = None          # array('B'), LLVMValueKind
+    value_types = None          # array('I')
+    value_names = None          # array('I')
+
+    # Interned strings.
+    types = None                # list of str
+    names = None                # list of str
+
+    @property
+    def num_functions(self):
+        return len(self.function_values)
+
+    @property
+    def num_blocks(self):
+        return len(self.block_values)
+
+    @property
+    def num_instructions(self):
+        return len(self.opcodes)
+
+    @property
+    def num_values(self):
+        return len(self.value_kinds)
+
+    def function_blocks(self, f):
+        """Return the range of block indices of function index f."""
+        return range(self.block_offsets[f], self.block_offsets[f + 1])
+
+    def function_instructions(self, f):
+        """Return the range of instruction indices of function index f."""
+        offsets = self.inst_offsets
+        return range(offsets[self.block_offsets[f]],
+                     offsets[self.block_offsets[f + 1]])
+
+    def block_instructions(self, b):
+        """Return the range of instruction indices of block index b."""
+        return range(self.inst_offsets[b], self.inst_offsets[b + 1])
+
+    def instruction_operands(self, i):
+        """Return the value ids of the operands of instruction index i."""
+        return self.operands[self.operand_offsets[i]:
+                             self.operand_offsets[i + 1]]
+
+    def value_name(self, v):
+        """Return the name of value id v, '' if it has none."""
+        return self.names[self.value_names[v]]
+
+    def value_type(self, v):
+        """Return the printed type of value id v."""
+        return self.types[self.value_types[v]]
+
+    def function_index(self, name):
+        """Return the index of the function called name."""
+        for f, v in enumerate(self.function_values):
+            if self.names[self.value_names[v]] == name:
+                return f
+        raise KeyError(name)
+
+    def use_def(self):
+        """Return the use-def relation as CSR arrays (offsets, defs).
+
+        The operands of value id v are defs[offsets[v]:offsets[v + 1]], in
+        operand order. Only instructions have operands here.
+        """
+        inst_values = self.inst_values
+        operand_offsets = self.operand_offsets
+        operands = self.operands
+        sizes = array('I', [0]) * (self.num_values + 1)
+        for i, v in enumerate(inst_values):
+            sizes[v + 1] = operand_offsets[i + 1] - operand_offsets[i]
+        offsets = array('I', accumulate(sizes))
+        defs = array('I', [0]) * len(operands)
+        for i, v in enumerate(inst_values):
+            start, end = operand_offsets[i], operand_offsets[i + 1]
+            defs[offsets[v]:offsets[v] + end - start] = operands[start:end]
+        return offsets, defs
+
+    def def_use(self):
+        """Return the def-use relation as CSR arrays (offsets, users).
+
+        The instructions using value id v are users[offsets[v]:offsets[v +
+        1]], as value ids, once per use and in instruction order. Only uses
+        by instructions in the snapshot are seen, so e.g. a function
+        snapshot does not know the callers of a global.
+        """
+        inst_values = self.inst_values
+        operand_offsets = self.operand_offsets
+        operands = self.operands
+        counts = array('I', [0]) * (self.num_values + 1)
+        for v in operands:
+            counts[v + 1] += 1
+        offsets = array('I', accumulate(counts))
+        fill = offsets[:-1]
+        users = array('I', [0]) * len(operands)
+        for i, user in enumerate(inst_values):
+            for v in operands[operand_offsets[i]:operand_offsets[i + 1]]:
+                users[fill[v]] = user
+                fill[v] += 1
+        return offsets, users
+
+    def to_numpy(self):
+        """Return a dict of the arrays as NumPy arrays sharing memory.
+
+        Raises ImportError if NumPy is not installed.
+        """
+        import numpy
+
+        result = {}
+        for name, value in vars(self).items():
+            if isinstance(value, array):
+                result[name] = numpy.frombuffer(value, dtype=value.typecode)
+        return result
+
+
+def snapshot(ir):
+    """Walk a module, or a single .core.Function, once and snapshot it."""
+    snap = ModuleSnapshot()
+    function_values = snap.function_values = array('I')
+    block_offsets = snap.block_offsets = array('I')
+    block_values = snap.block_values = array('I')
+    inst_offsets = snap.inst_offsets = array('I')
+    opcodes = snap.opcodes = array('H')
+    inst_types = snap.inst_types = array('I')
+    inst_values = snap.inst_values = array('I')
+    operand_offsets = snap.operand_offsets = array('I')
+    operands = snap.operands = array('I')
+    value_kinds = snap.value_kinds = array('B')
+    value_types = snap.value_types = array('I')
+    value_names = snap.value_names = array('I')
+    types = snap.types = []
+    names = snap.names = ['']
+
+    type_ids = {}
+    name_ids = {'': 0}
+    value_ids = {}
+
+    get_kind = lib.LLVMGetValueKind
+    get_name = lib.LLVMGetValueName
+    type_of = lib.LLVMTypeOf
+    get_opcode = lib.LLVMGetInstructionOpcode
+    get_num_operands = lib.LLVMGetNumOperands
+    get_operand = lib.LLVMGetOperand
+    first_inst = lib.LLVMGetFirstInstruction
+    next_inst = lib.LLVMGetNextInstruction
+
+    def type_id(ptr):
+        key = addressof(ptr.contents)
+        ident = type_ids.get(key)
+        if ident is None:
+            ident = type_ids[key] = len(types)
+            types.append(Type(ptr).name)
+        return ident
+
+    def null_value():
+        # Unset operands, e.g. of a half-built instruction, share one id of
+        # kind NULL_KIND whose type is interned as ''.
+        ident = value_ids[0] = len(value_kinds)
+        value_kinds.append(NULL_KIND)
+        type_ident = type_ids.get(0)
+        if type_ident is None:
+            type_ident = type_ids[0] = len(types)
+            types.append('')
+        value_types.append(type_ident)
+        value_names.append(0)
+        return ident
+
+    def add_value(address, value, kind):
+        ident = value_ids[address] = len(value_kinds)
+        value_kinds.append(kind)
+        value_types.append(type_id(type_of(value)))
+        name = ''
+        if kind in _NAMED_KINDS:
+            name = get_name(value).decode()
+        name_id = name_ids.get(name)
+        if name_id is None:
+            name_id = name_ids[name] = len(names)
+            names.append(name)
+        value_names.append(name_id)
+        return ident
+
+    functions = [ir] if isinstance(ir, Function) else ir
+    for function in functions:
+        address = function._address()
+        ident = value_ids.get(address)
+        if ident is None:
+            ident = add_value(address, function, _FUNCTION)
+        function_values.append(ident)
+        block_offsets.append(len(block_values))
+        for i in range(lib.LLVMCountParams(function)):
+            param = lib.LLVMGetParam(function, i)
+            address = addressof(param.contents)
+            if address not in value_ids:
+                add_value(address, Value(param), _ARGUMENT)
+
+        block = lib.LLVMGetFirstBasicBlock(function)
+        while block:
+            address = addressof(block.contents)
+            block = Value(block)
+            ident = value_ids.get(address)
+            if ident is None:
+                ident = add_value(address, block, _BASIC_BLOCK)
+            block_values.append(ident)
+            inst_offsets.append(len(opcodes))
+
+            inst = first_inst(block)
+            while inst:
+                address = addressof(inst.contents)
+                inst = Value(inst)
+                ident = value_ids.get(address)
+                if ident is None:
+                    ident = add_value(address, inst, _INSTRUCTION)
+                inst_values.append(ident)
+                opcodes.append(get_opcode(inst))
+                inst_types.append(value_types[ident])
+                operand_offsets.append(len(operands))
+                for i in range(get_num_operands(inst)):
+                    op = get_operand(inst, i)
+                    address = addressof(op.contents) if op else 0
+                    ident = value_ids.get(address)
+                    if ident is None:
+                        if op:
+                            op = Value(op)
+                            ident = add_value(address, op, get_kind(op))
+                        else:
+                            ident = null_value()
+                    operands.append(ident)
+                inst = next_inst(inst)
+            block = lib.LLVMGetNextBasicBlock(block)
+
+    block_offsets.append(len(block_values))
+    inst_offsets.append(len(opcodes))
+    operand_offsets.append(len(operands))
+    return snap
@@ -0,0 +1,239 @@
+#===- stats.py - Python LLVM Bindings ------------------------*- python -*--===#
+#
+#                     The LLVM Compiler Infrastructure
+#
+# This file is distributed under the University of Illinois Open Source
+# License. See LICENSE.TXT for details.
+#
+#===------------------------------------------------------------------------===#
+
+"""Size statistics of modules and functions.
+
+function_stats() and module_stats() (also Function.stats() and
+Module.stats()) walk the IR once, reading only the opcode of each
+instruction, and return plain dicts:
+
+    {'blocks': 4, 'instructions': 7, 'call_sites': 0,
+     'opcodes': {'Br': 3, 'ICmp': 1, ...}}
+
+for a function, and for a module the same totals over its defined
+functions plus the number of 'functions', 'declarations' and 'globals',
+'constant_data_bytes' (the ABI size of all global initializers, in the
+module's data layout) and 'per_function', mapping each defined function to
+its own 'blocks', 'instructions' and 'call_sites'. Unnamed functions appear
+there as '<unnamed N>', N being their index in the module.
+
+Run as a script, it reports the statistics of every .bc file in a
+directory, parsing them in parallel worker processes:
+
+    python -m llvm.stats DIRECTORY [--jobs N] [--json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+from ctypes import c_ulonglong
+
+from .common import c_object_p
+from .common import get_library
+from .core import OpCode
+from .module import Module
+from .type import Type
+from .value import Value
+
+__all__ = ['function_stats', 'module_stats', 'directory_stats']
+
+lib = get_library()
+
+
+def _opcode_name(value):
+    try:
+        return OpCode.from_value(value).name
+    except ValueError:
+        return 'Opcode%d' % value
+
+def _walk(function, counts):
+    """Add the opcodes of function to counts; return its block count."""
+    first_inst = lib.LLVMGetFirstInstruction
+    next_inst = lib.LLVMGetNextInstruction
+    get_opcode = lib.LLVMGetInstructionOpcode
+    next_block = lib.LLVMGetNextBasicBlock
+
+    blocks = 0
+    block = lib.LLVMGetFirstBasicBlock(function)
+    while block:
+        blocks += 1
+        block = Value(block)
+        inst = first_inst(block)
+        while inst:
+            inst = Value(inst)
+            counts[get_opcode(inst)] += 1
+            inst = next_inst(inst)
+        block = next_block(block)
+    return blocks
+
+def _summarize(counts, blocks):
+    calls = OpCode.calls
+    return {
+        'blocks': blocks,
+        'instructions': sum(counts),
+        'call_sites': sum(counts[op] for op in calls),
+        'opcodes': dict((_opcode_name(op), n)
+                        for op, n in enumerate(counts) if n),
+    }
+
+def function_stats(function):
+    """Return the statistics of function as a dict."""
+    counts = [0] * 256
+    blocks = _walk(function, counts)
+    return _summarize(counts, blocks)
+
+def module_stats(module):
+    """Return the statistics of module as a dict."""
+    from .global_variables import GlobalIterator
+
+    totals = [0] * 256
+    blocks = 0
+    per_function = {}
+    declarations = 0
+    calls = OpCode.calls
+    for i, f in enumerate(module):
+        if f.is_declaration:
+            declarations += 1
+            continue
+        counts = [0] * 256
+        n = _walk(f, counts)
+        per_function[f.name or '<unnamed %d>' % i] = {
+            'blocks': n,
+            'instructions': sum(counts),
+            'call_sites': sum(counts[op] for op in calls),
+        }
+        blocks += n
+        for op, count in enumerate(counts):
+            if count:
+                totals[op] += count
+
+    layout = lib.LLVMGetModuleDataLayout(module)
+    num_globals = 0
+    data_bytes = 0
+    for g in GlobalIterator(module):
+        num_globals += 1
+        init = lib.LLVMGetInitializer(g)
+        if init:
+            data_bytes += lib.LLVMABISizeOfType(
+                layout, Type(lib.LLVMTypeOf(Value(init))))
+
+    stats = _summarize(totals, blocks)
+    stats.update({
+        'functions': len(per_function),
+        'declarations': declarations,
+        'globals': num_globals,
+        'constant_data_bytes': data_bytes,
+        'per_function': per_function,
+    })
+    return stats
+
+
+def _file_stats(path):
+    """Worker entry point: return (path, stats, error, seconds)."""
+    from . import bit_reader
+    from .context import Context
+    from .memory_buffer import MemoryBuffer
+
+    start = time.perf_counter()
+    try:
+        with Context() as context:
+            module = bit_reader.parse_bitcode(MemoryBuffer.fromFile(path),
+                                              context)
+            stats = module_stats(module)
+    except Exception as e:
+        return path, None, '%s: %s' % (type(e).__name__, e), \
+            time.perf_counter() - start
+    return path, stats, None, time.perf_counter() - start
+
+def directory_stats(directory, max_workers=None):
+    """Yield (path, stats, error, seconds) for each .bc file in directory.
+
+    Files are parsed in a pool of max_workers processes and reported in
+    sorted path order, each once it and the files before it are done;
+    error is a message if the file could not be read.
+    """
+    paths = sorted(os.path.join(directory, name)
+                   for name in os.listdir(directory)
+                   if name.endswith('.bc'))
+    with ProcessPoolExecutor(max_workers) as executor:
+        for result in executor.map(_file_stats, paths):
+            yield result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m llvm.stats',
+        description='Report size statistics of the .bc files in a '
+                    'directory.')
+    parser.add_argument('directory')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='worker processes (default: CPU count)')
+    parser.add_argument('--json', action='store_true',
+                        help='print the full statistics as JSON')
+    args = parser.parse_args(argv)
+
+    results = {}
+    errors = 0
+    header = '%-32s %6s %7s %9s %6s %7s %10s' % (
+        'file', 'funcs', 'blocks', 'insts', 'calls', 'globals', 'data')
+    if not args.json:
+        print(header)
+    totals = dict.fromkeys(['functions', 'blocks', 'instructions',
+                            'call_sites', 'globals',
+                            'constant_data_bytes'], 0)
+    opcodes = {}
+    for path, stats, error, seconds in directory_stats(args.directory,
+                                                       args.jobs):
+        name = os.path.basename(path)
+        if error is not None:
+            errors += 1
+            results[name] = {'error': error}
+            if not args.json:
+                print('%-32s error: %s' % (name, error))
+            continue
+        results[name] = stats
+        for key in totals:
+            totals[key] += stats[key]
+        for op, n in stats['opcodes'].items():
+            opcodes[op] = opcodes.get(op, 0) + n
+        if not args.json:
+            print('%-32s %6d %7d %9d %6d %7d %10d' % (
+                name, stats['functions'], stats['blocks'],
+                stats['instructions'], stats['call_sites'],
+                stats['globals'], stats['constant_data_bytes']))
+
+    if args.json:
+        json.dump(results, sys.stdout, indent=1, sort_keys=True)
+        print()
+    else:
+        print('%-32s %6d %7d %9d %6d %7d %10d' % (
+            'total', totals['functions'], totals['blocks'],
+            totals['instructions'], totals['call_sites'],
+            totals['globals'], totals['constant_data_bytes']))
+        top = sorted(opcodes.items(), key=lambda item: -item[1])[:10]
+        print('top opcodes: %s' % ', '.join('%s %d' % item for item in top))
+    return 1 if errors else 0
+
+
+def register_library(library):
+    library.LLVMGetModuleDataLayout.argtypes = [Module]
+    library.LLVMGetModuleDataLayout.restype = c_object_p
+
+    library.LLVMABISizeOfType.argtypes = [c_object_p, Type]
+    library.LLVMABISizeOfType.restype = c_ulonglong
+
+
+register_library(lib.prototypes)
+
+if __name__ == '__main__':
+    sys.exit(main())
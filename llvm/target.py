@@ -0,0 +1,131 @@
+from .common import LLVMObject
+from .common import c_object_p
+from .common import get_library
+
+from .core import initialize_native_target
+from .memory_buffer import MemoryBuffer
+from .module import Module
+from . import util
+
+from ctypes import POINTER
+from ctypes import byref
+from ctypes import c_char_p
+from ctypes import c_int
+
+
+__all__ = ['TargetMachine', 'get_default_triple', 'get_host_cpu_name']
+lib = get_library()
+
+# LLVMCodeGenFileType
+_ASSEMBLY_FILE = 0
+_OBJECT_FILE = 1
+
+# LLVMRelocMode and LLVMCodeModel defaults.
+_RELOC_DEFAULT = 0
+_CODE_MODEL_DEFAULT = 0
+
+
+def get_default_triple():
+    """Return the target triple LLVM was configured to generate code for."""
+    return util.take_message(lib.LLVMGetDefaultTargetTriple())
+
+def get_host_cpu_name():
+    """Return the name of the host CPU, e.g. 'skylake'."""
+    return util.take_message(lib.LLVMGetHostCPUName())
+
+
+class TargetMachine(LLVMObject):
+    """Code generator for one target triple, CPU and feature set."""
+    def __init__(self, ptr, triple):
+        LLVMObject.__init__(self, ptr, disposer=lib.LLVMDisposeTargetMachine)
+        self.triple = triple
+
+    @classmethod
+    def create(cls, triple=None, cpu='', features='', opt_level=2):
+        """Create a target machine, for the default triple if none is given.
+
+        opt_level is the code generation optimization level, 0 to 3.
+        """
+        initialize_native_target()
+        if not triple:
+            triple = get_default_triple()
+        target = c_object_p()
+        out = util.c_message_p(None)
+        if lib.LLVMGetTargetFromTriple(triple.encode(), byref(target),
+                                       byref(out)):
+            raise RuntimeError('LLVM Error: %s' % util.take_message(out))
+        ptr = lib.LLVMCreateTargetMachine(target, triple.encode(),
+                                          cpu.encode(), features.encode(),
+                                          opt_level, _RELOC_DEFAULT,
+                                          _CODE_MODEL_DEFAULT)
+        if not ptr:
+            raise RuntimeError('LLVM Error: cannot create a target machine '
+                               'for %s' % triple)
+        return cls(ptr, triple)
+
+    @property
+    def data_layout(self):
+        """The data layout string of modules compiled for this target."""
+        data = lib.LLVMCreateTargetDataLayout(self)
+        try:
+            return util.take_message(lib.LLVMCopyStringRepOfTargetData(data))
+        finally:
+            lib.LLVMDisposeTargetData(data)
+
+    def _emit(self, module, file_type):
+        buf = c_object_p()
+        out = util.c_message_p(None)
+        if lib.LLVMTargetMachineEmitToMemoryBuffer(self, module, file_type,
+                                                   byref(out), byref(buf)):
+            raise RuntimeError('LLVM Error: %s' % util.take_message(out))
+        with MemoryBuffer(buf) as mem:
+            return mem.to_bytes()
+
+    def emit_object(self, module):
+        """Compile module and return the object code as bytes.
+
+        LLVM sets the data layout of module to this target's.
+        """
+        return self._emit(module, _OBJECT_FILE)
+
+    def emit_assembly(self, module):
+        """Compile module and return the assembly as text."""
+        return self._emit(module, _ASSEMBLY_FILE).decode()
+
+
+def register_library(library):
+    library.LLVMGetDefaultTargetTriple.argtypes = []
+    library.LLVMGetDefaultTargetTriple.restype = util.c_message_p
+
+    library.LLVMGetHostCPUName.argtypes = []
+    library.LLVMGetHostCPUName.restype = util.c_message_p
+
+    library.LLVMGetTargetFromTriple.argtypes = [c_char_p,
+                                                POINTER(c_object_p),
+                                                POINTER(util.c_message_p)]
+    library.LLVMGetTargetFromTriple.restype = bool
+
+    library.LLVMCreateTargetMachine.argtypes = [c_object_p, c_char_p,
+                                                c_char_p, c_char_p,
+                                                c_int, c_int, c_int]
+    library.LLVMCreateTargetMachine.restype = c_object_p
+
+    library.LLVMDisposeTargetMachine.argtypes = [LLVMObject]
+    library.LLVMDisposeTargetMachine.restype = None
+
+    library.LLVMCreateTargetDataLayout.argtypes = [TargetMachine]
+    library.LLVMCreateTargetDataLayout.restype = c_object_p
+
+    library.LLVMCopyStringRepOfTargetData.argtypes = [c_object_p]
+    library.LLVMCopyStringRepOfTargetData.restype = util.c_message_p
+
+    library.LLVMDisposeTargetData.argtypes = [c_object_p]
+    library.LLVMDisposeTargetData.restype = None
+
+    library.LLVMTargetMachineEmitToMemoryBuffer.argtypes = [
+        TargetMachine, Module, c_int, POINTER(util.c_message_p),
+        POINTER(c_object_p)]
+    library.LLVMTargetMachineEmitToMemoryBuffer.restype = bool
+
+
+register_library(lib.prototypes)
@@ -24,6 +24,8 @@ lib = get_library()
 
 class Type(LLVMObject):
     """Represent a bype in LLVM."""
+    __slots__ = ()
+
     def __init__(self, ty):
         LLVMObject.__init__(self, ty)
 
@@ -40,106 +42,110 @@ class Type(LLVMObject):
     @property
     def name(self):
         """Get the name of the type"""
-        return lib.LLVMPrintTypeToString(self).decode()
+        return util.take_message(lib.LLVMPrintTypeToString(self))
 
     @staticmethod
     def int8(context=None):
         """Create an int8 type in the given context or the global context"""
         if context is not None:
-            return Type(lib.LLVMInt8TypeInContext(context))
+            return Type.from_ptr(lib.LLVMInt8TypeInContext(context))
         else:
-            return Type(lib.LLVMInt8Type())
+            return Type.from_ptr(lib.LLVMInt8Type())
 
     @staticmethod
     def int1(context=None):
         """Create an int1 type (bool) in the given context or global context"""
         if context is not None:
-            return Type(lib.LLVMInt1TypeInContext(context))
+            return Type.from_ptr(lib.LLVMInt1TypeInContext(context))
         else:
-            return Type(lib.LLVMInt1Type())
+            return Type.from_ptr(lib.LLVMInt1Type())
 
     @staticmethod
     def int16(context=None):
         if context is not None:
-            return Type(lib.LLVMInt16TypeInContext(context))
+            return Type.from_ptr(lib.LLVMInt16TypeInContext(context))
         else:
-            return Type(lib.LLVMInt16Type())
+            return Type.from_ptr(lib.LLVMInt16Type())
 
     @staticmethod
     def int32(context=None):
         if context is not None:
-            return Type(lib.LLVMInt32TypeInContext(context))
+            return Type.from_ptr(lib.LLVMInt32TypeInContext(context))
         else:
-            return Type(lib.LLVMInt32Type())
+            return Type.from_ptr(lib.LLVMInt32Type())
 
     @staticmethod
     def int64(context=None):
         if context is not None:
-            return Type(lib.LLVMInt64TypeInContext(context))
+            return Type.from_ptr(lib.LLVMInt64TypeInContext(context))
         else:
-            return Type(lib.LLVMInt64Type())
+            return Type.from_ptr(lib.LLVMInt64Type())
 
     @classmethod
     def int(cls, num_bits, context=None):
         if context is not None:
-            return Type(lib.LLVMIntTypeInContext(context, num_bits))
+            return Type.from_ptr(lib.LLVMIntTypeInContext(context, num_bits))
         else:
-            return Type(lib.LLVMIntType(num_bits))
+            return Type.from_ptr(lib.LLVMIntType(num_bits))
         
     @classmethod
     def half(cls, context=None):
         if context is not None:
-            return Type(lib.LLVMHalfTypeInContext(context))
+            return Type.from_ptr(lib.LLVMHalfTypeInContext(context))
         else:
-            return Type(lib.LLVMHalfType())
+            return Type.from_ptr(lib.LLVMHalfType())
 
     @classmethod
     def float(cls, context=None):
         if context is not None:
-            return Type(lib.LLVMFloatTypeInContext(context))
+            return Type.from_ptr(lib.LLVMFloatTypeInContext(context))
         else:
-            return Type(lib.LLVMFloatType())
+            return Type.from_ptr(lib.LLVMFloatType())
         
     @classmethod
     def double(cls, context=None):
         if context is not None:
-            return Type(lib.LLVMDoubleTypeInContext(context))
+            return Type.from_ptr(lib.LLVMDoubleTypeInContext(context))
         else:
-            return Type(lib.LLVMDoubleType())
+            return Type.from_ptr(lib.LLVMDoubleType())
 
 
     @staticmethod
     def pointer(ty, address_space=0):
-        return Type(lib.LLVMPointerType(ty, address_space))
+        return Type.from_ptr(lib.LLVMPointerType(ty, address_space))
 
     def pointer_address_space(self):
         return lib.LLVMGetPointerAddressSpace(self)
 
     @staticmethod
     def array(ty, count):
-        return Type(lib.LLVMArrayType(ty, count))
+        return Type.from_ptr(lib.LLVMArrayType(ty, count))
 
     def array_length(self):
         return lib.LLVMGetArrayLength(self)
 
     def element_type(self):
-        return Type(lib.LLVMGetElementType(self))
+        return Type.from_ptr(lib.LLVMGetElementType(self))
 
     @staticmethod
     def vector(ty, count):
-        return Type(lib.LLVMVectorType(ty, count))
+        return Type.from_ptr(lib.LLVMVectorType(ty, count))
 
     def vector_size(self):
         return lib.LLVMGetVectorSize(self)
 
     @staticmethod
     def structure(types, packed, context=None):
-        count, types_array = util.to_c_array(types)
-        if context is None:
-            return Type(lib.LLVMStructType(types_array, count, packed))
-        else:
-            return Type(lib.LLVMStructTypeInContext(
-                context, types_array, count, package))
+        count, types_array = util.acquire_array(types)
+        try:
+            if context is None:
+                return Type.from_ptr(
+                    lib.LLVMStructType(types_array, count, packed))
+            else:
+                return Type.from_ptr(lib.LLVMStructTypeInContext(
+                    context, types_array, count, packed))
+        finally:
+            util.release_array(types_array)
 
     def num_elements(self):
         return lib.LLVMCountStructElementTypes(self)
@@ -148,19 +154,22 @@ class Type(LLVMObject):
         elems = pointer(c_object_p())
         count = self.num_elements()
         lib.LLVMGetStructElementTypes(self, elems)
-        return [Type(elems[i]) for i in range(count)]
+        return [Type.from_ptr(elems[i]) for i in range(count)]
 
     @staticmethod
     def create_named_structure(context, name):
         """Create a named (empty) structure"""
-        return Type(lib.LLVMStructCreateNamed(context, name.encode()))
+        return Type.from_ptr(lib.LLVMStructCreateNamed(context, name.encode()))
 
     def struct_name(self):
         return lib.LLVMGetStructName(self).decode()
 
     def set_body(self, types, packed):
-        count, type_array = util.to_c_array(types)
-        lib.LLVMStructSetBody(self, type_array, count, packed)
+        count, type_array = util.acquire_array(types)
+        try:
+            lib.LLVMStructSetBody(self, type_array, count, packed)
+        finally:
+            util.release_array(type_array)
 
     def is_packed(self):
         return lib.LLVMIsPackedStruct(self)
@@ -168,15 +177,18 @@ class Type(LLVMObject):
     # Function type
     @staticmethod
     def function(ret, params, isVarArg):
-        count, param_array = util.to_c_array(params)
-        return Type(lib.LLVMFunctionType(
-            ret, param_array, count, isVarArg))
+        count, param_array = util.acquire_array(params)
+        try:
+            return Type.from_ptr(lib.LLVMFunctionType(
+                ret, param_array, count, isVarArg))
+        finally:
+            util.release_array(param_array)
 
     def is_function_vararg(self):
         return lib.LLVMIsFunctionVarArg(self)
 
     def return_type(self):
-        return Type(lib.LLVMGetReturnType(self))
+        return Type.from_ptr(lib.LLVMGetReturnType(self))
 
     def num_params(self):
         return lib.LLVMCountParamTypes(self)
@@ -185,22 +197,22 @@ class Type(LLVMObject):
         dest = pointer(c_object_p())
         count = self.num_params()
         lib.LLVMGetParamTypes(self, dest)
-        return [Type(dest[i]) for i in range(count)]
+        return [Type.from_ptr(dest[i]) for i in range(count)]
 
     # Special types
     @staticmethod
     def void(context=None):
         if context is None:
-            return Type(lib.LLVMVoidType())
+            return Type.from_ptr(lib.LLVMVoidType())
         else:
-            return Type(lib.LLVMVoidTypeInContext(context))
+            return Type.from_ptr(lib.LLVMVoidTypeInContext(context))
 
     @staticmethod
     def label(context=None):
         if context is None:
-            return Type(lib.LLVMLabelType())
+            return Type.from_ptr(lib.LLVMLabelType())
         else:
-            return Type(lib.LLVMLabelTypeInContext(context))
+            return Type.from_ptr(lib.LLVMLabelTypeInContext(context))
         
     def dump(self):
         lib.LLVMDumpType(self)
@@ -331,7 +343,7 @@ def register_library(library):
     library.LLVMLabelType.restype = c_object_p
     
     library.LLVMPrintTypeToString.argtypes = [Type]
-    library.LLVMPrintTypeToString.restype = c_char_p
+    library.LLVMPrintTypeToString.restype = util.c_message_p
 
     library.LLVMGetTypeKind.argtypes = [Type]
     library.LLVMGetTypeKind.restype = c_int
@@ -361,4 +373,4 @@ def register_library(library):
     library.LLVMGetParamTypes.restype = None
 
 
-register_library(lib)
+register_library(lib.prototypes)
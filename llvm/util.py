@@ -1,10 +1,109 @@
 from .common import c_object_p
+from .common import get_library
+
+from ctypes import c_char_p
+
+import threading
+
+lib = get_library()
+
+
+class c_message_p(c_char_p):
+    """A string allocated by LLVM that the caller has to dispose of.
+
+    Declared as the restype (or out-parameter type) of C API functions such
+    as LLVMPrintValueToString. Unlike c_char_p, ctypes hands back the
+    pointer itself instead of copying it to bytes, so that take_message()
+    can free it.
+    """
+    pass
+
+
+def take_message(msg):
+    """Return the text of a c_message_p as str and dispose of the message.
+
+    Returns None for a null message.
+    """
+    value = msg.value
+    if value is None:
+        return None
+    lib.LLVMDisposeMessage(msg)
+    return value.decode()
 
 
 def to_c_array(params):
+    """Return (count, array) with a new c_object_p array for the wrappers.
+
+    For arrays that outlive the call they are passed to; see acquire_array()
+    otherwise.
+    """
     count = len(params)
-    param_array = (c_object_p * count) ()
-    for i in range(count):
-        param_array[i] = params[i].from_param()
+    param_array = (c_object_p * count)()
+    param_array[:] = [p._as_parameter_ for p in params]
     return (count, param_array)
 
+
+# Pooled argument arrays. Marshalling a list of wrappers for a call such as
+# LLVMBuildCall or LLVMBuildGEP only needs the array for the duration of the
+# call, since LLVM copies its contents. Arrays are therefore kept in
+# per-thread free lists bucketed by power-of-two size and reused.
+_MAX_POOLED = 1024
+_array_types = {}
+_bucket_types = [None] * (_MAX_POOLED + 1)
+for _count in range(_MAX_POOLED + 1):
+    _size = max(8, 1 << (_count - 1).bit_length())
+    if _size not in _array_types:
+        _array_types[_size] = c_object_p * _size
+    _bucket_types[_count] = _array_types[_size]
+del _count, _size
+
+_local = threading.local()
+
+
+def _free_lists():
+    _local.free = dict((t, []) for t in _array_types.values())
+    return _local.free
+
+
+def acquire_array(params):
+    """Obtain a filled c_object_p array for a sequence of wrappers.
+
+    Returns (count, array) like to_c_array(), but the array may be larger
+    than count and must be handed back with release_array() once the C call
+    that consumes it has returned:
+
+        count, arr = util.acquire_array(args)
+        try:
+            lib.LLVMSomething(arr, count)
+        finally:
+            util.release_array(arr)
+    """
+    count = len(params)
+    if count > _MAX_POOLED:
+        return to_c_array(params)
+    array_type = _bucket_types[count]
+    try:
+        free = _local.free[array_type]
+    except AttributeError:
+        free = _free_lists()[array_type]
+    array = free.pop() if free else array_type()
+    array[:count] = [p._as_parameter_ for p in params]
+    return (count, array)
+
+
+def release_array(array):
+    """Return an array obtained from acquire_array() to the pool."""
+    try:
+        free = _local.free.get(type(array))
+    except AttributeError:
+        return
+    if free is not None:
+        free.append(array)
+
+
+def register_library(library):
+    library.LLVMDisposeMessage.argtypes = [c_char_p]
+    library.LLVMDisposeMessage.restype = None
+
+
+register_library(lib.prototypes)
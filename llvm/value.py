@@ -16,13 +16,15 @@ class Value(LLVMObject):
     """Wrapper class for LLVM Value.
 
     Encloses CoreValueConstant and CoreValue classes."""
+    __slots__ = ()
+
     def __init__(self, value):
         LLVMObject.__init__(self, value)
 
     @staticmethod
     def null(ty):
         """Obtain a constant value referring to the null instance of a type."""
-        return Value(lib.LLVMConstNull(ty))
+        return Value.from_ptr(lib.LLVMConstNull(ty))
 
     def is_null(self):
         """Determine whether a value instance is null."""
@@ -31,17 +33,17 @@ class Value(LLVMObject):
     @staticmethod
     def all_ones(ty):
         """Obtain a constant value consisting of all ones."""
-        return Value(lib.LLVMConstAllOnes(ty))
+        return Value.from_ptr(lib.LLVMConstAllOnes(ty))
 
     @staticmethod
     def null_ptr(ty):
         """Obtain a null pointer of a given type."""
-        return Value(lib.LLVMConstPointerNull(ty))
+        return Value.from_ptr(lib.LLVMConstPointerNull(ty))
 
     @staticmethod
     def undef(ty):
         """Obtain a constant value referring to an undefined value of a type."""
-        return Value(lib.LLVMGetUndef(ty))
+        return Value.from_ptr(lib.LLVMGetUndef(ty))
 
     @classmethod
     def const_int(cls, ty, val, sign_extend):
@@ -55,7 +57,7 @@ class Value(LLVMObject):
         Returns:
         a Value object for the given type and value.
         """
-        return Value(lib.LLVMConstInt(ty, val, sign_extend))
+        return Value.from_ptr(lib.LLVMConstInt(ty, val, sign_extend))
 
     def get_signext_value(self):
         """Get the sign extended value of the integer constant value."""
@@ -73,9 +75,9 @@ class Value(LLVMObject):
     def const_real(ty, val):
         """Obtain a constant for a floating point value."""
         if isinstance(val, str):
-            return Value(lib.LLVMConstRealOfString(ty, val.encode()))
+            return Value.from_ptr(lib.LLVMConstRealOfString(ty, val.encode()))
         else:
-            return Value(lib.LLVMConstReal(ty, val))
+            return Value.from_ptr(lib.LLVMConstReal(ty, val))
 
     def get_double_value(self):
         """Obtain the double value for a floating point constant."""
@@ -86,15 +88,18 @@ class Value(LLVMObject):
     @staticmethod
     def const_array(ty, vals):
         """Create a ConstantArray from values."""
-        count, val_array = util.to_c_array(vals)
-        return Value(lib.LLVMConstArray(
-            ty, val_array, count))
+        count, val_array = util.acquire_array(vals)
+        try:
+            return Value.from_ptr(lib.LLVMConstArray(
+                ty, val_array, count))
+        finally:
+            util.release_array(val_array)
 
     def elements(self):
         """Get the elements of the constant array and return as a list."""
         ty = self.type
         n = ty.array_length()
-        return [Value(lib.LLVMGetElementAsConstant(self, i))
+        return [Value.from_ptr(lib.LLVMGetElementAsConstant(self, i))
                 for i in range(n)]
 
     def is_const_array(self):
@@ -104,14 +109,18 @@ class Value(LLVMObject):
     @staticmethod
     def const_struct(vals, packed=False, context=None):
         """Create a constant struct"""
-        count, val_array = util.to_c_array(vals)
-        if context is None:
-            return Value(lib.LLVMConstStruct(val_array, count, packed))
-        else:
-            return Value(lib.LLVMConstStructInContext(context,
-                                                      val_array,
-                                                      count,
-                                                      packed))
+        count, val_array = util.acquire_array(vals)
+        try:
+            if context is None:
+                return Value.from_ptr(
+                    lib.LLVMConstStruct(val_array, count, packed))
+            else:
+                return Value.from_ptr(lib.LLVMConstStructInContext(context,
+                                                          val_array,
+                                                          count,
+                                                          packed))
+        finally:
+            util.release_array(val_array)
 
     def is_const_struct(self):
         """Whether the value is a constant construct"""
@@ -130,7 +139,7 @@ class Value(LLVMObject):
     @property
     def type(self):
         """The type of the value."""
-        return Type(lib.LLVMTypeOf(self))
+        return Type.from_ptr(lib.LLVMTypeOf(self))
 
     def is_constant(self):
         """Determine whether a value instance is constant."""
@@ -142,7 +151,7 @@ class Value(LLVMObject):
 
     def __str__(self):
         """Return a string representation of the value."""
-        return lib.LLVMPrintValueToString(self).decode()
+        return util.take_message(lib.LLVMPrintValueToString(self))
 
     def dump(self):
         """Dump a representation of a value to stderr."""
@@ -157,9 +166,10 @@ class Value(LLVMObject):
         """Create a constant string value in the given context"""
         length = len(s)
         if context is None:
-            return Value(lib.LLVMConstString(s.encode(), length, False))
+            return Value.from_ptr(
+                lib.LLVMConstString(s.encode(), length, False))
         else:
-            return Value(lib.LLVMConstStringInContext(context,
+            return Value.from_ptr(lib.LLVMConstStringInContext(context,
                                                       s.encode(),
                                                       length,
                                                       False))
@@ -177,7 +187,7 @@ class Value(LLVMObject):
     def operands(self):
         """Obtain a list of the operands"""
         n = lib.LLVMGetNumOperands(self)
-        return [Value(lib.LLVMGetOperand(self, i))
+        return [Value.from_ptr(lib.LLVMGetOperand(self, i))
                 for i in range(n)]
 
     def set_operand(self, i, v):
@@ -188,7 +198,7 @@ class Value(LLVMObject):
     def operand_uses(self):
         """Get the uses of the operands of this value"""
         n = lib.LLVMGetNumOperands(self)
-        return [Use(lib.LLVMGetOperandUse(self, i))
+        return [Use.from_ptr(lib.LLVMGetOperandUse(self, i))
                 for i in range(n)]
 
     class __use_iterator__(object):
@@ -203,7 +213,7 @@ class Value(LLVMObject):
             if not isinstance(self.current, Use):
                 raise StopIteration("")
             result = self.current
-            self.current = Use.next
+            self.current = result.next
             return result
 
         def next(self):
@@ -215,27 +225,30 @@ class Value(LLVMObject):
 
 class Use(LLVMObject):
     """Wrapper for LLVMUseRef"""
+    __slots__ = ()
+
     def __init__(self, ptr):
         LLVMObject.__init__(self, ptr)
 
     @staticmethod
     def first(val):
-        """First use of a value"""
-        return Use(lib.LLVMGetFirstUse(val))
+        """First use of a value, None if it has no uses"""
+        u = lib.LLVMGetFirstUse(val)
+        return Use.from_ptr(u) if u else None
 
     @property
     def next(self):
         u = lib.LLVMGetNextUse(self)
-        result = Use(u) if u else None
+        result = Use.from_ptr(u) if u else None
         return result
 
     @property
     def used_value(self):
-        return Value(lib.LLVMGetUsedValue(self))
+        return Value.from_ptr(lib.LLVMGetUsedValue(self))
 
     @property
     def user(self):
-        return Value(lib.LLVMGetUser(self))
+        return Value.from_ptr(lib.LLVMGetUser(self))
 
     
 def register_library(library):    
@@ -309,7 +322,7 @@ def register_library(library):
     library.LLVMConstStructInContext.restype = c_object_p
 
     library.LLVMPrintValueToString.argtypes = [Value]
-    library.LLVMPrintValueToString.restype = ctypes.c_char_p
+    library.LLVMPrintValueToString.restype = util.c_message_p
 
     library.LLVMDumpValue.argtypes = [Value]
     library.LLVMDumpValue.restype = None
@@ -325,6 +338,9 @@ def register_library(library):
     library.LLVMGetNumOperands.argtypes = [Value]
     library.LLVMGetNumOperands.restype = ctypes.c_uint
 
+    library.LLVMGetValueKind.argtypes = [Value]
+    library.LLVMGetValueKind.restype = ctypes.c_int
+
     library.LLVMConstString.argtypes = [ctypes.c_char_p,
                                         ctypes.c_uint,
                                         ctypes.c_bool]
@@ -367,4 +383,4 @@ def register_library(library):
     library.LLVMIsAConstantStruct.argtypes = [Value]
     library.LLVMIsAConstantStruct.restype = c_object_p
 
-register_library(lib)
+register_library(lib.prototypes)
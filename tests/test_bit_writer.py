@@ -0,0 +1,68 @@
+"""Unit test for bit writer"""
+import os
+import tempfile
+import unittest
+
+from llvm import bit_reader
+from llvm import bit_writer
+from llvm.core import Context
+from llvm.core import MemoryBuffer
+
+from tests.testing import create_timestwo_module
+
+
+class WriterTest(unittest.TestCase):
+    def setUp(self):
+        self.mod, _ = create_timestwo_module()
+
+    def check(self, mem):
+        ctx = Context()
+        mod = bit_reader.parse_bitcode(mem, context=ctx)
+        f = mod.get_function('timestwo')
+        self.assertEqual('timestwo', f.name)
+        ctx.close()
+
+    def testMemoryBuffer(self):
+        mem = bit_writer.write_bitcode_to_memory_buffer(self.mod)
+        self.assertEqual(b'BC\xc0\xde', mem.to_bytes()[:4])
+        self.check(mem)
+
+    def testBytes(self):
+        data = bit_writer.write_bitcode(self.mod)
+        self.assertTrue(isinstance(data, bytes))
+        self.check(MemoryBuffer.from_bytes(data))
+
+    def testMemoryView(self):
+        mem = bit_writer.write_bitcode_to_memory_buffer(self.mod)
+        view = mem.memoryview()
+        self.assertTrue(view.readonly)
+        self.assertEqual(len(mem), len(view))
+        self.assertEqual(bytes(mem), view.tobytes())
+
+    def testFile(self):
+        fd, path = tempfile.mkstemp(suffix='.bc')
+        os.close(fd)
+        try:
+            bit_writer.write_bitcode_to_file(self.mod, path)
+            self.check(MemoryBuffer.fromFile(path))
+        finally:
+            os.remove(path)
+
+    def testFD(self):
+        fd, path = tempfile.mkstemp(suffix='.bc')
+        try:
+            bit_writer.write_bitcode_to_fd(self.mod, fd)
+            os.close(fd)
+            with open(path, 'rb') as f:
+                data = f.read()
+        finally:
+            os.remove(path)
+        self.assertEqual(bit_writer.write_bitcode(self.mod), data)
+
+    def testFileError(self):
+        with self.assertRaises(RuntimeError):
+            bit_writer.write_bitcode_to_file(self.mod, '/nonexistent/x.bc')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from llvm import bit_reader
+from llvm import bit_writer
+from llvm.bitcode_loader import BitcodeLoader
+from llvm.context_pool import ContextPool
+from llvm.core import Context
+from llvm.core import MemoryBuffer
+
+from tests.testing import create_timestwo_module
+
+
+class BitcodeLoaderTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        mod, _ = create_timestwo_module()
+        self.paths = []
+        for i in range(6):
+            path = os.path.join(self.dir, 'm%d.bc' % i)
+            bit_writer.write_bitcode_to_file(mod, path)
+            self.paths.append(path)
+        self.bad = os.path.join(self.dir, 'bad.bc')
+        with open(self.bad, 'wb') as f:
+            f.write(b'not bitcode')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def testThreads(self):
+        with BitcodeLoader(self.paths, max_workers=3) as loader:
+            results = list(loader)
+            self.assertEqual(sorted(self.paths),
+                             sorted(r.path for r in results))
+            for r in results:
+                self.assertTrue(r.error is None)
+                self.assertTrue(r.seconds >= 0)
+                f = r.module.get_function('timestwo')
+                self.assertEqual(1, len(f))
+                self.assertEqual(r.context, r.module.context)
+                self.assertTrue(r.module.get_owner() is r.context)
+            # Every file gets a context of its own.
+            self.assertEqual(len(results),
+                             len(set(r.context for r in results)))
+        for r in results:
+            self.assertFalse(r.module._as_parameter_)
+            self.assertTrue(r.context.is_null())
+
+    def testCloseResult(self):
+        with BitcodeLoader(self.paths[:2]) as loader:
+            results = list(loader)
+            results[0].close()
+            self.assertFalse(results[0].module._as_parameter_)
+            self.assertEqual('timestwo',
+                             results[1].module.get_function('timestwo').name)
+
+    def testSharedPool(self):
+        with ContextPool(max_workers=2) as pool:
+            with BitcodeLoader(self.paths, pool=pool) as loader:
+                results = list(loader)
+            self.assertEqual(len(self.paths), len(results))
+            self.assertTrue(pool._executor is not None)
+            # The pool outlives the loader and keeps serving other work.
+            self.assertEqual([1, 2], pool.map(lambda i, ctx: i, [1, 2]))
+
+    def testLazy(self):
+        with BitcodeLoader(self.paths[:2], lazy=True) as loader:
+            for r in loader:
+                f = r.module.get_function('timestwo')
+                self.assertFalse(f.is_materialized)
+
+    def testErrors(self):
+        missing = os.path.join(self.dir, 'missing.bc')
+        with BitcodeLoader([self.bad, missing]) as loader:
+            results = list(loader)
+        self.assertEqual(2, len(results))
+        for r in results:
+            self.assertTrue(r.module is None)
+            self.assertTrue(r.context is None)
+            self.assertTrue(isinstance(r.error, Exception))
+
+    def testCancel(self):
+        with BitcodeLoader(self.paths, max_workers=1) as loader:
+            seen = []
+            for r in loader:
+                seen.append(r)
+                loader.cancel()
+            self.assertEqual(1, len(seen))
+
+    def testProcesses(self):
+        with BitcodeLoader(self.paths[:2] + [self.bad], max_workers=2,
+                           processes=True) as loader:
+            results = dict((r.path, r) for r in loader)
+        self.assertTrue(isinstance(results[self.bad].error, RuntimeError))
+        data = results[self.paths[0]].bitcode
+        with Context() as ctx:
+            mod = bit_reader.parse_bitcode(MemoryBuffer.from_bytes(data), ctx)
+            self.assertEqual('timestwo', mod.get_function('timestwo').name)
+
+    def testLazyProcessesRejected(self):
+        self.assertRaises(ValueError, BitcodeLoader, self.paths,
+                          processes=True, lazy=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,234 @@
+import gc
+import os
+import unittest
+
+from ctypes import c_uint
+
+from llvm import common
+from llvm.common import c_object_p
+from llvm.common import get_library
+from llvm.core import Context
+from llvm.core import MemoryBuffer
+from llvm.core import Module
+from llvm.core import Type
+from llvm.core import Instruction
+from llvm.core import Value
+
+from llvm.execution import ExecutionEngine
+from llvm.global_variables import Global
+from llvm.instruction_builder import Builder
+
+from tests.testing import create_timestwo_module
+from tests.testing import create_two_module
+from tests.testing import rss_kib
+from tests.testing import SLOW_TESTS
+
+
+class InterningTest(unittest.TestCase):
+    def setUp(self):
+        common.enable_interning()
+
+    def tearDown(self):
+        common.disable_interning()
+
+    def testSameType(self):
+        a = Type.int32()
+        b = Type.int32()
+        self.assertTrue(a is b)
+
+    def testTraversal(self):
+        mod, f = create_timestwo_module()
+        self.assertTrue(mod.first is mod.first)
+
+        bb = f.first
+        inst = bb.first
+        self.assertTrue(isinstance(inst, Instruction))
+        self.assertTrue(inst is bb.first)
+        ret = inst.next
+        self.assertTrue(ret.operands[0] is inst)
+
+    def testAppendedBlock(self):
+        with Context() as ctx:
+            mod = Module.CreateWithName('module', ctx)
+            ty = Type.int32(ctx)
+            f = mod.add_function('f', Type.function(ty, [], False))
+            bb = f.append_basic_block('entry', ctx)
+            self.assertTrue(bb is f.first)
+
+    def testDisabled(self):
+        common.disable_interning()
+        a = Type.int32()
+        b = Type.int32()
+        self.assertFalse(a is b)
+        self.assertEqual(a, b)
+
+    def testNullNotInterned(self):
+        mod = Module.CreateWithName('module')
+        a = mod.get_function('missing')
+        b = mod.get_function('missing')
+        self.assertFalse(a._as_parameter_)
+        self.assertFalse(a is b)
+
+    def testDeleteGlobal(self):
+        mod = Module.CreateWithName('module')
+        ty = Type.int8(mod.context)
+        g = Global.add(mod, ty, 'x')
+        self.assertTrue(g is Global.get(mod, 'x'))
+        g.delete()
+        h = Global.add(mod, ty, 'y')
+        self.assertFalse(g is h)
+
+
+class SlotsTest(unittest.TestCase):
+    def testNoInstanceDict(self):
+        mod, f = create_timestwo_module()
+        for obj in [f, f.first, f.first.first, f.get_param(0), f.type]:
+            self.assertFalse(hasattr(obj, '__dict__'))
+
+    def testLazyOwnership(self):
+        mod, f = create_timestwo_module()
+        self.assertFalse(hasattr(f, '_owned_objects'))
+        ctx = Context()
+        mod = Module.CreateWithName('module', ctx)
+        self.assertEqual([mod], ctx._owned_objects)
+        self.assertFalse(mod._finalizer.alive)
+
+
+class HashTest(unittest.TestCase):
+    def testValueSet(self):
+        mod, f = create_timestwo_module()
+        x = f.get_param(0)
+        insts = list(f.first)
+        seen = set([x] + insts)
+        self.assertTrue(f.get_param(0) in seen)
+        self.assertTrue(insts[1].operands[0] in seen)
+        self.assertEqual(len(insts) + 1, len(seen))
+
+    def testTypeDict(self):
+        ids = {Type.int8(): 0, Type.int32(): 1}
+        self.assertEqual(1, ids[Type.int32()])
+        self.assertFalse(Type.int16() in ids)
+
+    def testBasicBlockKey(self):
+        mod, f = create_timestwo_module()
+        order = {bb: i for i, bb in enumerate(f)}
+        self.assertEqual(0, order[f.first])
+
+    def testNotEqualOther(self):
+        self.assertNotEqual(Type.int8(), 'i8')
+        self.assertNotEqual(Type.int8(), None)
+
+
+class LibraryTest(unittest.TestCase):
+    def testMemoized(self):
+        self.assertTrue(get_library() is get_library())
+
+    def testPrototypeBoundOnAccess(self):
+        lib = get_library()
+        self.assertTrue('LLVMTypeOf' in lib.prototypes)
+        self.assertTrue(lib.LLVMTypeOf.restype is c_object_p)
+
+    def testLateDeclaration(self):
+        # A symbol no module declares, so the shared table is left as the
+        # rest of the suite expects it.
+        lib = get_library()
+        self.addCleanup(lib.prototypes._prototypes.pop, 'LLVMIsMultithreaded',
+                        None)
+        self.addCleanup(lib.__dict__.pop, 'LLVMIsMultithreaded', None)
+        lib.LLVMIsMultithreaded
+        lib.prototypes.LLVMIsMultithreaded.restype = c_uint
+        self.assertTrue(lib.LLVMIsMultithreaded.restype is c_uint)
+
+    def testMissingSymbol(self):
+        with self.assertRaises(AttributeError):
+            get_library().LLVMNoSuchFunction
+
+
+class LifetimeTest(unittest.TestCase):
+    def testCloseCascades(self):
+        ctx = Context()
+        mod = Module.CreateWithName('module', ctx)
+        ctx.close()
+        self.assertTrue(ctx.is_null())
+        self.assertFalse(mod._as_parameter_)
+
+    def testDoubleClose(self):
+        ctx = Context()
+        mod = Module.CreateWithName('module', ctx)
+        mod.close()
+        mod.close()
+        ctx.close()
+        ctx.close()
+
+    def testContextManager(self):
+        with Context() as ctx:
+            with Module.CreateWithName('module', ctx) as mod:
+                mod.add_function('f', Type.function(Type.void(ctx), [],
+                                                    False))
+            self.assertFalse(mod._as_parameter_)
+            with Builder.create(ctx) as bldr:
+                pass
+            self.assertTrue(bldr.is_null())
+        self.assertTrue(ctx.is_null())
+
+    def testEngineOwnsModule(self):
+        mod = create_two_module()
+        with ExecutionEngine.create_interpreter(mod) as ee:
+            pass
+        self.assertTrue(ee.is_null())
+        self.assertFalse(mod._as_parameter_)
+        # The module went away with the engine; this must not free it again.
+        mod.close()
+
+    @unittest.skipUnless(os.path.exists('/proc/self/statm'), 'needs procfs')
+    def testCreateDisposeCyclesKeepRSSFlat(self):
+        def cycle(i):
+            with Context() as ctx:
+                mod = Module.CreateWithName('m%d' % i, ctx)
+                ty = Type.int32(ctx)
+                f = mod.add_function('f', Type.function(ty, [ty], False))
+                with Builder.create(ctx) as bldr:
+                    bldr.position_at_end(f.append_basic_block('entry', ctx))
+                    bldr.ret(bldr.add(f.get_param(0),
+                                      Value.const_int(ty, 1, True), 'r'))
+                with MemoryBuffer.from_string('x' * 4096):
+                    pass
+
+        cycles = 100000 if SLOW_TESTS else 10000
+        for i in range(1000):
+            cycle(i)
+        before = rss_kib()
+        for i in range(cycles):
+            cycle(i)
+        growth = rss_kib() - before
+        # Leaking a context, module or buffer per cycle would cost several
+        # KiB each, i.e. tens of MiB over the run.
+        self.assertTrue(growth < 4096, 'RSS grew by %d KiB over %d cycles'
+                        % (growth, cycles))
+
+
+class FinalizerTest(unittest.TestCase):
+    def testOnlyOwnersRegistered(self):
+        mod, f = create_timestwo_module()
+        for obj in [f, f.first, f.first.first, f.get_param(0), f.type]:
+            self.assertFalse(hasattr(obj, '_finalizer'))
+        ctx = Context()
+        self.assertTrue(ctx._finalizer.alive)
+
+    def testCollectedWithoutClose(self):
+        ctx = Context()
+        Module.CreateWithName('module', ctx)
+        finalizer = ctx._finalizer
+        del ctx
+        gc.collect()
+        self.assertFalse(finalizer.alive)
+
+    def testCloseDetaches(self):
+        ctx = Context()
+        finalizer = ctx._finalizer
+        ctx.close()
+        self.assertFalse(finalizer.alive)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+"""Unit tests for the persistent compile cache"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from llvm import bit_reader
+from llvm import bit_writer
+from llvm.compile_cache import CompileCache
+from llvm.core import Context
+from llvm.core import MemoryBuffer
+from llvm.core import Type
+from llvm.execution import ExecutionEngine
+from llvm.execution import GenericValue
+
+from tests.testing import create_abs_module
+from tests.testing import create_timestwo_module
+
+
+class CompileCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = CompileCache(self.directory)
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.directory)
+
+    def testKey(self):
+        data = bit_writer.write_bitcode(create_timestwo_module()[0])
+        key = self.cache.key(data)
+        self.assertEqual(64, len(key))
+        self.assertEqual(key, self.cache.key(data))
+        with CompileCache(self.directory, opt_level=1) as other:
+            self.assertNotEqual(key, other.key(data))
+        with CompileCache(self.directory, passes='instcombine') as other:
+            self.assertNotEqual(key, other.key(data))
+
+    def testLookupAndStore(self):
+        self.assertIsNone(self.cache.lookup('ab' * 32))
+        self.cache.store('ab' * 32, 'bc', b'data')
+        self.assertEqual(b'data', self.cache.lookup('ab' * 32))
+        self.assertEqual({'hits': 1, 'misses': 1, 'stores': 1,
+                          'evictions': 0}, self.cache.stats())
+        self.assertEqual(4, self.cache.size())
+        self.cache.clear()
+        self.assertEqual(0, self.cache.size())
+
+    def testOptimize(self):
+        mod, _ = create_timestwo_module()
+        before = str(mod)
+        optimized = self.cache.optimize(mod)
+        self.assertIn('shl i8', str(optimized))
+        self.assertEqual(before, str(mod))
+        self.assertEqual(mod.context, optimized.context)
+
+        # A new instance, as after a restart, finds the result on disk.
+        mod, _ = create_timestwo_module()
+        with CompileCache(self.directory) as cache:
+            cached = cache.optimize(mod)
+            self.assertEqual((1, 0), (cache.hits, cache.misses))
+        self.assertEqual(str(optimized), str(cached))
+        self.assertEqual(before, str(mod))
+        self.assertEqual('timestwo', cached.get_function('timestwo').name)
+
+    def testOptimizeOwnership(self):
+        with Context() as ctx:
+            mod, _ = create_abs_module(ctx)
+            miss = self.cache.optimize(mod)
+            hit = self.cache.optimize(mod)
+            self.assertEqual(1, self.cache.hits)
+            self.assertTrue(miss.get_owner() is ctx)
+            self.assertTrue(hit.get_owner() is ctx)
+        self.assertTrue(miss.is_null())
+        self.assertTrue(hit.is_null())
+
+    def testObjectCode(self):
+        mod, _ = create_timestwo_module()
+        before = str(mod)
+        obj = self.cache.object_code(mod)
+        self.assertEqual(b'\x7fELF', obj[:4])
+        self.assertEqual(before, str(mod))
+        self.assertEqual(obj, self.cache.object_code(mod))
+        self.assertEqual(1, self.cache.hits)
+
+    def testLoadBitcode(self):
+        data = bit_writer.write_bitcode(create_timestwo_module()[0])
+        ctx = Context()
+        try:
+            first = bit_reader.parse_bitcode(MemoryBuffer.from_bytes(data),
+                                             ctx, cache=self.cache)
+            second = bit_reader.parse_bitcode(MemoryBuffer.from_bytes(data),
+                                              ctx, cache=self.cache)
+            self.assertEqual(str(first), str(second))
+            self.assertIn('shl i8', str(second))
+            self.assertEqual((1, 1), (self.cache.hits, self.cache.misses))
+        finally:
+            ctx.close()
+
+    def testEviction(self):
+        cache = CompileCache(self.directory, max_bytes=16)
+        keys = ['%02x' % i * 32 for i in range(4)]
+        for i, key in enumerate(keys):
+            cache.store(key, 'bc', b'1234')
+            os.utime(cache._path(key, 'bc'), ns=(i, i))
+        cache.lookup(keys[0])
+        cache.store('ff' * 32, 'bc', b'1234')
+        # Down to the low-water mark of 12 bytes, least recently used first.
+        self.assertEqual(2, cache.evictions)
+        self.assertIsNotNone(cache.lookup(keys[0]))
+        self.assertIsNone(cache.lookup(keys[1]))
+        self.assertIsNone(cache.lookup(keys[2]))
+        self.assertIsNotNone(cache.lookup(keys[3]))
+        self.assertEqual(12, cache.size())
+        self.assertEqual(12, cache._read_total())
+
+    def testStoreDoesNotScan(self):
+        scans = []
+        entries = self.cache._entries
+        self.cache._entries = lambda: scans.append(1) or entries()
+        self.cache.store('ab' * 32, 'bc', b'data')
+        # Without an index the first store counts the entries once.
+        self.assertEqual(1, len(scans))
+        for i in range(5):
+            self.cache.store('%02x' % i * 32, 'bc', b'1234')
+        self.cache.store('ab' * 32, 'bc', b'xy')
+        self.assertEqual(1, len(scans))
+        self.assertEqual(22, self.cache._read_total())
+        self.cache.discard('ab' * 32)
+        self.assertEqual(20, self.cache._read_total())
+        self.assertEqual(20, self.cache.size())
+
+    def testDamagedEntry(self):
+        mod, _ = create_timestwo_module()
+        self.cache.optimize(mod).close()
+        key = self.cache.key(bit_writer.write_bitcode(mod))
+        path = self.cache._path(key, 'bc')
+        with open(path, 'rb') as f:
+            data = f.read()
+        with open(path, 'wb') as f:
+            f.write(data[:len(data) // 2])
+        optimized = self.cache.optimize(mod)
+        self.assertIn('shl i8', str(optimized))
+        self.assertEqual((0, 2), (self.cache.hits, self.cache.misses))
+        with open(path, 'rb') as f:
+            self.assertEqual(data, f.read())
+
+    def testExecutionEngine(self):
+        # Wrappers obtained before optimizing stay valid, both on a miss and
+        # on a hit.
+        for _ in range(2):
+            mod, f = create_timestwo_module()
+            x = GenericValue.of_int(Type.int8(context=mod.context), 3, True)
+            optimized = self.cache.optimize(mod)
+            ee = ExecutionEngine.create_interpreter(optimized)
+            g = optimized.get_function('timestwo')
+            self.assertEqual(6, ee.run_function(g, [x]).to_int(True))
+            self.assertIn('mul i8', str(f))
+        self.assertEqual((1, 1), (self.cache.hits, self.cache.misses))
+
+    def testNotUsedImplicitly(self):
+        data = bit_writer.write_bitcode(create_timestwo_module()[0])
+        mod = bit_reader.parse_bitcode(MemoryBuffer.from_bytes(data))
+        self.assertIn('mul i8', str(mod))
+        self.assertEqual(0, self.cache.misses)
+
+
+if __name__ == '__main__':
+    unittest.main()
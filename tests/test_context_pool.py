@@ -0,0 +1,175 @@
+import os
+import threading
+import unittest
+
+from llvm.context_pool import ContextPool
+from llvm.context_pool import ContextRecycler
+from llvm.context_pool import RotationPolicy
+from llvm.context_pool import estimate_module_bytes
+from llvm.core import Context
+from llvm.core import Module
+from llvm.core import Type
+from llvm.core import Value
+from llvm.instruction_builder import Builder
+
+from tests.testing import rss_kib
+from tests.testing import SLOW_TESTS
+
+
+def build(name, context):
+    mod = Module.CreateWithName(name, context)
+    ty = Type.int32(context)
+    f = mod.add_function('f', Type.function(ty, [ty], False))
+    bldr = Builder.create(context)
+    bldr.position_at_end(f.append_basic_block('entry', context))
+    bldr.ret(bldr.add(f.get_param(0), Value.const_int(ty, 1, True), 'r'))
+    return mod
+
+
+def populate(mod, context, i):
+    """Add a function with fresh uniqued constants and a named struct."""
+    ty = Type.int64(context)
+    Type.create_named_structure(context, 'S%d' % i)
+    f = mod.add_function('f', Type.function(ty, [ty], False))
+    with Builder.create(context) as bldr:
+        bldr.position_at_end(f.append_basic_block('entry', context))
+        x = f.get_param(0)
+        for j in range(50):
+            x = bldr.add(x, Value.const_int(ty, i * 50 + j, True), 'x')
+        bldr.ret(x)
+
+
+class ContextPoolTest(unittest.TestCase):
+    def testPerThread(self):
+        with ContextPool() as pool:
+            ctx = pool.get()
+            self.assertTrue(ctx is pool.get())
+            other = []
+            t = threading.Thread(target=lambda: other.append(pool.get()))
+            t.start()
+            t.join()
+            self.assertNotEqual(ctx, other[0])
+            self.assertEqual(2, len(pool))
+        self.assertTrue(ctx.is_null())
+        self.assertTrue(other[0].is_null())
+
+    def testTypeCache(self):
+        with ContextPool() as pool:
+            types = pool.types()
+            self.assertTrue(types.int32 is pool.types().int32)
+            self.assertEqual(Type.int32(pool.get()), types.int32)
+            self.assertNotEqual(Type.int32(), types.int32)
+
+    def testMap(self):
+        names = ['m%d' % i for i in range(8)]
+        with ContextPool(max_workers=4) as pool:
+            mods = pool.map(build, names)
+            self.assertEqual(len(names), len(mods))
+            for mod in mods:
+                self.assertEqual('f', mod.get_function('f').name)
+            self.assertTrue(1 <= len(pool) <= 4)
+            for mod in mods:
+                self.assertTrue(mod.context in pool._contexts)
+        for mod in mods:
+            self.assertFalse(mod._as_parameter_)
+
+    def testMapReusesWorkers(self):
+        names = ['m%d' % i for i in range(8)]
+        with ContextPool(max_workers=2) as pool:
+            for _ in range(5):
+                for mod in pool.map(build, names):
+                    mod.close()
+                self.assertTrue(1 <= len(pool) <= 2)
+        self.assertRaises(ValueError, pool.map, build, names)
+
+    def testSubmit(self):
+        with ContextPool(max_workers=2) as pool:
+            mod = pool.submit(lambda n: build(n, pool.get()), 'm').result()
+            self.assertTrue(mod.context in pool._contexts)
+            self.assertTrue(pool.map(build, ['a'])[0].context
+                            in pool._contexts)
+        self.assertRaises(ValueError, pool.submit, build, 'm', None)
+
+    def testMapError(self):
+        def fail(item, context):
+            raise KeyError(item)
+        with ContextPool() as pool:
+            self.assertRaises(KeyError, pool.map, fail, [1, 2])
+
+    def testClosed(self):
+        pool = ContextPool()
+        pool.close()
+        self.assertRaises(ValueError, pool.get)
+
+
+class ContextRecyclerTest(unittest.TestCase):
+    def testRotateAfterModules(self):
+        with ContextRecycler(RotationPolicy(max_modules=2)) as recycler:
+            a = recycler.create_module('a')
+            b = recycler.create_module('b')
+            self.assertEqual(1, recycler.retired)
+            c = recycler.create_module('c')
+            self.assertEqual(a.context, b.context)
+            self.assertNotEqual(a.context, c.context)
+
+            recycler.release(a)
+            self.assertEqual(0, recycler.disposed)
+            recycler.release(b)
+            self.assertEqual(1, recycler.disposed)
+            self.assertEqual(c.context, recycler.context)
+        self.assertFalse(c._as_parameter_)
+
+    def testRotateAfterBytes(self):
+        policy = RotationPolicy(max_bytes=100, estimate=lambda m: 60)
+        with ContextRecycler(policy) as recycler:
+            first = recycler.context
+            recycler.release(recycler.create_module('a'))
+            self.assertTrue(recycler.context is first)
+            recycler.release(recycler.create_module('b'))
+            self.assertEqual(1, recycler.disposed)
+            self.assertTrue(first.is_null())
+            self.assertFalse(recycler.context is first)
+
+    def testWaitsForOwnedObjects(self):
+        with ContextRecycler(RotationPolicy(max_modules=1)) as recycler:
+            extra = Module.CreateWithName('extra', recycler.context)
+            mod = recycler.create_module('a')
+            recycler.release(mod)
+            self.assertEqual(0, recycler.disposed)
+            extra.close()
+            recycler.collect()
+            self.assertEqual(1, recycler.disposed)
+
+    def testReleaseClosed(self):
+        with ContextRecycler() as recycler:
+            mod = recycler.create_module('a')
+            mod.close()
+            recycler.release(mod)
+
+    @unittest.skipUnless(os.path.exists('/proc/self/statm'), 'needs procfs')
+    def testRotationKeepsRSSBounded(self):
+        count = 50000 if SLOW_TESTS else 4000
+        with ContextRecycler(RotationPolicy(max_modules=200)) as recycler:
+            def run(start, stop):
+                for i in range(start, stop):
+                    mod = recycler.create_module('m%d' % i)
+                    populate(mod, mod.context, i)
+                    recycler.release(mod)
+            run(0, 1000)
+            before = rss_kib()
+            run(1000, count)
+            growth = rss_kib() - before
+            self.assertTrue(recycler.disposed >= count // 200 - 1)
+        # Keeping every module's constants in one context grows by about
+        # 5 MiB per 1000 modules.
+        self.assertTrue(growth < 4096, 'RSS grew by %d KiB over %d modules'
+                        % (growth, count - 1000))
+
+    def testEstimate(self):
+        with Context() as ctx:
+            mod = build('m', ctx)
+            self.assertEqual(2 * 64, estimate_module_bytes(mod))
+
+
+if __name__ == "__main__":
+    unittest.main()
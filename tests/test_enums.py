@@ -1,6 +1,9 @@
 import unittest
+import warnings
 
 from llvm.core import Attribute
+from llvm.core import CallConv
+from llvm.core import OpCode
 from llvm.core import Type
 from llvm.common import *
 from llvm.common import LLVMObject
@@ -15,6 +18,37 @@ class EnumTest(unittest.TestCase):
         b = Attribute.from_value(a.value)
         self.assertEqual(a, b)
 
+    def testDenseLookup(self):
+        self.assertTrue(OpCode.from_value(OpCode.Mul.value) is OpCode.Mul)
+        self.assertTrue(CallConv.from_value(64) is CallConv.X86StdcallCall)
+        self.assertTrue(Attribute.from_value(1 << 31) is Attribute.NonLazyBind)
+        self.assertRaises(ValueError, OpCode.from_value, 6)
+        self.assertRaises(ValueError, OpCode.from_value, -1)
+        self.assertRaises(ValueError, OpCode.from_value, 1000)
+
+    def testOpCodeCategories(self):
+        self.assertTrue(OpCode.Ret.value in OpCode.terminators)
+        self.assertTrue(OpCode.Xor.value in OpCode.binary_ops)
+        self.assertTrue(OpCode.Store.value in OpCode.memory_ops)
+        self.assertTrue(OpCode.BitCast.value in OpCode.casts)
+        self.assertTrue(OpCode.ICmp.value in OpCode.compares)
+        self.assertFalse(OpCode.Add.value in OpCode.terminators)
+
+        flags = OpCode.category_flags()
+        invoke = flags[OpCode.Invoke.value]
+        self.assertEqual(OpCode.TERMINATOR | OpCode.CALL, invoke)
+        self.assertEqual(0, flags[OpCode.PHI.value])
+
+    def testFCmp(self):
+        self.assertEqual(43, OpCode.FCmp.value)
+        self.assertTrue(OpCode.from_value(43) is OpCode.FCmp)
+        self.assertTrue(OpCode.FCmp.value in OpCode.compares)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            self.assertTrue(OpCode.FCmpl is OpCode.FCmp)
+        self.assertEqual([DeprecationWarning],
+                         [w.category for w in caught])
+
 
 class LLVMObjectTest(unittest.TestCase):
     def testEqual(self):
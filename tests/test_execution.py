@@ -1,10 +1,15 @@
+import threading
 import unittest
 
+from llvm.core import Context
 from llvm.core import Type
 from llvm.core import VerifierFailureActionTy
+from llvm import core
 
 from llvm.execution import GenericValue
 from llvm.execution import ExecutionEngine
+from llvm.pass_manager import FunctionPassManager
+from llvm.pass_manager import run_passes
 
 from tests.testing import *
 
@@ -146,6 +151,47 @@ class ExecutionTest(unittest.TestCase):
         x = ee.run_function(load, [offset])
         self.assertEqual(4, x.to_int(True))
 
+    def testContextClosedBeforeEngine(self):
+        ctx = Context()
+        mod, f = create_abs_module(ctx)
+        ee = ExecutionEngine.create_interpreter(mod)
+        self.assertTrue(ee.get_owner() is ctx)
+        self.assertFalse(any(obj is mod for obj in ctx._owned_objects))
+        ctx.close()
+        self.assertTrue(ee.is_null())
+        self.assertTrue(mod.is_null())
+        ee.close()
+
+    def testLazyInitialization(self):
+        mod = create_two_module()
+        ExecutionEngine.create_interpreter(mod)
+        self.assertTrue(core._passes_initialized)
+        self.assertTrue(core._native_target_initialized)
+        # Repeated initialization is a no-op.
+        core.initialize_llvm()
+
+    def testPassManagersInitializePasses(self):
+        mod = create_two_module()
+        self.addCleanup(setattr, core, '_passes_initialized', True)
+        core._passes_initialized = False
+        FunctionPassManager.for_module(mod).close()
+        self.assertTrue(core._passes_initialized)
+
+        core._passes_initialized = False
+        run_passes(mod, 'instcombine')
+        self.assertTrue(core._passes_initialized)
+
+    def testConcurrentInitialization(self):
+        self.addCleanup(setattr, core, '_passes_initialized', True)
+        core._passes_initialized = False
+        threads = [threading.Thread(target=core.initialize_passes)
+                   for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertTrue(core._passes_initialized)
+
     def testTimesTwoC(self):
         mod = parse_bitcode('timestwo.c')
         ee = ExecutionEngine.create_interpreter(mod)
@@ -0,0 +1,153 @@
+"""Unit tests for structural fingerprints"""
+import unittest
+
+from llvm.core import Context
+from llvm.core import Module
+from llvm.core import Type
+from llvm.core import Value
+from llvm.fingerprint import Fingerprinter
+from llvm.fingerprint import duplicate_functions
+from llvm.global_variables import Global
+from llvm.instruction_builder import Builder
+
+from tests.testing import create_abs_module
+from tests.testing import create_cumsum_module
+from tests.testing import create_timestwo_module
+
+
+def add_binary(mod, name, op, swap=False, const=2, names=('x', 'res')):
+    ctx = mod.context
+    ty = Type.int8(context=ctx)
+    f = mod.add_function(name, Type.function(ty, [ty, ty], False))
+    bldr = Builder.create(ctx)
+    bldr.position_at_end(f.append_basic_block(names[0], ctx))
+    x, y = f.get_param(0), f.get_param(1)
+    if swap:
+        x, y = y, x
+    z = getattr(bldr, op)(x, y, names[1])
+    bldr.ret(bldr.add(z, Value.const_int(ty, const, True), names[1]))
+    return f
+
+
+class FingerprintTest(unittest.TestCase):
+    def setUp(self):
+        self.ctx = Context()
+        self.mod = Module.CreateWithName('fp', self.ctx)
+
+    def tearDown(self):
+        self.ctx.close()
+
+    def testIgnoresNames(self):
+        f = add_binary(self.mod, 'f', 'sub')
+        g = add_binary(self.mod, 'g', 'sub', names=('entry', 'tmp'))
+        self.assertEqual(f.fingerprint(), g.fingerprint())
+        self.assertEqual(32, len(f.fingerprint()))
+
+    def testStructure(self):
+        f = add_binary(self.mod, 'f', 'sub')
+        fp = Fingerprinter()
+        self.assertNotEqual(fp.function(f), fp.function(
+            add_binary(self.mod, 'g', 'add')))
+        self.assertNotEqual(fp.function(f), fp.function(
+            add_binary(self.mod, 'h', 'sub', swap=True)))
+        self.assertNotEqual(fp.function(f), fp.function(
+            add_binary(self.mod, 'k', 'sub', const=3)))
+
+    def testControlFlow(self):
+        abs_mod, abs_f = create_abs_module()
+        cumsum_mod, cumsum_f = create_cumsum_module()
+        self.assertNotEqual(abs_f.fingerprint(), cumsum_f.fingerprint())
+        self.assertEqual(abs_f.fingerprint(),
+                         create_abs_module()[1].fingerprint())
+
+    def testStableAcrossContexts(self):
+        mod, _ = create_abs_module(self.ctx)
+        other = Context()
+        try:
+            self.assertEqual(mod.fingerprint(),
+                             mod.clone(other).fingerprint())
+        finally:
+            other.close()
+
+    def testModule(self):
+        add_binary(self.mod, 'f', 'sub')
+        before = self.mod.fingerprint()
+        self.assertEqual(before, self.mod.clone().fingerprint())
+        add_binary(self.mod, 'g', 'sub')
+        self.assertNotEqual(before, self.mod.fingerprint())
+
+    def testIncremental(self):
+        f = add_binary(self.mod, 'f', 'sub')
+        fp = Fingerprinter()
+        before = fp.module(self.mod)
+        f.first.last.prev.set_operand(1, Value.const_int(
+            Type.int8(context=self.ctx), 5, True))
+        self.assertEqual(before, fp.module(self.mod))
+        fp.invalidate(f)
+        self.assertNotEqual(before, fp.module(self.mod))
+        self.assertEqual(Fingerprinter().module(self.mod),
+                         fp.module(self.mod))
+
+    def testWrappersSeeEdits(self):
+        f = add_binary(self.mod, 'f', 'sub')
+        before = f.fingerprint()
+        f.first.last.prev.set_operand(1, Value.const_int(
+            Type.int8(context=self.ctx), 5, True))
+        self.assertNotEqual(before, f.fingerprint())
+
+    def testRenamedCallee(self):
+        ty = Type.int8(context=self.ctx)
+        h = self.mod.add_function('h', Type.function(ty, [], False))
+        g = self.mod.add_function('g', Type.function(ty, [], False))
+        bldr = Builder.create(self.ctx)
+        bldr.position_at_end(g.append_basic_block('entry', self.ctx))
+        bldr.ret(bldr.call(h, [], 'r'))
+        fp = Fingerprinter()
+        before = fp.function(g)
+        h.name = 'k'
+        self.assertEqual(before, fp.function(g))
+        fp.invalidate(g)
+        self.assertNotEqual(before, fp.function(g))
+        self.assertEqual(fp.function(g), g.fingerprint())
+
+    def testModuleLevelNotMemoized(self):
+        ty = Type.int8(context=self.ctx)
+        g = Global.add(self.mod, ty, 'g')
+        g.initializer = Value.const_int(ty, 1, True)
+        add_binary(self.mod, 'f', 'sub')
+        fp = Fingerprinter()
+        seen = set([fp.module(self.mod)])
+        g.initializer = Value.const_int(ty, 2, True)
+        seen.add(fp.module(self.mod))
+        g.set_const(True)
+        seen.add(fp.module(self.mod))
+        self.mod.target = 'x86_64-unknown-linux-gnu'
+        seen.add(fp.module(self.mod))
+        self.mod.datalayout = 'e-m:e-i64:64-n8:16:32:64-S128'
+        seen.add(fp.module(self.mod))
+        g.delete()
+        seen.add(fp.module(self.mod))
+        self.assertEqual(6, len(seen))
+        self.assertEqual(self.mod.fingerprint(), fp.module(self.mod))
+
+    def testDeclaration(self):
+        ty = Type.int8(context=self.ctx)
+        f = self.mod.add_function('decl', Type.function(ty, [ty], False))
+        self.assertEqual(32, len(f.fingerprint()))
+
+    def testDuplicates(self):
+        add_binary(self.mod, 'a', 'sub')
+        add_binary(self.mod, 'b', 'add')
+        add_binary(self.mod, 'c', 'sub', names=('bb', 'v'))
+        add_binary(self.mod, 'd', 'add')
+        self.assertEqual([['a', 'c'], ['b', 'd']],
+                         duplicate_functions(self.mod))
+
+    def testFunctions(self):
+        mod, f = create_timestwo_module()
+        self.assertEqual({'timestwo': f.fingerprint()},
+                         Fingerprinter().functions(mod))
+
+
+if __name__ == '__main__':
+    unittest.main()
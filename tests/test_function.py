@@ -59,6 +59,7 @@ class ModuleTest(unittest.TestCase):
         instruction = [i for i in bb[0] if i.name == 'y']
     
         self.assertEqual(OpCode.PHI, instruction[0].opcode)
+        self.assertEqual(OpCode.PHI.value, instruction[0].opcode_value)
         phi = PhiNode(instruction[0].from_param())
         self.assertEqual(2, phi.count_incoming())
 
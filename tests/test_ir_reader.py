@@ -0,0 +1,63 @@
+"""Unit test for IR reader"""
+import unittest
+from os import path
+
+from llvm import bit_writer
+from llvm import ir_reader
+from llvm.core import Context
+from llvm.core import MemoryBuffer
+from llvm.core import OpCode
+
+from tests.testing import create_timestwo_module
+
+TIMESTWO = '''
+define i32 @timestwo(i32 %x) {
+entry:
+  %add = add i32 %x, %x
+  ret i32 %add
+}
+'''
+
+
+class IRReaderTest(unittest.TestCase):
+    def setUp(self):
+        self.ctx = Context()
+
+    def tearDown(self):
+        self.ctx.close()
+
+    def testString(self):
+        mod = ir_reader.parse_ir_string(TIMESTWO, self.ctx)
+        f = mod.get_function('timestwo')
+        self.assertEqual([OpCode.Add, OpCode.Ret],
+                         [i.opcode for i in f.first])
+        self.assertEqual(mod.context, self.ctx)
+
+    def testMemoryBufferConsumed(self):
+        mem = MemoryBuffer.from_string(TIMESTWO)
+        mod = ir_reader.parse_ir(mem, self.ctx)
+        self.assertTrue(mem.is_null())
+        self.assertEqual('timestwo', mod.get_function('timestwo').name)
+        mem.close()
+
+    def testFile(self):
+        p = path.join(path.dirname(__file__), 'timestwo.ll')
+        mod = ir_reader.parse_ir_file(p, self.ctx)
+        self.assertEqual(1, len(mod.get_function('timestwo')))
+
+    def testBitcode(self):
+        src, _ = create_timestwo_module()
+        mem = bit_writer.write_bitcode_to_memory_buffer(src)
+        mod = ir_reader.parse_ir(mem, self.ctx)
+        self.assertEqual('timestwo', mod.get_function('timestwo').name)
+
+    def testDiagnostic(self):
+        with self.assertRaises(RuntimeError) as cm:
+            ir_reader.parse_ir_string('define i32 @f( {', self.ctx,
+                                      name='bad.ll')
+        message = str(cm.exception)
+        self.assertTrue('bad.ll:1:' in message, message)
+
+
+if __name__ == "__main__":
+    unittest.main()
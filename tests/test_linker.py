@@ -0,0 +1,100 @@
+import unittest
+
+from llvm import ir_reader
+from llvm.core import Context
+from llvm.core import Module
+from llvm.linker import link_all
+
+
+def parse(text, context, name):
+    return ir_reader.parse_ir_string(text, context, name)
+
+
+class LinkInTest(unittest.TestCase):
+    def setUp(self):
+        self.ctx = Context()
+        self.a = parse('define i32 @f() {\n  %r = call i32 @g()\n'
+                       '  ret i32 %r\n}\ndeclare i32 @g()\n', self.ctx, 'a')
+        self.b = parse('define i32 @g() {\n  ret i32 2\n}\n', self.ctx, 'b')
+
+    def tearDown(self):
+        self.ctx.close()
+
+    def testLinkIn(self):
+        self.assertEqual([], self.a.link_in(self.b))
+        self.assertTrue(self.b.is_null())
+        self.assertFalse(self.a.get_function('g').is_declaration)
+
+    def testPreserveSource(self):
+        self.a.link_in(self.b, preserve_source=True)
+        self.assertFalse(self.b.is_null())
+        self.assertEqual(['g'], [f.name for f in self.b])
+        self.assertFalse(self.a.get_function('g').is_declaration)
+
+    def testOtherContext(self):
+        with Context() as other:
+            c = parse('define i32 @h() {\n  ret i32 3\n}\n', other, 'c')
+            self.a.link_in(c)
+            self.assertTrue(c.is_null())
+        self.assertEqual('h', self.a.get_function('h').name)
+
+    def testConflict(self):
+        c = parse('define i32 @f() {\n  ret i32 3\n}\n', self.ctx, 'c')
+        with self.assertRaises(RuntimeError) as cm:
+            self.a.link_in(c)
+        self.assertTrue("'f'" in str(cm.exception))
+
+
+class LinkAllTest(unittest.TestCase):
+    def setUp(self):
+        self.ctx = Context()
+        self.mods = [parse('define i32 @f%d() {\n  ret i32 %d\n}\n' % (i, i),
+                           self.ctx, 'm%d' % i) for i in range(7)]
+
+    def tearDown(self):
+        self.ctx.close()
+
+    def testLinkAll(self):
+        result = link_all(self.mods)
+        self.assertTrue(result.module is self.mods[0])
+        self.assertEqual(6, result.links)
+        self.assertEqual([], result.conflicts)
+        self.assertEqual(['f%d' % i for i in range(7)],
+                         sorted(f.name for f in result.module))
+        self.assertTrue(all(m.is_null() for m in self.mods[1:]))
+
+    def testPreserveSources(self):
+        result = link_all(self.mods, preserve_sources=True)
+        self.assertEqual(7, len(list(result.module)))
+        self.assertTrue(all(len(list(m)) == 1 for m in self.mods[1:]))
+
+    def testPreservedClonesOwnedByContext(self):
+        clones = []
+        clone = Module.clone
+
+        def recording_clone(module, *args):
+            copy = clone(module, *args)
+            clones.append(copy)
+            return copy
+
+        Module.clone = recording_clone
+        self.addCleanup(setattr, Module, 'clone', clone)
+        link_all(self.mods, preserve_sources=True)
+        self.assertEqual(6, len(clones))
+        self.assertTrue(all(c.get_owner() is self.ctx for c in clones))
+        self.ctx.close()
+        self.assertTrue(all(c.is_null() for c in clones + self.mods))
+
+    def testConflicts(self):
+        dup = parse('define i32 @f3() {\n  ret i32 0\n}\n', self.ctx, 'dup')
+        result = link_all(self.mods + [dup])
+        self.assertEqual(1, len(result.conflicts))
+        dest, source, message = result.conflicts[0]
+        self.assertTrue("'f3'" in message)
+
+    def testEmpty(self):
+        self.assertRaises(ValueError, link_all, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
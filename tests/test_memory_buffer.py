@@ -14,6 +14,13 @@ class MemoryBufferTest(unittest.TestCase):
         self.assertEqual(4, len(mem))
 
 
+    def testFromBytes(self):
+        content = b'ab\x00cd'
+        mem = MemoryBuffer.from_bytes(content)
+        self.assertEqual(content, mem.to_bytes())
+        self.assertEqual(content, bytes(mem.memoryview()))
+        self.assertEqual(5, len(mem))
+
     def testFromFile(self):
         filename = __file__
         mem = MemoryBuffer.fromFile(filename)
@@ -1,9 +1,16 @@
+import io
+import os
+import tempfile
 import unittest
 
 from llvm.core import Module
 from llvm.core import Type
 from llvm.core import Function
 from llvm.core import Context
+from llvm.global_variables import Global
+
+from tests.testing import create_abs_module
+from tests.testing import rss_kib
 
 class ModuleTest(unittest.TestCase):
     def setUp(self):
@@ -37,6 +44,99 @@ class ModuleTest(unittest.TestCase):
         mod.target = 'i686-apple-darwin9'
 
         self.assertEqual('i686-apple-darwin9', mod.target)
+
+    def testIdentifier(self):
+        with Context() as context:
+            mod = Module.CreateWithName('module', context)
+            self.assertEqual('module', mod.identifier)
+            self.assertEqual('module', mod.source_filename)
+
+    def testEmptyModule(self):
+        with Context() as context:
+            mod = Module.CreateWithName('module', context)
+            self.assertEqual([], list(mod))
+
+    def testWriteText(self):
+        mod, _ = create_abs_module()
+        mod.target = 'x86_64-unknown-linux-gnu'
+        Global.add(mod, Type.int32(), 'g')
+        out = io.StringIO()
+        mod.write_text(out)
+        self.assertEqual(str(mod), out.getvalue())
+
+    def testPrintModuleToFile(self):
+        mod, _ = create_abs_module()
+        fd, path = tempfile.mkstemp(suffix='.ll')
+        os.close(fd)
+        try:
+            mod.print_module_to_file(path)
+            with open(path) as f:
+                self.assertEqual(str(mod), f.read())
+        finally:
+            os.remove(path)
+
+    def testClone(self):
+        ctx = Context()
+        mod, _ = create_abs_module(ctx)
+        copy = mod.clone()
+        self.assertNotEqual(mod, copy)
+        self.assertEqual(str(mod), str(copy))
+        self.assertTrue(copy.get_owner() is ctx)
+
+        copy.get_function('abs').name = 'renamed'
+        self.assertEqual('abs', mod.get_function('abs').name)
+        ctx.close()
+        self.assertFalse(copy._as_parameter_)
+
+    def testCloneWithOwnContextWrapper(self):
+        ctx = Context()
+        mod, _ = create_abs_module(ctx)
+        # mod.context is a new wrapper that does not own the context.
+        copy = mod.clone(mod.context)
+        self.assertTrue(copy.get_owner() is ctx)
+        ctx.close()
+        self.assertFalse(copy._as_parameter_)
+
+    def testCloneToGlobalContext(self):
+        with Context() as ctx:
+            mod, _ = create_abs_module(ctx)
+            copy = mod.clone(Context.GetGlobalContext())
+        self.assertIsNone(copy.get_owner())
+        self.assertEqual('abs', copy.get_function('abs').name)
+        copy.close()
+        self.assertFalse(copy._as_parameter_)
+
+    def testCloneToContext(self):
+        src = Context()
+        mod, _ = create_abs_module(src)
+        with Context() as dst:
+            copy = mod.clone(dst)
+            self.assertEqual(dst, copy.context)
+            self.assertTrue(copy.get_owner() is dst)
+            self.assertEqual(str(mod.get_function('abs')),
+                             str(copy.get_function('abs')))
+            src.close()
+            self.assertEqual('abs', copy.get_function('abs').name)
+        self.assertFalse(copy._as_parameter_)
+
+    @unittest.skipUnless(os.path.exists('/proc/self/statm'), 'needs procfs')
+    def testPrintDoesNotLeak(self):
+        with Context() as context:
+            mod = Module.CreateWithName('module', context)
+            ty = Type.int32(context)
+            ft = Type.function(ty, [ty], False)
+            for i in range(2000):
+                mod.add_function('function_with_a_long_name_%d' % i, ft)
+            size = len(str(mod))
+            before = rss_kib()
+            for _ in range(200):
+                str(mod)
+                ft.name
+                mod.first.type.name
+            growth = rss_kib() - before
+        # Leaking every string would grow by size * 200 bytes (~20 MB).
+        self.assertTrue(growth * 1024 < size * 200 // 4,
+                        'RSS grew by %d KiB' % growth)
         
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,75 @@
+import io
+import json
+import os
+import pstats
+import tempfile
+import unittest
+
+from llvm.common import get_library
+from llvm.core import Type
+from llvm.profiler import CallProfiler
+
+from tests.testing import create_timestwo_module
+
+
+class ProfilerTest(unittest.TestCase):
+    def setUp(self):
+        self.lib = get_library()
+        self.profiler = self.lib.enable_profiling()
+
+    def tearDown(self):
+        self.lib.disable_profiling()
+
+    def testCounts(self):
+        Type.int32()
+        Type.int32()
+        record = self.profiler.to_dict()['LLVMInt32Type']
+        self.assertEqual(2, record['calls'])
+        self.assertTrue(record['total'] >= record['max'] > 0)
+
+    def testCaller(self):
+        Type.int32()
+        callers = self.profiler.to_dict()['LLVMInt32Type']['callers']
+        self.assertEqual(1, len(callers))
+        self.assertTrue(list(callers)[0].endswith('(Type.int32)'))
+
+    def testDisable(self):
+        self.assertTrue(hasattr(self.lib.LLVMInt32Type, '__wrapped__'))
+        profiler = self.lib.disable_profiling()
+        self.assertTrue(profiler is self.profiler)
+        self.assertFalse(hasattr(self.lib.LLVMInt32Type, '__wrapped__'))
+        Type.int32()
+        self.assertFalse('LLVMInt32Type' in profiler.to_dict())
+
+    def testReset(self):
+        Type.int32()
+        self.profiler.reset()
+        self.assertEqual({}, self.profiler.to_dict())
+
+    def testJSON(self):
+        create_timestwo_module()
+        out = io.StringIO()
+        self.profiler.dump_json(out)
+        data = json.loads(out.getvalue())
+        self.assertEqual(1, data['LLVMBuildMul']['calls'])
+
+    def testPstats(self):
+        create_timestwo_module()
+        fd, path = tempfile.mkstemp(suffix='.prof')
+        os.close(fd)
+        try:
+            self.profiler.dump_stats(path)
+            stats = pstats.Stats(path, stream=io.StringIO())
+        finally:
+            os.remove(path)
+        self.assertTrue(('~', 0, 'LLVMBuildMul') in stats.stats)
+        stats.sort_stats('tottime').print_stats()
+
+    def testCustomProfiler(self):
+        self.lib.disable_profiling()
+        profiler = CallProfiler()
+        self.assertTrue(self.lib.enable_profiling(profiler) is profiler)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,21 +1,15 @@
 """Unit test for bit reader"""
 import unittest
-import subprocess
 from os import path
 
 from llvm import bit_reader
+from llvm import bit_writer
 from llvm.core import MemoryBuffer
 from llvm.core import Context
 
+from tests.testing import create_abs_module
+from tests.testing import generate_bitcode
 
-def generate_bitcode(filename):
-    """Call clang to generate bitcode if not found on disc"""
-    base, _ = filename.split('.')
-    bcfile = base + '.bc'
-    if not path.isfile(bcfile):
-        cmd = ['clang', '-c', filename, '-emit-llvm', '-o', bcfile]
-        subprocess.Popen(cmd).communicate()
-    
 
 class ReaderTest(unittest.TestCase):
     def setUp(self):
@@ -37,6 +31,40 @@ class ReaderTest(unittest.TestCase):
         f = mod.get_function('timestwo')
         self.assertTrue(len(str(f)) > 10)
 
+
+class LazyReaderTest(unittest.TestCase):
+    def setUp(self):
+        mod, _ = create_abs_module()
+        self.ctx = Context()
+        self.mod = bit_reader.get_bitcode_module(
+            bit_writer.write_bitcode_to_memory_buffer(mod), self.ctx)
+
+    def tearDown(self):
+        self.ctx.close()
+
+    def test_skeleton(self):
+        f = self.mod.get_function('abs')
+        self.assertEqual('abs', f.name)
+        self.assertFalse(f.is_declaration)
+        self.assertFalse(f.is_materialized)
+        self.assertEqual(0, len(f))
+
+    def test_materialize(self):
+        f = bit_reader.materialize(self.mod, 'abs')
+        self.assertTrue(f.is_materialized)
+        self.assertEqual(['body', 'true', 'false', 'merge'], [bb.name for bb in f])
+        bit_reader.materialize(self.mod, f)
+
+    def test_materialize_all(self):
+        bit_reader.materialize_all(self.mod)
+        self.assertTrue(all(f.is_materialized for f in self.mod))
+
+    def test_invalid(self):
+        with self.assertRaises(RuntimeError):
+            bit_reader.get_bitcode_module(
+                MemoryBuffer.from_bytes(b'not bitcode'), self.ctx)
+
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -0,0 +1,119 @@
+"""Unit tests for columnar module snapshots"""
+import unittest
+
+from llvm.core import OpCode
+from llvm.snapshot import ModuleSnapshot
+
+from tests.testing import create_abs_module
+from tests.testing import create_cumsum_module
+from tests.testing import create_timestwo_module_with_function
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class SnapshotTest(unittest.TestCase):
+    def testMatchesWrappers(self):
+        mod, _ = create_cumsum_module()
+        snap = mod.snapshot()
+        self.assertTrue(isinstance(snap, ModuleSnapshot))
+
+        insts = [inst for f in mod for bb in f for inst in bb]
+        self.assertEqual(len(insts), snap.num_instructions)
+        self.assertEqual([inst.opcode_value for inst in insts],
+                         list(snap.opcodes))
+        self.assertEqual([inst.type.name for inst in insts],
+                         [snap.types[t] for t in snap.inst_types])
+        self.assertEqual([inst.name for inst in insts],
+                         [snap.value_name(v) for v in snap.inst_values])
+        for i, inst in enumerate(insts):
+            self.assertEqual([op.type.name for op in inst.operands],
+                             [snap.value_type(v)
+                              for v in snap.instruction_operands(i)])
+
+    def testRanges(self):
+        mod, f = create_abs_module()
+        snap = mod.snapshot()
+        self.assertEqual(1, snap.num_functions)
+        self.assertEqual(0, snap.function_index('abs'))
+        blocks = snap.function_blocks(0)
+        self.assertEqual(['body', 'true', 'false', 'merge'],
+                         [snap.value_name(snap.block_values[b])
+                          for b in blocks])
+        self.assertEqual(range(0, snap.num_instructions),
+                         snap.function_instructions(0))
+        last = snap.block_instructions(blocks[-1])
+        self.assertEqual([OpCode.PHI.value, OpCode.Ret.value],
+                         [snap.opcodes[i] for i in last])
+        self.assertEqual(len(snap.operands), snap.operand_offsets[-1])
+
+    def testOperandIds(self):
+        mod = create_timestwo_module_with_function()
+        snap = mod.snapshot()
+        callee = snap.function_values[snap.function_index('timestwo')]
+        call = snap.opcodes.index(OpCode.Call.value)
+        self.assertIn(callee, snap.instruction_operands(call))
+        # The mul's result feeds the ret.
+        mul, ret = snap.function_instructions(
+            snap.function_index('timestwo'))
+        self.assertEqual([snap.inst_values[mul]],
+                         list(snap.instruction_operands(ret)))
+
+    def testIndependentOfModule(self):
+        mod, _ = create_abs_module()
+        snap = mod.snapshot()
+        mod.close()
+        self.assertEqual('abs', snap.value_name(snap.function_values[0]))
+
+    def testUseDef(self):
+        mod, f = create_cumsum_module()
+        snap = f.snapshot()
+        insts = [inst for bb in f for inst in bb]
+        ids = dict((inst, v) for inst, v in zip(insts, snap.inst_values))
+        offsets, defs = snap.use_def()
+        for i, inst in enumerate(insts):
+            v = ids[inst]
+            self.assertEqual(list(snap.instruction_operands(i)),
+                             list(defs[offsets[v]:offsets[v + 1]]))
+        arg = snap.function_values[0] + 1
+        self.assertEqual(offsets[arg], offsets[arg + 1])
+
+    def testDefUse(self):
+        mod, f = create_cumsum_module()
+        snap = f.snapshot()
+        insts = [inst for bb in f for inst in bb]
+        ids = dict((inst, v) for inst, v in zip(insts, snap.inst_values))
+        offsets, users = snap.def_use()
+        self.assertEqual(len(snap.operands), len(users))
+        values = insts + [f.get_param(0)]
+        ids[f.get_param(0)] = snap.function_values[0] + 1
+        for value in values:
+            v = ids[value]
+            expected = sorted(ids[use.user] for use in value.uses_iter())
+            self.assertEqual(expected,
+                             sorted(users[offsets[v]:offsets[v + 1]]))
+        # Instructions without uses are the terminators here.
+        unused = [i for i, v in enumerate(snap.inst_values)
+                  if offsets[v] == offsets[v + 1]]
+        self.assertTrue(all(snap.opcodes[i] in OpCode.terminators
+                            for i in unused))
+
+    def testFunctionSnapshot(self):
+        mod = create_timestwo_module_with_function()
+        snap = mod.get_function('caller').snapshot()
+        self.assertEqual(1, snap.num_functions)
+        self.assertEqual('caller', snap.value_name(snap.function_values[0]))
+        self.assertEqual(2, snap.num_instructions)
+
+    @unittest.skipIf(numpy is None, 'needs numpy')
+    def testNumpy(self):
+        mod, _ = create_abs_module()
+        snap = mod.snapshot()
+        arrays = snap.to_numpy()
+        self.assertEqual(list(snap.opcodes), arrays['opcodes'].tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""Unit tests for module statistics"""
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from llvm import bit_writer
+from llvm import ir_reader
+from llvm import stats
+from llvm.core import Context
+from llvm.core import Type
+from llvm.core import Value
+from llvm.global_variables import Global
+
+from tests.testing import create_abs_module
+from tests.testing import create_global_load_save_module
+from tests.testing import create_timestwo_module_with_function
+
+
+class StatsTest(unittest.TestCase):
+    def testFunction(self):
+        mod, f = create_abs_module()
+        self.assertEqual({'blocks': 4, 'instructions': 7, 'call_sites': 0,
+                          'opcodes': {'ICmp': 1, 'Br': 3, 'Sub': 1,
+                                      'PHI': 1, 'Ret': 1}},
+                         f.stats())
+
+    def testModule(self):
+        mod = create_timestwo_module_with_function()
+        result = mod.stats()
+        self.assertEqual(2, result['functions'])
+        self.assertEqual(0, result['declarations'])
+        self.assertEqual(4, result['instructions'])
+        self.assertEqual(1, result['call_sites'])
+        self.assertEqual({'Mul': 1, 'Call': 1, 'Ret': 2},
+                         result['opcodes'])
+        self.assertEqual({'blocks': 1, 'instructions': 2, 'call_sites': 1},
+                         result['per_function']['caller'])
+
+    def testUnnamedFunctions(self):
+        with Context() as ctx:
+            mod = ir_reader.parse_ir_string(
+                'define i32 @0() {\n  ret i32 0\n}\n'
+                'define i32 @1() {\n  ret i32 1\n}\n'
+                'define i32 @named() {\n  ret i32 2\n}\n', ctx, 'm')
+            result = mod.stats()
+        self.assertEqual(3, result['functions'])
+        self.assertEqual(['<unnamed 0>', '<unnamed 1>', 'named'],
+                         sorted(result['per_function']))
+
+    def testGlobals(self):
+        mod = create_global_load_save_module()
+        ty = Type.array(Type.int32(context=mod.context), 10)
+        g = Global.add(mod, ty, 'table')
+        g.initializer = Value.null(ty)
+        Global.add(mod, ty, 'external')
+        result = mod.stats()
+        self.assertEqual(3, result['globals'])
+        self.assertEqual(1 + 40, result['constant_data_bytes'])
+
+    def testCommandLine(self):
+        directory = tempfile.mkdtemp()
+        try:
+            for name, mod in [('abs.bc', create_abs_module()[0]),
+                              ('calls.bc',
+                               create_timestwo_module_with_function())]:
+                bit_writer.write_bitcode_to_file(
+                    mod, os.path.join(directory, name))
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                status = stats.main([directory, '--jobs', '2'])
+            self.assertEqual(0, status)
+            lines = out.getvalue().splitlines()
+            self.assertEqual(['abs.bc', 'calls.bc', 'total'],
+                             [line.split()[0] for line in lines[1:4]])
+            self.assertEqual('11', lines[3].split()[3])
+
+            with open(os.path.join(directory, 'bad.bc'), 'wb') as f:
+                f.write(b'not bitcode')
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                status = stats.main([directory, '--json'])
+            self.assertEqual(1, status)
+            self.assertIn('"error"', out.getvalue())
+            self.assertIn('"call_sites": 1', out.getvalue())
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+"""Unit tests for target machines and the new pass manager"""
+import unittest
+
+from llvm.common import c_object_p
+from llvm.common import get_library
+from llvm.pass_manager import run_passes
+from llvm.target import TargetMachine
+from llvm.target import get_default_triple
+
+from tests.testing import create_timestwo_module
+
+
+class TargetMachineTest(unittest.TestCase):
+    def setUp(self):
+        self.tm = TargetMachine.create()
+
+    def tearDown(self):
+        self.tm.close()
+
+    def testDefaultTriple(self):
+        self.assertEqual(get_default_triple(), self.tm.triple)
+        self.assertTrue(self.tm.data_layout.startswith('e-'))
+
+    def testUnknownTriple(self):
+        with self.assertRaises(RuntimeError):
+            TargetMachine.create('nosuch-unknown-none')
+
+    def testCreateFails(self):
+        # LLVM returns null rather than an error for some bad settings.
+        lib = get_library()
+        self.addCleanup(lib.__dict__.pop, 'LLVMCreateTargetMachine', None)
+        lib.LLVMCreateTargetMachine = lambda *args: c_object_p()
+        with self.assertRaises(RuntimeError):
+            TargetMachine.create()
+
+    def testEmitObject(self):
+        mod, _ = create_timestwo_module()
+        obj = self.tm.emit_object(mod.clone())
+        self.assertEqual(b'\x7fELF', obj[:4])
+
+    def testEmitAssembly(self):
+        mod, _ = create_timestwo_module()
+        self.assertIn('timestwo:', self.tm.emit_assembly(mod.clone()))
+
+
+class RunPassesTest(unittest.TestCase):
+    def testPipeline(self):
+        mod, _ = create_timestwo_module()
+        self.assertIn('mul i8', str(mod))
+        run_passes(mod, 'instcombine')
+        self.assertIn('shl i8', str(mod))
+
+    def testUnknownPass(self):
+        mod, _ = create_timestwo_module()
+        with self.assertRaises(RuntimeError):
+            run_passes(mod, 'nosuchpass')
+
+
+if __name__ == '__main__':
+    unittest.main()
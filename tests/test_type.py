@@ -130,6 +130,13 @@ class TypeTest(unittest.TestCase):
         t2 = elems[1]
         self.assertEqual('i8', t2.name)
 
+    def testCreateStructInContext(self):
+        with Context() as ctx:
+            ty = Type.int8(ctx)
+            p = Type.structure([ty, ty], True, ctx)
+            self.assertEqual('<{ i8, i8 }>', p.name)
+            self.assertTrue(p.is_packed())
+
     def testCreateNamedStruct(self):
         ty = Type.create_named_structure(self.global_context, "mystruct")
         self.assertEqual('mystruct', ty.struct_name())
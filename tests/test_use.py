@@ -33,6 +33,20 @@ class UseTest(unittest.TestCase):
 
         uses = list(x.uses_iter())
         self.assertEqual([use], uses)
+
+    def testUsesIter(self):
+        x = self.f.get_param(0)
+        self.assertTrue(Use.first(x) is None)
+        self.assertEqual([], list(x.uses_iter()))
+
+        two = Value.const_int(self.ty, 2, True)
+        y = self.bldr.mul(x, two, 'res')
+        z = self.bldr.add(x, y, 'sum')
+        w = self.bldr.sub(x, x, 'zero')
+        users = [use.user for use in x.uses_iter()]
+        self.assertEqual(4, len(users))
+        self.assertEqual(set([y, z, w]), set(users))
+        self.assertEqual([z], [use.user for use in y.uses_iter()])
         
     def testOperands(self):
         x = self.f.get_param(0)
@@ -0,0 +1,55 @@
+import unittest
+
+from llvm import util
+from llvm.core import Type
+from llvm.core import Value
+
+
+class ArrayPoolTest(unittest.TestCase):
+    def setUp(self):
+        ty = Type.int32()
+        self.vals = [Value.const_int(ty, i, True) for i in range(3)]
+
+    def testAcquire(self):
+        count, arr = util.acquire_array(self.vals)
+        self.assertEqual(3, count)
+        self.assertTrue(len(arr) >= 3)
+        for i in range(count):
+            self.assertEqual(self.vals[i], Value(arr[i]))
+        util.release_array(arr)
+
+    def testReuse(self):
+        _, arr = util.acquire_array(self.vals)
+        util.release_array(arr)
+        _, arr2 = util.acquire_array(self.vals[:1])
+        self.assertTrue(arr is arr2)
+        util.release_array(arr2)
+
+    def testNested(self):
+        _, a = util.acquire_array(self.vals)
+        _, b = util.acquire_array(self.vals)
+        self.assertFalse(a is b)
+        util.release_array(a)
+        util.release_array(b)
+
+    def testLarge(self):
+        vals = self.vals * 400
+        count, arr = util.acquire_array(vals)
+        self.assertEqual(1200, count)
+        self.assertEqual(1200, len(arr))
+        util.release_array(arr)
+
+    def testToCArray(self):
+        count, arr = util.to_c_array(self.vals)
+        self.assertEqual(3, count)
+        self.assertEqual(3, len(arr))
+        self.assertEqual(self.vals, [Value(p) for p in arr])
+
+    def testEmpty(self):
+        count, arr = util.acquire_array([])
+        self.assertEqual(0, count)
+        util.release_array(arr)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,5 @@
 """Test module to generate simple LLVM modules."""
+import os
 import subprocess
 from os import path
 
@@ -8,8 +9,11 @@ from llvm.core import Function
 from llvm.core import Value
 from llvm.core import VerifierFailureActionTy
 from llvm.core import MemoryBuffer
+from llvm.core import Context
 
 from llvm import bit_reader
+from llvm import bit_writer
+from llvm import ir_reader
 
 from llvm.instruction_builder import Builder
 
@@ -189,17 +193,17 @@ def create_lessthanzero_module():
     return (mod, f)
     
 
-def create_abs_module():
-    mod = Module.CreateWithName('module')
+def create_abs_module(context=None):
+    mod = Module.CreateWithName('module', context)
 
     ty = Type.int8(context=mod.context)
     ft = Type.function(ty, [ty], False)
     
     f = mod.add_function('abs', ft)
-    bb1 = f.append_basic_block('body')
-    bbt = f.append_basic_block('true')
-    bbf = f.append_basic_block('false')
-    bbm = f.append_basic_block('merge')
+    bb1 = f.append_basic_block('body', context)
+    bbt = f.append_basic_block('true', context)
+    bbf = f.append_basic_block('false', context)
+    bbm = f.append_basic_block('merge', context)
 
     bldr = Builder.create(mod.context)
     bldr.position_at_end(bb1)
@@ -259,12 +263,21 @@ def create_cumsum_module():
     return (mod, f)
 
 def generate_bitcode(filename):
-    """Call clang to generate bitcode if not found on disc"""
+    """Generate bitcode if not found on disc.
+
+    A .ll file next to the source is parsed in-process; otherwise clang is
+    called.
+    """
     base, _ = filename.split('.')
     bcfile = base + '.bc'
     if not path.isfile(bcfile):
-        cmd = ['clang', '-c', filename, '-emit-llvm', '-o', bcfile]
-        subprocess.Popen(cmd).communicate()
+        if path.isfile(base + '.ll'):
+            with Context() as ctx:
+                mod = ir_reader.parse_ir_file(base + '.ll', ctx)
+                bit_writer.write_bitcode_to_file(mod, bcfile)
+        else:
+            cmd = ['clang', '-c', filename, '-emit-llvm', '-o', bcfile]
+            subprocess.Popen(cmd).communicate()
     
     return
 
@@ -275,3 +288,13 @@ def parse_bitcode(source):
     mem = MemoryBuffer.fromFile(path.join(p, b + '.bc'))
     return bit_reader.parse_bitcode(mem)
                                 
+
+def rss_kib():
+    """Resident set size of this process in KiB, read from procfs."""
+    with open('/proc/self/statm') as f:
+        pages = int(f.read().split()[1])
+    return pages * os.sysconf('SC_PAGE_SIZE') // 1024
+
+# Tests that take several seconds, such as the RSS stress tests, run their
+# full length only when LLVMPY_SLOW_TESTS is set.
+SLOW_TESTS = bool(os.environ.get('LLVMPY_SLOW_TESTS'))
@@ -0,0 +1,6 @@
+; Hand-written equivalent of timestwo.c, parsed in-process by the tests.
+define i32 @timestwo(i32 %x) {
+entry:
+  %add = add nsw i32 %x, %x
+  ret i32 %add
+}